@@ -22,10 +22,18 @@ try:
 except ImportError:
     # noinspection PyCompatibility
     from configparser import ConfigParser as SafeConfigParser
+import copy
 import os
 from pathlib import Path
+from threading import Lock
 import inspect
 
+# Values parsed from each configuration file, with the modification time of the file: path -> (stamp, values)
+_read_cache = dict()
+# Attributes listed by props() for each class, with the names of the class attributes they were computed from
+_props_cache = dict()
+_read_lock = Lock()
+
 
 class BasicConfig:
     """
@@ -36,10 +44,18 @@ class BasicConfig:
         pass
 
     def props(self):
+        cls = type(self)
+        class_names = tuple(name for klass in cls.__mro__ for name in vars(klass))
+        cached = _props_cache.get(cls)
+        if cached is None or cached[0] != class_names or vars(self):
+            names = [name for name in dir(self) if not name.startswith('__')]
+            cached = (class_names, names)
+            if not vars(self):
+                _props_cache[cls] = cached
         pr = {}
-        for name in dir(self):
+        for name in cached[1]:
             value = getattr(self, name)
-            if not name.startswith('__') and not inspect.ismethod(value) and not inspect.isfunction(value):
+            if not inspect.ismethod(value) and not inspect.isfunction(value):
                 pr[name] = value
         return pr
 
@@ -71,6 +87,11 @@ class BasicConfig:
     CONFIG_FILE_FOUND = False
     DATABASE_BACKEND = "sqlite"
     DATABASE_CONN_URL = ""
+    PARSE_CACHE_DIR = ""
+    PARSE_CACHE_MAX_SIZE = 256 * 1024 * 1024
+    PARSE_CACHE_MAX_AGE = 30 * 24 * 3600
+    PARSE_WORKERS = 8
+    WATCH_CONFIG_FILES = False
 
     @staticmethod
     def expid_dir(exp_id):
@@ -100,41 +121,44 @@ class BasicConfig:
             BasicConfig.DB_DIR, BasicConfig.DB_FILE)
 
     @staticmethod
-    def __read_file_config(file_path):
+    def __parse_file_config(file_path):
         """
-        Reads configuration file. If configuration file dos not exist in given path,
+        Parses configuration file. If configuration file dos not exist in given path,
         no error is raised. Configuration options also are not required to exist
 
         :param file_path: configuration file to read
         :type file_path: str
+        :return: the value of each attribute set by the file
+        :rtype: dict
         """
+        values = dict()
         if not os.path.isfile(file_path):
-            return
+            return values
         else:
-            BasicConfig.CONFIG_FILE_FOUND = True
+            values['CONFIG_FILE_FOUND'] = True
         # print('Reading config from ' + file_path)
         parser = SafeConfigParser()
         parser.optionxform = str
         parser.read(file_path)
 
         if parser.has_option('database', 'path'):
-            BasicConfig.DB_DIR = parser.get('database', 'path')
+            values['DB_DIR'] = parser.get('database', 'path')
         if parser.has_option('database', 'filename'):
-            BasicConfig.DB_FILE = parser.get('database', 'filename')
+            values['DB_FILE'] = parser.get('database', 'filename')
         if parser.has_option('local', 'path'):
-            BasicConfig.LOCAL_ROOT_DIR = parser.get('local', 'path')
+            values['LOCAL_ROOT_DIR'] = parser.get('local', 'path')
         if parser.has_option('conf', 'platforms'):
-            BasicConfig.DEFAULT_PLATFORMS_CONF = parser.get(
+            values['DEFAULT_PLATFORMS_CONF'] = parser.get(
                 'conf', 'platforms')
         if parser.has_option('conf', 'custom_platforms'):
-            BasicConfig.CUSTOM_PLATFORMS_PATH = parser.get(
+            values['CUSTOM_PLATFORMS_PATH'] = parser.get(
                 'conf', 'custom_platforms')
         if parser.has_option('conf', 'jobs'):
-            BasicConfig.DEFAULT_JOBS_CONF = parser.get('conf', 'jobs')
+            values['DEFAULT_JOBS_CONF'] = parser.get('conf', 'jobs')
         if parser.has_option('mail', 'smtp_server'):
-            BasicConfig.SMTP_SERVER = parser.get('mail', 'smtp_server')
+            values['SMTP_SERVER'] = parser.get('mail', 'smtp_server')
         if parser.has_option('mail', 'mail_from'):
-            BasicConfig.MAIL_FROM = parser.get('mail', 'mail_from')
+            values['MAIL_FROM'] = parser.get('mail', 'mail_from')
         if parser.has_option('hosts', 'authorized'):
             list_command_allowed = parser.get('hosts', 'authorized')
 
@@ -157,7 +181,7 @@ class BasicConfig:
                         restrictions[command_allowed[0]] = command_allowed[1].split(',')
                     else:
                         restrictions[command_allowed[0]] = [command_allowed[1]]
-            BasicConfig.ALLOWED_HOSTS = restrictions
+            values['ALLOWED_HOSTS'] = restrictions
         if parser.has_option('hosts', 'forbidden'):
             list_command_allowed = parser.get('hosts', 'forbidden')
             list_command_allowed = list_command_allowed.split('] ')
@@ -179,26 +203,68 @@ class BasicConfig:
                         restrictions[command_allowed[0]] = command_allowed[1].split(',')
                     else:
                         restrictions[command_allowed[0]] = [command_allowed[1]]
-            BasicConfig.DENIED_HOSTS = restrictions
+            values['DENIED_HOSTS'] = restrictions
         if parser.has_option('structures', 'path'):
-            BasicConfig.STRUCTURES_DIR = parser.get('structures', 'path')
+            values['STRUCTURES_DIR'] = parser.get('structures', 'path')
         if parser.has_option('globallogs', 'path'):
-            BasicConfig.GLOBAL_LOG_DIR = parser.get('globallogs', 'path')
+            values['GLOBAL_LOG_DIR'] = parser.get('globallogs', 'path')
         if parser.has_option('defaultstats', 'path'):
-            BasicConfig.DEFAULT_OUTPUT_DIR = parser.get('defaultstats', 'path')
+            values['DEFAULT_OUTPUT_DIR'] = parser.get('defaultstats', 'path')
         if parser.has_option('historicdb', 'path'):
-            BasicConfig.JOBDATA_DIR = parser.get('historicdb', 'path')
+            values['JOBDATA_DIR'] = parser.get('historicdb', 'path')
         if parser.has_option('historiclog', 'path'):
-            BasicConfig.HISTORICAL_LOG_DIR = parser.get('historiclog', 'path')
+            values['HISTORICAL_LOG_DIR'] = parser.get('historiclog', 'path')
         if parser.has_option('autosubmitapi', 'url'):
-            BasicConfig.AUTOSUBMIT_API_URL = parser.get(
+            values['AUTOSUBMIT_API_URL'] = parser.get(
                 'autosubmitapi', 'url')
         if parser.has_option('database', 'backend'):
-            BasicConfig.DATABASE_BACKEND = parser.get('database', 'backend')
+            values['DATABASE_BACKEND'] = parser.get('database', 'backend')
         if parser.has_option('database', 'connection_url'):
-            BasicConfig.DATABASE_CONN_URL = parser.get('database', 'connection_url')
+            values['DATABASE_CONN_URL'] = parser.get('database', 'connection_url')
+        if parser.has_option('parsecache', 'path'):
+            values['PARSE_CACHE_DIR'] = parser.get('parsecache', 'path')
+        if parser.has_option('parsecache', 'max_size'):
+            values['PARSE_CACHE_MAX_SIZE'] = int(parser.get('parsecache', 'max_size'))
+        if parser.has_option('parsecache', 'max_age'):
+            values['PARSE_CACHE_MAX_AGE'] = int(parser.get('parsecache', 'max_age'))
+        if parser.has_option('config', 'parse_workers'):
+            values['PARSE_WORKERS'] = int(parser.get('config', 'parse_workers'))
+        if parser.has_option('config', 'watch_config_files'):
+            values['WATCH_CONFIG_FILES'] = parser.getboolean('config', 'watch_config_files')
         if parser.has_option('config', 'log_recovery_timeout'):
-            BasicConfig.LOG_RECOVERY_TIMEOUT = int(parser.get('config', 'log_recovery_timeout'))
+            values['LOG_RECOVERY_TIMEOUT'] = int(parser.get('config', 'log_recovery_timeout'))
+        return values
+
+    @staticmethod
+    def __read_file_config(file_path):
+        """
+        Reads configuration file, reusing the values parsed by previous calls while the file does not change.
+
+        :param file_path: configuration file to read
+        :type file_path: str
+        """
+        try:
+            stat = os.stat(file_path)
+            stamp = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except OSError:
+            stamp = None
+        # The same file reached through different paths (symbolic links, relative paths) is parsed once
+        cache_key = os.path.realpath(file_path)
+        cached = _read_cache.get(cache_key)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, BasicConfig.__parse_file_config(file_path))
+            _read_cache[cache_key] = cached
+        for name, value in cached[1].items():
+            # The hosts restrictions are dictionaries, each read gets its own copy as before
+            setattr(BasicConfig, name, copy.deepcopy(value) if isinstance(value, dict) else value)
+
+    @staticmethod
+    def clear_read_cache():
+        """
+        Forgets the configuration files parsed, the next read parses them again.
+        """
+        with _read_lock:
+            _read_cache.clear()
 
     @staticmethod
     def read():
@@ -206,6 +272,11 @@ class BasicConfig:
         Reads configuration from .autosubmitrc files, first from /etc., then for user
         directory and last for current path.
         """
+        with _read_lock:
+            BasicConfig.__read()
+
+    @staticmethod
+    def __read():
         filename = 'autosubmitrc'
         if 'AUTOSUBMIT_CONFIGURATION' in os.environ and os.path.exists(os.environ['AUTOSUBMIT_CONFIGURATION']):
             config_file_path = os.environ['AUTOSUBMIT_CONFIGURATION']
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from log.log import Log
+from .basicconfig import BasicConfig
+from .configcommon import AutosubmitConfig
+from .parsecache import MemoryParseCache
+
+
+class ExperimentLoad:
+    """
+    Result of loading one experiment of a batch.
+
+    :param expid: experiment identifier.
+    :type expid: str
+    """
+
+    def __init__(self, expid: str):
+        self.expid = expid
+        self.as_conf: Optional[AutosubmitConfig] = None
+        self.error: Optional[Exception] = None
+        self.traceback = ""
+        self.elapsed = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self) -> str:
+        status = "ok" if self.ok else f"error: {self.error}"
+        return f"ExperimentLoad({self.expid}, {status}, {self.elapsed:.3f}s)"
+
+
+class BatchLoadReport:
+    """
+    Results of ``load_experiments``, by expid in the order they were requested.
+    """
+
+    def __init__(self, results: Dict[str, ExperimentLoad], parse_cache: MemoryParseCache, elapsed: float):
+        self.results = results
+        self.parse_cache = parse_cache
+        self.elapsed = elapsed
+
+    def __getitem__(self, expid: str) -> ExperimentLoad:
+        return self.results[expid]
+
+    def __iter__(self):
+        return iter(self.results.values())
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    @property
+    def configs(self) -> Dict[str, AutosubmitConfig]:
+        """
+        Configuration of each experiment loaded without errors.
+        """
+        return {expid: result.as_conf for expid, result in self.results.items() if result.ok}
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        """
+        Error of each experiment that could not be loaded.
+        """
+        return {expid: result.error for expid, result in self.results.items() if not result.ok}
+
+    def summary(self) -> str:
+        lines = [f"Loaded {len(self.configs)} of {len(self.results)} experiments in {self.elapsed:.3f}s, "
+                 f"parse cache hits: {self.parse_cache.hits}, misses: {self.parse_cache.misses}"]
+        for result in sorted(self.results.values(), key=lambda result: result.elapsed, reverse=True):
+            lines.append(f"  {result.expid}: {result.elapsed:.3f}s" + ("" if result.ok else f" {result.error}"))
+        return "\n".join(lines)
+
+
+def _load_experiment(expid: str, parse_cache: MemoryParseCache, force_load: bool,
+                     only_experiment_data: bool) -> ExperimentLoad:
+    result = ExperimentLoad(expid)
+    start = time.perf_counter()
+    try:
+        # The experiments are already loaded in parallel, so each one parses its files sequentially
+        as_conf = AutosubmitConfig(expid, parse_cache=parse_cache, parse_workers=1)
+        as_conf.reload(force_load=force_load, only_experiment_data=only_experiment_data)
+        result.as_conf = as_conf
+    except Exception as exc:
+        result.error = exc
+        result.traceback = traceback.format_exc()
+        Log.debug(f"Unable to load the configuration of {expid}: {exc}")
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def load_experiments(expids: Iterable[str], workers: Optional[int] = None,
+                     parse_cache: Optional[MemoryParseCache] = None, force_load: bool = True,
+                     only_experiment_data: bool = False) -> BatchLoadReport:
+    """
+    Loads the configuration of several experiments in a pool of threads.
+
+    All the experiments share one in-memory parse cache, so the files they have in common are parsed once.
+    The errors of an experiment do not stop the others, they are returned in the report with the time spent
+    loading each experiment.
+
+    :param expids: experiment identifiers, duplicates are loaded once.
+    :param workers: number of experiments loaded at the same time, ``BasicConfig.PARSE_WORKERS`` by default.
+    :param parse_cache: cache shared by the experiments, a new one by default. Passing the cache of a previous
+        batch reuses its documents.
+    :param force_load: see ``AutosubmitConfig.reload``.
+    :param only_experiment_data: see ``AutosubmitConfig.reload``.
+    :return: report with the configuration or the error of each experiment.
+    :rtype: BatchLoadReport
+    """
+    start = time.perf_counter()
+    expids: List[str] = list(dict.fromkeys(expids))
+    if parse_cache is None:
+        parse_cache = MemoryParseCache()
+    BasicConfig.read()
+    workers = max(1, min(workers if workers is not None else BasicConfig.PARSE_WORKERS, len(expids)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda expid: _load_experiment(expid, parse_cache, force_load, only_experiment_data), expids))
+    return BatchLoadReport({result.expid: result for result in results}, parse_cache,
+                           time.perf_counter() - start)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+from calendar import monthrange
+from datetime import datetime, timedelta
+from typing import List, Sequence
+
+from bscearth.utils.date import add_time
+
+
+class ChunkCalendar:
+    """
+    Start and end dates of every chunk of every start date of an experiment.
+
+    The dates are the same that ``bscearth.utils.date.chunk_start_date`` and ``chunk_end_date`` return, but they
+    are computed at once for the whole grid and kept in flat lists, indexed by start date and chunk. Chunks are
+    numbered from 1 to ``num_chunks`` and the members share the dates of their start date.
+
+    :param dates: start dates of the experiment.
+    :type dates: Sequence[datetime]
+    :param num_chunks: number of chunks of each start date.
+    :type num_chunks: int
+    :param chunk_size: length of the chunks.
+    :type chunk_size: int
+    :param chunk_unit: unit of the chunk length: hour, day, month or year.
+    :type chunk_unit: str
+    :param calendar: standard or noleap.
+    :type calendar: str
+    """
+
+    def __init__(self, dates: Sequence[datetime], num_chunks: int, chunk_size: int, chunk_unit: str,
+                 calendar: str = "standard"):
+        self.dates = list(dates)
+        self.num_chunks = num_chunks
+        self.chunk_size = chunk_size
+        self.chunk_unit = chunk_unit
+        self.calendar = calendar
+        self._date_index = {date: index for index, date in reversed(list(enumerate(self.dates)))}
+        self._start_dates = []
+        self._end_dates = []
+        for date in self.dates:
+            starts = [self._add(date, (chunk - 1) * chunk_size) for chunk in range(1, num_chunks + 1)]
+            self._start_dates.extend(starts)
+            self._end_dates.extend(self._add(start, chunk_size) for start in starts)
+
+    def _add(self, date: datetime, size: int) -> datetime:
+        """
+        Adds size units of time to a date, as ``bscearth.utils.date.add_time`` does.
+        """
+        if self.chunk_unit in ("month", "year"):
+            return self._add_months(date, size if self.chunk_unit == "month" else size * 12,
+                                    self.calendar == "noleap" and self.chunk_unit == "month")
+        return add_time(date, size, self.chunk_unit, self.calendar)
+
+    @staticmethod
+    def _add_months(date: datetime, months: int, noleap: bool) -> datetime:
+        """
+        Adds months to a date keeping the day, or the last day of the month if it does not exist, as relativedelta.
+        The 29th of February is moved to the 28th in the noleap calendar.
+        """
+        years, month = divmod(date.month - 1 + months, 12)
+        year = date.year + years
+        day = min(date.day, monthrange(year, month + 1)[1])
+        result = date.replace(year=year, month=month + 1, day=day)
+        if noleap and result.month == 2 and result.day == 29:
+            result -= timedelta(days=1)
+        return result
+
+    def _index(self, date: datetime, chunk: int) -> int:
+        if not 1 <= chunk <= self.num_chunks:
+            raise IndexError(f"Chunk {chunk} out of range, there are {self.num_chunks} chunks")
+        return self._date_index[date] * self.num_chunks + chunk - 1
+
+    def start_date(self, date: datetime, chunk: int) -> datetime:
+        """
+        Returns the start date of a chunk.
+
+        :param date: start date of the experiment.
+        :param chunk: number of chunk, starting at 1.
+        """
+        return self._start_dates[self._index(date, chunk)]
+
+    def end_date(self, date: datetime, chunk: int) -> datetime:
+        """
+        Returns the end date of a chunk, which is not included in the chunk.
+
+        :param date: start date of the experiment.
+        :param chunk: number of chunk, starting at 1.
+        """
+        return self._end_dates[self._index(date, chunk)]
+
+    def start_dates(self, date: datetime) -> List[datetime]:
+        """
+        Returns the start dates of all the chunks of a start date.
+        """
+        index = self._date_index[date] * self.num_chunks
+        return self._start_dates[index:index + self.num_chunks]
+
+    def end_dates(self, date: datetime) -> List[datetime]:
+        """
+        Returns the end dates of all the chunks of a start date.
+        """
+        index = self._date_index[date] * self.num_chunks
+        return self._end_dates[index:index + self.num_chunks]
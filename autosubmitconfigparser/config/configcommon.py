@@ -17,29 +17,62 @@
 # along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
 import collections
 import copy
+import hashlib
 import json
 import locale
 import numbers
 import os
+import pickle
 import re
 import shutil
 import subprocess
+import threading
 import traceback
+import types
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Union, Any, Tuple, Dict
+from typing import List, Union, Any, Tuple, Dict, Mapping
 
 from bscearth.utils.date import parse_date
 from configobj import ConfigObj
-from contextlib import suppress
+from contextlib import contextmanager, suppress
 from pyparsing import nestedExpr
 from ruamel.yaml import YAML
 
 from log.log import Log, AutosubmitCritical, AutosubmitError
 from .basicconfig import BasicConfig
+from .chunkcalendar import ChunkCalendar
+from .configdaemon import ConfigDaemonClient, start_daemon
+from .expandedlist import ExpandedList
+from .filewatcher import create_file_watcher
+from .githead import resolve_head
+from .history import ConfigHistory
+from .parsecache import YAMLParseCache
+from .sharedsnapshot import SharedConfigSnapshot
 from .yamlparser import YAMLParserFactory
 
+# Immutable types that are shared instead of copied by AutosubmitConfig.copy_tree
+ATOMIC_TYPES = frozenset({str, int, float, bool, type(None), bytes})
+
+
+# First line of the saved experiment_data.yml, followed by the fingerprint of the data
+FINGERPRINT_HEADER = "# fingerprint: "
+# Header of the binary snapshot of the saved experiment data, followed by a line with its fingerprint
+SNAPSHOT_MAGIC = b"ASSNAP1\n"
+
+# Characters skipped between the tokens of a bracket list, as pyparsing does
+BRACKET_LIST_WHITESPACE = frozenset(" \t\n\r")
+
+
+def to_lower_str(value: Any) -> str:
+    """
+    Converts a configuration value to a lower case string, as used by the boolean options ("true"/"false").
+    """
+    return str(value).lower()
+
 
 class AutosubmitConfig(object):
     """
@@ -49,7 +82,8 @@ class AutosubmitConfig(object):
     :type expid: str
     """
 
-    def __init__(self, expid, basic_config=BasicConfig, parser_factory=YAMLParserFactory()):
+    def __init__(self, expid, basic_config=BasicConfig, parser_factory=YAMLParserFactory(), parse_cache=None,
+                 parse_workers=None):
         self.data_changed = False
         self.ignore_undefined_platforms = False
         self.ignore_file_path = False
@@ -59,8 +93,32 @@ class AutosubmitConfig(object):
         if not Path(BasicConfig.LOCAL_ROOT_DIR, expid).exists():
             raise IOError(f"Experiment {expid} does not exist")
         self.parser_factory = parser_factory
+        # Bumped every time experiment_data is replaced or modified by this class, see experiment_data_changed
+        self._generation = 0
+        # Flat DOTTED.KEY index of experiment_data, built per top level section for the current generation, see
+        # get_flat_parameters
+        self._flat_index = None
+        self._flat_sections = dict()
+        # Paths of the get_section lookups, see _lookup_section
+        self._section_cache = dict()
+        # (raw value, converted value) of the get_section_as calls, see get_section_as
+        self._typed_section_cache = dict()
+        # Expanded DATELIST and MEMBERS, keyed on their raw value
+        self._expanded_lists = dict()
+        # (date sequence, parameters, ChunkCalendar), see get_chunk_calendar
+        self._chunk_calendar = None
+        # Content hashes of the dicts and lists of experiment_data, by id, computed once per generation
+        self._fingerprints = None
+        # Content hashes of the dicts and lists of last_experiment_data and its root hash, computed once per
+        # assignment, see load_last_run
+        self._last_fingerprints = None
+        self._last_fingerprint = None
+        self.section_cache_hits = 0
+        self.section_cache_misses = 0
+        self.typed_cache_hits = 0
+        self.typed_cache_misses = 0
         self.experiment_data = {}
-        self.last_experiment_data = {}
+        self._last_experiment_data = {}
         self.data_loops = set()
 
         self.current_loaded_files = dict()
@@ -71,6 +129,7 @@ class AutosubmitConfig(object):
         self.warn_config = defaultdict(list)
         self.dynamic_variables = dict()
         self.special_dynamic_variables = dict()  # variables that will be sustituted after all files is loaded
+        self.placeholder_cycles = list()  # circular references found between dynamic variables
         self.starter_conf = dict()
         self.misc_files = []
         self.misc_data = list()
@@ -78,6 +137,78 @@ class AutosubmitConfig(object):
                                    'M': '%M%', 'M_': '%M_%', 'm': '%m%', 'm_': '%m_%'}
 
         self.metadata_folder = Path(self.conf_folder_yaml) / "metadata"
+        # Revisions of the experiment data saved by each run
+        self.history = ConfigHistory(self.metadata_folder / "history", self._fingerprint_value)
+        # Parsed yaml files are kept in this cache, if enabled, to avoid parsing again the unchanged ones
+        if parse_cache is None and BasicConfig.PARSE_CACHE_DIR:
+            parse_cache = YAMLParseCache(BasicConfig.PARSE_CACHE_DIR, BasicConfig.PARSE_CACHE_MAX_SIZE,
+                                         BasicConfig.PARSE_CACHE_MAX_AGE)
+        self.parse_cache = parse_cache
+        # Number of threads used to read and parse the yaml files of the same batch
+        self.parse_workers = parse_workers if parse_workers is not None else BasicConfig.PARSE_WORKERS
+        self._parsed_files = dict()
+        # Optional watcher of the loaded files used by needs_reload, see enable_file_watcher
+        self.file_watcher = None
+        # Copy of experiment_data in shared memory for the workers, see publish_shared_snapshot
+        self._shared_snapshot = None
+        if BasicConfig.WATCH_CONFIG_FILES:
+            self.enable_file_watcher()
+        # Normalized data of each loaded file and its (mtime_ns, size), reused by the next reload if unchanged
+        self._file_layers = dict()
+        # Source of the values while the files are merged by reload, tracked per dict, see get_key_provenance
+        self._provenance = None
+        self._provenance_sources = []
+        self._provenance_layers = []
+        self._key_provenance = dict()
+        self._key_lines = dict()
+
+    @property
+    def experiment_data(self) -> Dict[str, Any]:
+        return self._experiment_data
+
+    @experiment_data.setter
+    def experiment_data(self, experiment_data: Dict[str, Any]) -> None:
+        self._experiment_data = experiment_data
+        self.experiment_data_changed()
+
+    @property
+    def last_experiment_data(self) -> Dict[str, Any]:
+        """
+        Experiment data of the last run, compared with the current one by the diff functions. It is hashed once
+        per assignment, so it must be replaced rather than modified in place.
+        """
+        return self._last_experiment_data
+
+    @last_experiment_data.setter
+    def last_experiment_data(self, last_experiment_data: Dict[str, Any]) -> None:
+        self._last_experiment_data = last_experiment_data
+        self._last_fingerprints = None
+        self._last_fingerprint = None
+
+    @property
+    def generation(self) -> int:
+        """
+        Counter increased every time the experiment data changes, used to invalidate the data derived from it.
+        """
+        return self._generation
+
+    def experiment_data_changed(self) -> None:
+        """
+        Invalidates the data derived from experiment_data: the flat index, the fingerprints and the cached
+        get_section lookups.
+
+        It is called when experiment_data is assigned, by reload and by the setters of the configuration files.
+        Any other code modifying experiment_data in place must call it, as the fingerprints and the flat index
+        are only computed again on a new generation.
+        """
+        self._generation += 1
+        self._flat_index = None
+        self._flat_sections = dict()
+        self._section_cache = dict()
+        self._typed_section_cache = dict()
+        self._expanded_lists = dict()
+        self._chunk_calendar = None
+        self._fingerprints = None
 
     @property
     def jobs_data(self) -> Dict[str, Any]:
@@ -164,7 +295,7 @@ class AutosubmitConfig(object):
         :return: false/true
         :rtype: str
         """
-        return str(self.get_section([section, 'X11'], "false")).lower()
+        return self.get_section_as([section, 'X11'], to_lower_str, "false")
 
     def get_section(self, section, d_value="", must_exists=False):
         """
@@ -179,32 +310,110 @@ class AutosubmitConfig(object):
         :rtype: str
 
         """
-        section = [s.upper() for s in section]
-        # For text redeability
-        section_str = str(section[0])
-        for sect in section[1:]:
-            section_str += "." + str(sect)
-        current_level = self.experiment_data.get(section[0], "")
-        for param in section[1:]:
-            if current_level:
-                if type(current_level) is dict:
-                    current_level = current_level.get(param, d_value)
-                else:
-                    if must_exists:
-                        raise AutosubmitCritical(
-                            "[INDEX ERROR], {0} must exists. Check that {1} is an section that exists.".format(
-                                section_str,
-                                str(current_level)),
-                            7014)
+        key = tuple(section)
+        current_level, missing_index, not_dict = self._lookup_section(key)
+        if missing_index is not None:
+            # The lookups after a missing key continue from the default value
+            current_level = d_value
+            for param in key[missing_index:]:
+                if current_level:
+                    if type(current_level) is dict:
+                        current_level = current_level.get(param.upper(), d_value)
+                    else:
+                        not_dict = True
+                        break
+        if not_dict and must_exists:
+            raise AutosubmitCritical(
+                "[INDEX ERROR], {0} must exists. Check that {1} is an section that exists.".format(
+                    ".".join(sect.upper() for sect in section),
+                    str(current_level)),
+                7014)
         if current_level is None or (
                 not isinstance(current_level, numbers.Number) and len(current_level) == 0) and must_exists:
             raise AutosubmitCritical(
-                "{0} must exists. Check that subsection {1} exists.".format(section_str, str(current_level)), 7014)
+                "{0} must exists. Check that subsection {1} exists.".format(
+                    ".".join(sect.upper() for sect in section), str(current_level)), 7014)
         if current_level is None or (not isinstance(current_level, numbers.Number) and len(current_level) == 0):
             return d_value
         else:
             return current_level
 
+    def _lookup_section(self, section):
+        """
+        Walks the experiment data following the (not normalized) section path, as get_section does.
+
+        The normalized path and the dicts it goes through are cached. They are checked by identity on every
+        lookup, so the data modified in place is seen, and the walk continues from the last dict of the path,
+        reading the value every time.
+
+        :param section: section path
+        :type section: tuple
+        :return: value found, index of the path after the first missing key (or None if none is missing) and
+            whether a non dict value was found before the end of the path
+        :rtype: tuple
+        """
+        cached = self._section_cache.get(section)
+        if cached is not None:
+            keys, containers = cached
+            if containers[0] is not self._experiment_data or not all(
+                    containers[index].get(keys[index]) is containers[index + 1]
+                    for index in range(len(containers) - 1)):
+                cached = None
+        if cached is None:
+            self.section_cache_misses += 1
+            keys = tuple(param.upper() for param in section)
+            containers = [self._experiment_data]
+            for param in keys[:-1]:
+                value = containers[-1].get(param)
+                if type(value) is not dict or not value:
+                    break
+                containers.append(value)
+            self._section_cache[section] = (keys, tuple(containers))
+        else:
+            self.section_cache_hits += 1
+        current_level = containers[-1]
+        for index in range(len(containers) - 1, len(keys)):
+            param = keys[index]
+            if index == 0:
+                current_level = current_level.get(param, "")
+            elif current_level:
+                if type(current_level) is not dict:
+                    return current_level, None, True
+                if param not in current_level:
+                    return None, index + 1, False
+                current_level = current_level[param]
+        return current_level, None, False
+
+    def get_section_as(self, section, converter, d_value="", must_exists=False):
+        """
+        Gets a section, as get_section does, converted with the given function.
+
+        The converted values are cached per generation, path, converter and default value. The raw value is
+        read every time and the converted one is reused only if it is the same object, so the scalars modified
+        in place are seen. ``typed_cache_hits`` and ``typed_cache_misses`` count the lookups.
+
+        :param section: section to get
+        :type section: list
+        :param converter: function used to convert the value, such as int or to_lower_str
+        :param d_value: default value to return if section does not exist
+        :param must_exists: if true, error is raised if section does not exist
+        :type must_exists: bool
+        :return: converted section value
+        """
+        value = self.get_section(section, d_value, must_exists)
+        key = (self._generation, tuple(section), converter, d_value, type(d_value), must_exists)
+        try:
+            cached = self._typed_section_cache.get(key)
+        except TypeError:  # the default value is not hashable
+            return converter(value)
+        if cached is not None and cached[0] is value:
+            self.typed_cache_hits += 1
+            return cached[1]
+        self.typed_cache_misses += 1
+        converted = converter(value)
+        self._typed_section_cache[key] = (value, converted)
+        return converted
+
     def get_wchunkinc(self, section):
         """
         Gets the chunk increase to wallclock  
@@ -233,7 +442,7 @@ class AutosubmitConfig(object):
         :return: wallclock time
         :rtype: str
         """
-        return str(self.get_section([section, 'PROCESSORS'], 1))
+        return self.get_section_as([section, 'PROCESSORS'], str, 1)
 
     def get_threads(self, section):
         """
@@ -244,7 +453,7 @@ class AutosubmitConfig(object):
         :rtype: str
         """
 
-        return str(self.get_section([section, 'THREADS'], 1))
+        return self.get_section_as([section, 'THREADS'], str, 1)
 
     def get_tasks(self, section):
         """
@@ -254,7 +463,7 @@ class AutosubmitConfig(object):
         :return: tasks (processes) per host
         :rtype: str
         """
-        return str(self.get_section([section, 'TASKS'], ""))
+        return self.get_section_as([section, 'TASKS'], str, "")
 
     def get_scratch_free_space(self, section):
         """
@@ -264,7 +473,7 @@ class AutosubmitConfig(object):
         :return: percentage of scratch free space needed
         :rtype: int
         """
-        return int(self.get_section([section, 'SCRATCH_FREE_SPACE'], ""))
+        return self.get_section_as([section, 'SCRATCH_FREE_SPACE'], int, "")
 
     def get_memory(self, section):
         """
@@ -274,7 +483,7 @@ class AutosubmitConfig(object):
         :return: memory needed
         :rtype: str
         """
-        return str(self.get_section([section, 'MEMORY'], ""))
+        return self.get_section_as([section, 'MEMORY'], str, "")
 
     def get_memory_per_task(self, section):
         """
@@ -284,7 +493,7 @@ class AutosubmitConfig(object):
         :return: memory per task needed
         :rtype: str
         """
-        return str(self.get_section([section, 'MEMORY_PER_TASK'], ""))
+        return self.get_section_as([section, 'MEMORY_PER_TASK'], str, "")
 
     def get_migrate_user_to(self, section):
         """
@@ -302,7 +511,7 @@ class AutosubmitConfig(object):
         :return: migrate user to
         :rtype: str
         """
-        return str(self.get_section([section, 'SAME_USER'], "false")).lower()
+        return self.get_section_as([section, 'SAME_USER'], to_lower_str, "false")
 
     def get_current_user(self, section):
         """
@@ -360,6 +569,7 @@ class AutosubmitConfig(object):
                 'USER_TO:.*', contentToMod).group(0)[1:], "USER_TO: " + old_user)
         open(self._platforms_parser_file, 'w').write(content)
         open(self._platforms_parser_file, 'a').write(contentToMod)
+        self.experiment_data_changed()
 
     def set_new_host(self, section, new_host):
         """
@@ -389,6 +599,7 @@ class AutosubmitConfig(object):
                 'HOST_TO:.*', contentToMod).group(0)[1:], "HOST_TO: " + old_host)
         open(self._platforms_parser_file, 'w').write(content)
         open(self._platforms_parser_file, 'a').write(contentToMod)
+        self.experiment_data_changed()
 
     def get_migrate_project_to(self, section):
         """
@@ -436,6 +647,7 @@ class AutosubmitConfig(object):
                 "PROJECT_TO:.*", contentToMod).group(0)[1:], "PROJECT_TO: " + old_project)
         open(self._platforms_parser_file, 'w').write(content)
         open(self._platforms_parser_file, 'a').write(contentToMod)
+        self.experiment_data_changed()
 
     def get_custom_directives(self, section):
         """
@@ -517,6 +729,7 @@ class AutosubmitConfig(object):
         """
         if not isinstance(unified_config, collections.abc.Mapping):
             unified_config = {}
+        updated_keys = []
         for key in new_dict.keys():
             if key not in unified_config:
                 unified_config[key] = ""
@@ -527,14 +740,154 @@ class AutosubmitConfig(object):
             elif isinstance(val, list):
                 if len(val) > 0 and isinstance(val[0], collections.abc.Mapping):
                     unified_config[key] = val
+                    updated_keys.append(key)
                 else:
                     current_list = unified_config.get(key, [])
                     if current_list != val:
                         unified_config[key] = val
+                        updated_keys.append(key)
             else:
                 unified_config[key] = new_dict[key]
+                updated_keys.append(key)
+        if self._provenance is not None:
+            self._track_provenance(unified_config, new_dict, updated_keys)
         return unified_config
 
+    def _track_provenance(self, data: Dict[str, Any], source_data: Dict[str, Any], keys: List[str]) -> None:
+        """
+        Record that the values of ``keys`` in data were copied from source_data.
+        """
+        source = self._provenance.get(id(source_data), (source_data, {}))[1]
+        if not source and id(data) not in self._provenance:
+            return
+        if id(data) not in self._provenance:
+            self._add_provenance(data, {})
+        provenance = self._provenance[id(data)][1]
+        for key in keys:
+            if key in source:
+                provenance[key] = source[key]
+            else:
+                provenance.pop(key, None)
+
+    def _tag_provenance(self, data: Dict[str, Any], source: int) -> None:
+        """
+        Record the given source for all the values of the data of a file.
+        """
+        keys = {}
+        for key, val in data.items():
+            if isinstance(val, collections.abc.Mapping):
+                self._tag_provenance(val, source)
+            else:
+                keys[key] = source
+        self._add_provenance(data, keys)
+
+    def _add_provenance(self, data: Dict[str, Any], keys: Dict[str, int]) -> None:
+        """
+        Record the sources of the keys of a dict. The entry keeps the dict alive, so its id is not reused.
+        """
+        self._provenance[id(data)] = (data, keys)
+
+    def _drop_provenance(self, data: Dict[str, Any]) -> None:
+        """
+        Drop the entries of a dict and its nested dicts once they have been merged and are discarded, such as the
+        data of a file, so they are freed during the reload and not at its end. deep_update copies the values into
+        dicts of its own, so the merged data never shares them.
+        """
+        if self._provenance is None:
+            return
+        pending = [data]
+        while pending:
+            current = pending.pop()
+            entry = self._provenance.get(id(current), None)
+            if entry is not None and entry[0] is current:
+                del self._provenance[id(current)]
+            pending.extend(val for val in current.values() if isinstance(val, collections.abc.Mapping))
+
+    def _copy_config(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copy configuration data with copy_tree, keeping the provenance of its values.
+        """
+        memo = {}
+        copied = self.copy_tree(data, memo)
+        if self._provenance is not None:
+            for original_id, copied_value in list(memo.items()):
+                entry = self._provenance.get(original_id, None)
+                if entry is not None and entry[0] is not copied_value:
+                    self._add_provenance(copied_value, dict(entry[1]))
+        return copied
+
+    @contextmanager
+    def _provenance_layer(self, layer: str):
+        """
+        Name the layer of the files loaded inside the block, nested layers are joined with dots (``POST.PRE``).
+        """
+        self._provenance_layers.append(layer)
+        try:
+            yield
+        finally:
+            self._provenance_layers.pop()
+
+    def _build_key_provenance(self, data: Dict[str, Any], long_key: str = "") -> None:
+        entry = self._provenance.get(id(data), (data, {}))
+        for key, val in data.items():
+            if isinstance(val, collections.abc.Mapping):
+                self._build_key_provenance(val, f"{long_key}{key}.")
+            elif key in entry[1]:
+                self._key_provenance[f"{long_key}{key}"] = entry[1][key]
+
+    def get_key_provenance(self, key: str) -> Union[Tuple[str, str, Union[int, None]], None]:
+        """
+        Return which file set the value of a key in the last reload.
+
+        The layer is ``conf`` for the files of the experiment conf folder, ``PRE`` or ``POST`` for the files of
+        the CUSTOM_CONFIG sections, joined with dots when they are nested (``PRE.POST``). The line is searched in
+        the file only when asked for.
+
+        :param key: dotted key, for example ``JOBS.SIM.WALLCLOCK``.
+        :return: file, layer and line (starting at 1, None if not found) or None if the value was not set by a file.
+        """
+        source = self._key_provenance.get(key.upper(), None)
+        if source is None:
+            return None
+        yaml_file, layer = self._provenance_sources[source]
+        return yaml_file, layer, self._get_key_lines(yaml_file).get(key.upper(), None)
+
+    def get_keys_set_by_file(self, yaml_file: Union[str, Path]) -> List[str]:
+        """
+        Return the dotted keys whose value was set by a file in the last reload.
+
+        :param yaml_file: path of the file.
+        :return: list of dotted keys.
+        """
+        sources = {index for index, (source_file, _) in enumerate(self._provenance_sources) if
+                   source_file == str(yaml_file)}
+        return [key for key, source in self._key_provenance.items() if source in sources]
+
+    def _get_key_lines(self, yaml_file: str) -> Dict[str, int]:
+        """
+        Return the line of each dotted (normalized) key of a file, the file is composed but not constructed.
+        """
+        lines = self._key_lines.get(yaml_file, None)
+        if lines is None:
+            lines = {}
+            try:
+                with open(yaml_file, "r", encoding="utf-8") as f:
+                    node = YAML(typ="safe").compose(f)
+            except Exception as exc:
+                Log.debug(f"Unable to read the lines of {yaml_file}: {exc}")
+                node = None
+            stack = [(node, "")]
+            while stack:
+                node, long_key = stack.pop()
+                if node is None or node.id != "mapping":
+                    continue
+                for key_node, value_node in node.value:
+                    key = f"{long_key}{str(key_node.value).upper()}"
+                    lines[key] = key_node.start_mark.line + 1
+                    stack.append((value_node, f"{key}."))
+            self._key_lines[yaml_file] = lines
+        return lines
+
     def normalize_variables(self, data: dict, must_exists: bool) -> dict:
         """
         Apply some memory internal variables to normalize its format. (right now only dependencies)
@@ -704,28 +1057,107 @@ class AutosubmitConfig(object):
                     self.convert_list_to_string(data[key])
         return data
 
-    def load_config_file(self, current_folder_data, yaml_file, load_misc=False):
+    def read_config_file(self, yaml_file, load_misc=False):
         """
-        Load a config file and parse it
-        :param current_folder_data: current folder data
+        Parse a config file and normalize its data, without merging it
         :param yaml_file: yaml file to load
         :param load_misc: Load misc files
-        :return: unified config file
+        :return: normalized data of the file
         """
 
         # check if path is file o folder
         # load yaml file with ruamel.yaml
 
-        new_file = AutosubmitConfig.get_parser(self.parser_factory, yaml_file)
+        data = self._read_file_layer(yaml_file)
+        if data.get("AS_MISC", False) and not load_misc:
+            self.misc_files.append(yaml_file)
+            data = {}
+        if self._provenance is not None:
+            layer = ".".join(self._provenance_layers) or "conf"
+            self._provenance_sources.append((str(yaml_file), layer))
+            self._tag_provenance(data, len(self._provenance_sources) - 1)
+        return data
+
+    @staticmethod
+    def _file_layer_key(yaml_file) -> Union[Tuple[int, int], None]:
+        try:
+            file_stat = os.stat(yaml_file)
+        except (OSError, ValueError):
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def _is_file_layer_current(self, yaml_file) -> bool:
+        layer = self._file_layers.get(str(yaml_file), None)
+        return layer is not None and layer[0] == self._file_layer_key(yaml_file)
+
+    def _read_file_layer(self, yaml_file) -> Dict[str, Any]:
+        """
+        Return the normalized data of a file, parsing it only if it changed since it was last read.
+        :param yaml_file: yaml file to load
+        :return: normalized data of the file, owned by the caller
+        """
+        layer_key = self._file_layer_key(yaml_file)
+        layer = self._file_layers.get(str(yaml_file), None)
+        if layer is not None and layer_key is not None and layer[0] == layer_key:
+            return self.copy_tree(layer[1])
+        new_file = AutosubmitConfig.get_parser(self.parser_factory, yaml_file, self.parse_cache,
+                                               self._parsed_files)
         new_file.data = self.normalize_variables(new_file.data.copy(),
                                                  must_exists=False)  # TODO Figure out why this .copy is needed
         if new_file.data.get("DEFAULT", {}).get("CUSTOM_CONFIG", None) is not None:
             new_file.data["DEFAULT"]["CUSTOM_CONFIG"] = self.convert_list_to_string(
                 new_file.data["DEFAULT"]["CUSTOM_CONFIG"])
-        if new_file.data.get("AS_MISC", False) and not load_misc:
-            self.misc_files.append(yaml_file)
-            new_file.data = {}
-        return self.unify_conf(current_folder_data, new_file.data)
+        if layer_key is not None:
+            self._file_layers[str(yaml_file)] = (layer_key, self.copy_tree(new_file.data))
+        return new_file.data
+
+    def load_config_file(self, current_folder_data, yaml_file, load_misc=False):
+        """
+        Load a config file and parse it
+        :param current_folder_data: current folder data
+        :param yaml_file: yaml file to load
+        :param load_misc: Load misc files
+        :return: unified config file
+        """
+        data = self.read_config_file(yaml_file, load_misc)
+        current_folder_data = self.unify_conf(current_folder_data, data)
+        self._drop_provenance(data)
+        return current_folder_data
+
+    def _parse_yaml_file(self, yaml_file: Path) -> Any:
+        """
+        Parse a yaml file for the prefetch, errors are returned to be raised when the file is loaded.
+        """
+        if self._is_file_layer_current(yaml_file):
+            return None
+        try:
+            return AutosubmitConfig.get_parser(self.parser_factory, yaml_file, self.parse_cache).data
+        except Exception as exc:
+            return exc
+
+    def prefetch_yaml_files(self, filenames: List[Union[str, Path]]) -> None:
+        """
+        Read and parse a batch of yaml files in a pool of ``self.parse_workers`` threads.
+
+        Parsing is independent per file, so the parsed documents are stored and then used by load_config_file
+        when the callers merge them in their usual order. Files with placeholders in their path and the ones
+        already loaded are skipped.
+
+        :param filenames: files to parse
+        """
+        pending = []
+        for filename in filenames:
+            filename = Path(os.path.expanduser(str(filename).strip(", ")))
+            if "%" not in str(filename) and str(filename) not in self._parsed_files and str(
+                    filename) not in self.current_loaded_files and filename not in pending:
+                pending.append(filename)
+        workers = min(self.parse_workers, len(pending))
+        if workers <= 1:
+            return
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for filename, data in zip(pending, executor.map(self._parse_yaml_file, pending)):
+                if data is not None:
+                    self._parsed_files[str(filename)] = data
 
     def get_yaml_filenames_to_load(self, yaml_folder, ignore_minimal=False):
         """
@@ -755,6 +1187,7 @@ class AutosubmitConfig(object):
         :return: pre and post config
         """
         filenames_to_load = self.get_yaml_filenames_to_load(yaml_folder, ignore_minimal)
+        self.prefetch_yaml_files(filenames_to_load)
         return self.load_custom_config(current_data, filenames_to_load)
 
     def parse_custom_conf_directive(self, custom_conf_directive):
@@ -820,25 +1253,38 @@ class AutosubmitConfig(object):
             for section in loops[:-1]:
                 pointer_to_last_data = pointer_to_last_data[section]
             section_basename = loops[-1]
-            current_data = copy.deepcopy(pointer_to_last_data[loops[-1]])
-            # Remove the original section  keyword from original data
-            pointer_to_last_data.pop(loops[-1])
+            # Remove the original section from original data, it is only used as the template of the new ones
+            current_data = pointer_to_last_data.pop(loops[-1])
             for_sections = current_data.pop("FOR")
             for for_section, for_values in for_sections.items():
                 if not isinstance(for_values[0], dict):
                     for_values = str(for_values).strip("[]")
                     for_values = [v.strip("' ") for v in for_values.split(",")]
                 for_sections[for_section] = for_values
+            # All the new sections have the placeholders of the template, they are read and sorted only once
+            dynamic_variables = self.dynamic_variables
+            self.dynamic_variables = {}
+            self.deep_read_loops(current_data)
+            section_variables, self.dynamic_variables = self.dynamic_variables, dynamic_variables
+            section_variables.pop("NAME", None)
+            # The template is no longer in the data
+            template_key = ".".join(loops) + "."
+            for name in [name for name in self.dynamic_variables if name.startswith(template_key)]:
+                del self.dynamic_variables[name]
+            pattern = '%[a-zA-Z0-9_.-]*%'
+            order, cycles = self.sort_dynamic_variables(section_variables, pattern)
+            self._report_placeholder_cycles(cycles)
             for name_index in range(len(for_sections["NAME"])):
                 section_ending_name = section_basename + "_" + str(for_sections["NAME"][name_index].upper())
                 if "%" in section_ending_name:
                     print("Warning: % in a FOR section name, index skipped")
                     continue
-                current_data_aux = copy.deepcopy(current_data)
+                current_data_aux = self._copy_config(current_data)
                 current_data_aux["NAME"] = for_sections["NAME"][name_index]
-                # add the dynamic_var
-                self.deep_read_loops(current_data_aux)
-                current_data_aux = self.substitute_dynamic_variables(current_data_aux)
+                # Substitute the placeholders of the section, they are relative to it (%NAME%)
+                self._resolve_dynamic_variables(self.copy_tree(section_variables), current_data_aux, pattern, 1,
+                                                self.check_dict_keys_type(current_data_aux),
+                                                25 + len(section_variables), order=order)
                 pointer_to_last_data[section_ending_name] = current_data_aux
                 for key, value in for_sections.items():
                     if key != "NAME":
@@ -929,8 +1375,14 @@ class AutosubmitConfig(object):
         This function replaces placeholders in the experiment data with their corresponding values.
         It supports both long (%DEFAULT.EXPID%) and short (DEFAULT[EXPID]) key formats.
 
+        The placeholders are substituted in a single pass following the order of the references between
+        them (see ``sort_dynamic_variables``), so a variable is resolved after the ones it references.
+        Circular references are reported with a warning and left as they are. Special variables
+        (``%^VAR%``) are substituted in a final phase, once all the other placeholders are resolved.
+
         :param dict parameters: Dictionary containing the parameters to be substituted. If None, it will use self.experiment_data.
-        :param int max_deep: Maximum depth for recursive substitution. Default is 2+len(self.dynamic_variables).
+        :param int max_deep: Maximum number of extra passes for the placeholders brought by a substituted value that
+            were not known beforehand. Default is 25+len(self.dynamic_variables).
         :param str dict_keys_type: Type of keys in the parameters dictionary, either "long" or "short".
         :param bool in_the_end: Flag to indicate if special dynamic variables should be used. Default is False.
 
@@ -940,28 +1392,186 @@ class AutosubmitConfig(object):
         max_deep += len(self.dynamic_variables)
 
         dynamic_variables, pattern, start_long = self._initialize_variables()
-        if in_the_end:
-            dynamic_variables.update(self.special_dynamic_variables)
         if parameters is None:
-            parameters = self.deep_parameters_export(self.experiment_data, self.default_parameters)
+            parameters = self.load_parameters()
 
         if dict_keys_type is None:
             dict_keys_type = self.check_dict_keys_type(parameters)
 
-        while len(dynamic_variables) > 0 and max_deep > 0:
-            dynamic_variables_, parameters = self._process_dynamic_variables(dynamic_variables, parameters, pattern,
-                                                                             start_long, dict_keys_type, in_the_end=in_the_end)
-            # check if any value of dynamic_variables_ changed
-            if dynamic_variables_ == dynamic_variables:
-                break
-            dynamic_variables = dynamic_variables_
-            max_deep -= 1
+        dynamic_variables, parameters = self._resolve_dynamic_variables(dynamic_variables, parameters, pattern,
+                                                                        start_long, dict_keys_type, max_deep)
+        if in_the_end:
+            pattern_special_variables = r'%\^[a-zA-Z0-9_.-]*%'
+            special_dynamic_variables = {name: value for name, value in dynamic_variables.items() if "^" in str(value)}
+            special_dynamic_variables.update(copy.deepcopy(self.special_dynamic_variables))
+            special_dynamic_variables, parameters = self._resolve_dynamic_variables(
+                special_dynamic_variables, parameters, pattern_special_variables, start_long, dict_keys_type, max_deep)
+            dynamic_variables.update(special_dynamic_variables)
 
         self.dynamic_variables = dynamic_variables
 
         self.clean_dynamic_variables(pattern)
         return parameters
 
+    def _resolve_dynamic_variables(
+            self,
+            dynamic_variables: Dict[str, Any],
+            parameters: Dict[str, Any],
+            pattern: str,
+            start_long: int,
+            dict_keys_type: str,
+            max_deep: int,
+            order: List[str] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Substitute the placeholders matching ``pattern`` of the dynamic variables in dependency order.
+
+        :param dynamic_variables: Dictionary of dynamic variables to be processed.
+        :type dynamic_variables: Dict[str, Any]
+        :param parameters: Dictionary containing the parameters where substitutions will be applied.
+        :type parameters: Dict[str, Any]
+        :param pattern: Regex pattern to identify dynamic variable placeholders.
+        :type pattern: str
+        :param start_long: Start index for long key format substitution.
+        :type start_long: int
+        :param dict_keys_type: Type of keys in the parameters dictionary, either "long" or "short".
+        :type dict_keys_type: str
+        :param max_deep: Maximum number of extra passes, see ``substitute_dynamic_variables``.
+        :type max_deep: int
+        :param order: Substitution order already computed with ``sort_dynamic_variables``.
+        :type order: List[str]
+        :return: A tuple containing the updated dynamic variables and the modified parameters.
+        :rtype: Tuple[Dict[str, Any], Dict[str, Any]]
+        """
+        if dict_keys_type != "long":
+            # Only the variables with a placeholder that can be resolved in this data need a substitution
+            dynamic_variables_to_resolve = {
+                name: value for name, value in dynamic_variables.items()
+                if self._has_resolvable_placeholder(value, parameters, pattern)}
+        else:
+            dynamic_variables_to_resolve = dynamic_variables
+        if order is None:
+            order, cycles = self.sort_dynamic_variables(dynamic_variables_to_resolve, pattern)
+            self._report_placeholder_cycles(cycles)
+        else:
+            order = [name for name in order if name in dynamic_variables_to_resolve]
+            cycles = []
+        cyclic_variables = {name for cycle in cycles for name in cycle}
+        pending = {name: dynamic_variables[name] for name in order}
+        while pending and max_deep > 0:
+            # The lists are updated in place, so keep a copy of the values to know which ones changed
+            previous = {name: tuple(value) if isinstance(value, list) else value for name, value in pending.items()}
+            processed, parameters = self._process_dynamic_variables(pending, parameters, pattern, start_long,
+                                                                    dict_keys_type)
+            dynamic_variables.update(processed)
+            # Only a value copied from a placeholder that is not a dynamic variable itself can bring new ones
+            pending = {}
+            for name, value in processed.items():
+                current = tuple(value) if isinstance(value, list) else value
+                if name not in cyclic_variables and current != previous[name] and \
+                        re.search(pattern, str(value), flags=re.IGNORECASE):
+                    pending[name] = value
+            max_deep -= 1
+        return dynamic_variables, parameters
+
+    def _report_placeholder_cycles(self, cycles: List[List[str]]) -> None:
+        for cycle in cycles:
+            if cycle not in self.placeholder_cycles:
+                self.placeholder_cycles.append(cycle)
+                Log.warning(f"Circular reference between placeholders: {' -> '.join(cycle)}. "
+                            f"They will not be fully substituted")
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def find_placeholders(pattern: str, text: str) -> Tuple[str, ...]:
+        """
+        Return the placeholders matching ``pattern`` in ``text``, without the ``%`` and ``^`` delimiters.
+
+        :param pattern: Regex pattern to identify dynamic variable placeholders.
+        :type pattern: str
+        :param text: Text to search, the ``str`` of the value of a dynamic variable.
+        :type text: str
+        :return: The names referenced by the placeholders.
+        :rtype: Tuple[str, ...]
+        """
+        return tuple(placeholder.strip("%^") for placeholder in re.findall(pattern, text, flags=re.IGNORECASE))
+
+    def _has_resolvable_placeholder(self, value: Any, parameters: Dict[str, Any], pattern: str) -> bool:
+        """
+        Check if any placeholder of a dynamic variable value has a value in the (short format) parameters.
+
+        :param value: Value of the dynamic variable.
+        :param parameters: Dictionary containing the parameters to be substituted.
+        :param pattern: Regex pattern to identify dynamic variable placeholders.
+        :return: False if substituting the value would leave it unchanged.
+        :rtype: bool
+        """
+        for placeholder in self.find_placeholders(pattern, str(value)):
+            param = parameters
+            for k in placeholder.split("."):
+                if not isinstance(param, collections.abc.Mapping):
+                    # Let the substitution handle this case as it always did
+                    return True
+                param = param.get(k.strip("^").upper(), {})
+                if isinstance(param, int):
+                    param = str(param)
+            if param:
+                return True
+        return False
+
+    @staticmethod
+    def sort_dynamic_variables(dynamic_variables: Dict[str, Any], pattern: str) -> Tuple[List[str], List[List[str]]]:
+        """
+        Sort the dynamic variables so each one comes after the dynamic variables its placeholders reference.
+
+        A placeholder references a variable with the same name or any variable inside it, as the value
+        of a section is its whole content. Variables without dependencies keep their original order.
+
+        :param dynamic_variables: Dictionary of dynamic variables, the keys are their dotted names.
+        :type dynamic_variables: Dict[str, Any]
+        :param pattern: Regex pattern to identify dynamic variable placeholders.
+        :type pattern: str
+        :return: The names of the variables in substitution order and the circular references found, each one
+            as the list of names of the variables in it.
+        :rtype: Tuple[List[str], List[List[str]]]
+        """
+        variables_in = defaultdict(list)
+        for name in dynamic_variables:
+            parts = str(name).upper().split(".")
+            for i in range(1, len(parts) + 1):
+                variables_in[".".join(parts[:i])].append(name)
+
+        dependencies = {}
+        for name, value in dynamic_variables.items():
+            references = dict()
+            for placeholder in AutosubmitConfig.find_placeholders(pattern, str(value)):
+                for reference in variables_in.get(placeholder.upper(), []):
+                    references[reference] = None
+            dependencies[name] = list(references)
+
+        order, cycles = [], []
+        state = dict()  # name -> 1 while its dependencies are being visited, 2 when done
+        for root in dynamic_variables:
+            if root in state:
+                continue
+            state[root] = 1
+            stack = [(root, iter(dependencies[root]))]
+            while stack:
+                name, pending = stack[-1]
+                for dependency in pending:
+                    if dependency not in state:
+                        state[dependency] = 1
+                        stack.append((dependency, iter(dependencies[dependency])))
+                        break
+                    if state[dependency] == 1:
+                        path = [node for node, _ in stack]
+                        cycles.append(path[path.index(dependency):] + [dependency])
+                else:
+                    stack.pop()
+                    state[name] = 2
+                    order.append(name)
+        return order, cycles
+
     def _initialize_variables(self) -> Tuple[Dict[str, str], str, int]:
         """
         Initialize dynamic variables.
@@ -970,7 +1580,15 @@ class AutosubmitConfig(object):
         :rtype: tuple
         """
 
-        return copy.deepcopy(self.dynamic_variables), '%[a-zA-Z0-9_.-]*%', 1
+        dynamic_variables = {}
+        for name, value in self.dynamic_variables.items():
+            if isinstance(value, str):
+                dynamic_variables[name] = value
+            elif isinstance(value, list) and all(isinstance(item, str) for item in value):
+                dynamic_variables[name] = list(value)
+            else:
+                dynamic_variables[name] = copy.deepcopy(value)
+        return dynamic_variables, '%[a-zA-Z0-9_.-]*%', 1
 
     def _process_dynamic_variables(
             self,
@@ -1173,12 +1791,12 @@ class AutosubmitConfig(object):
             # Pattern to search a string starting with %^ and ending with %
             special_dynamic_var_pattern = '%\^[a-zA-Z0-9_.-]*%'
 
-            if not isinstance(val, collections.abc.Mapping) and re.search(dynamic_var_pattern, str(val),
-                                                                          flags=re.IGNORECASE) is not None:
-                self.dynamic_variables[long_key + key] = val
-            elif not isinstance(val, collections.abc.Mapping) and re.search(special_dynamic_var_pattern, str(val),
-                                                                            flags=re.IGNORECASE) is not None:
-                self.special_dynamic_variables[long_key + key] = val
+            # Both patterns need a %, most of the values don't have it
+            if not isinstance(val, collections.abc.Mapping) and "%" in str(val):
+                if re.search(dynamic_var_pattern, str(val), flags=re.IGNORECASE) is not None:
+                    self.dynamic_variables[long_key + key] = val
+                elif re.search(special_dynamic_var_pattern, str(val), flags=re.IGNORECASE) is not None:
+                    self.special_dynamic_variables[long_key + key] = val
             if key == "FOR":
                 # special case: check dynamic variables in the for loop
                 for for_section, for_values in data[key].items():
@@ -1358,6 +1976,7 @@ class AutosubmitConfig(object):
                 else:
                     mails = mails.split(' ')
                 self.experiment_data["MAIL"]["TO"] = mails
+                self.experiment_data_changed()
 
                 for mail in self.experiment_data["MAIL"]["TO"]:
                     if not self.is_valid_mail_address(mail):
@@ -1679,6 +2298,7 @@ class AutosubmitConfig(object):
         current_data_pre = {}
         current_data_aux = {}
         current_data_post = {}
+        self.prefetch_yaml_files(filenames_to_load)
         # at this point, filenames_to_load should be a list of filenames of an specific section PRE or POST.
         for filename in filenames_to_load:
             filename = filename.strip(", ")  # Remove commas and spaces if any
@@ -1687,8 +2307,10 @@ class AutosubmitConfig(object):
             current_data_aux = self.unify_conf(self.starter_conf, current_data)
             current_data_aux["AS_TEMP"] = {}
             current_data_aux["AS_TEMP"]["FILENAME_TO_LOAD"] = filename
-            self.dynamic_variables["AS_TEMP.FILENAME_TO_LOAD"] = filename
-            current_data_aux = self.substitute_dynamic_variables(current_data_aux)
+            if "%" in filename:
+                # Only a path with placeholders needs to be resolved
+                self.dynamic_variables["AS_TEMP.FILENAME_TO_LOAD"] = filename
+                current_data_aux = self.substitute_dynamic_variables(current_data_aux)
             filename = Path(current_data_aux["AS_TEMP"]["FILENAME_TO_LOAD"])
             if not filename.exists() and "%" not in str(filename):
                 Log.warning(f"Yaml file {filename} not found")
@@ -1698,13 +2320,13 @@ class AutosubmitConfig(object):
                 # Load a folder or a file
                 if not filename.is_file():
                     # Load a folder by calling recursively to this function as a list of files
-                    current_data_pre, current_data_post = self.load_config_folder(copy.deepcopy(current_data), filename)
+                    current_data_pre, current_data_post = self.load_config_folder(self._copy_config(current_data),
+                                                                                  filename)
                     current_data = self.unify_conf(current_data_pre, current_data)
                     current_data = self.unify_conf(current_data, current_data_post)
                 else:
                     # Load a file and unify the current_data with the loaded data
-                    current_data = self.unify_conf(current_data,
-                                                   self.load_config_file(current_data, filename))
+                    current_data = self.load_config_file(current_data, filename)
                     # Load next level if any
                     custom_conf_directive = current_data.get('DEFAULT', {}).get('CUSTOM_CONFIG', None)
                     filenames_to_load_level = self.parse_custom_conf_directive(custom_conf_directive)
@@ -1715,20 +2337,24 @@ class AutosubmitConfig(object):
                     filenames_to_load_level["POST"] = [to_load for to_load in filenames_to_load_level["POST"] if
                                                        to_load not in self.current_loaded_files]
                     if len(filenames_to_load_level["PRE"]) > 0:
-                        current_data_pre = self.unify_conf(current_data_pre,
-                                                           self.load_custom_config_section(copy.deepcopy(current_data),
-                                                                                           filenames_to_load_level[
-                                                                                               "PRE"]))
+                        section_base = self._copy_config(current_data)
+                        with self._provenance_layer("PRE"):
+                            section_data = self.load_custom_config_section(section_base,
+                                                                           filenames_to_load_level["PRE"])
+                        current_data_pre = self.unify_conf(current_data_pre, section_data)
+                        # Both are built from the copy, so they are not referenced by anything else
+                        self._drop_provenance(section_base)
+                        self._drop_provenance(section_data)
                     else:
                         current_data_pre = current_data
                     current_data = self.unify_conf(current_data_pre, current_data)
 
                     if len(filenames_to_load_level["POST"]) > 0:
-                        current_data_post = self.unify_conf(current_data_post, self.unify_conf(current_data,
-                                                                                               self.load_custom_config_section(
-                                                                                                   current_data,
-                                                                                                   filenames_to_load_level[
-                                                                                                       "POST"])))
+                        with self._provenance_layer("POST"):
+                            section_data = self.load_custom_config_section(current_data,
+                                                                           filenames_to_load_level["POST"])
+                        current_data_post = self.unify_conf(current_data_post,
+                                                            self.unify_conf(current_data, section_data))
                     else:
                         current_data_post = current_data
 
@@ -1803,6 +2429,8 @@ class AutosubmitConfig(object):
         if len(self.current_loaded_files) == 0:
             return True
         if self.experiment_data.get("CONFIG", {}).get("RELOAD_WHILE_RUNNING", True):
+            if self.file_watcher is not None:
+                return len(self.file_watcher.changed_files()) > 0
             for file in self.current_loaded_files.keys():
                 if os.path.exists(file):
                     mod_time = os.path.getmtime(file)
@@ -1810,30 +2438,124 @@ class AutosubmitConfig(object):
                         return True
         return False
 
+    def load_from_daemon(self, socket_path: str = None, force_load: bool = False, start: bool = False) -> bool:
+        """
+        Gets the resolved experiment data from the local config daemon, see ``configdaemon``, instead of loading
+        the files in this process. The daemon loads them with the AS_ENV variables, the user and the autosubmitrc
+        of this process. If the daemon is not running, or it fails, the files are loaded with reload.
+
+        :param socket_path: socket of the daemon, the default one of the user if not given
+        :param force_load: reload all the files
+        :param start: start the daemon if it is not running
+        :return: True if the data was served by the daemon, False if it was loaded in this process
+        """
+        if start:
+            start_daemon(socket_path)
+        try:
+            response = ConfigDaemonClient(socket_path).get(self.expid, force=force_load)
+        except (OSError, RuntimeError, ValueError) as exc:
+            Log.debug(f"Loading the configuration in-process, the config daemon is not available: {exc}")
+            self.reload(force_load=force_load)
+            return False
+        self.current_loaded_files = response["loaded_files"]
+        self.starter_conf = response["starter_conf"]
+        self.misc_files = [Path(file) for file in response["misc_files"]]
+        self.misc_data = response["misc_data"]
+        self._key_provenance = response["key_provenance"]
+        self._provenance_sources = response["provenance_sources"]
+        self._key_lines = {}
+        self.experiment_data = response["experiment_data"]
+        if self.file_watcher is not None:
+            self.file_watcher.watch(self.current_loaded_files)
+        return True
+
+    def publish_shared_snapshot(self) -> SharedConfigSnapshot:
+        """
+        Publishes a read-only copy of experiment_data in shared memory, so worker processes attach to it with
+        ``SharedConfigSnapshot.attach(snapshot.name)`` instead of loading the configuration or receiving a pickle
+        of it. The snapshot is published again only if the data has changed, then the previous one becomes stale.
+
+        :return: the current snapshot, closed by close_shared_snapshot
+        :rtype: SharedConfigSnapshot
+        """
+        fingerprint = self.get_fingerprint()
+        if self._shared_snapshot is not None and not self._shared_snapshot.stale:
+            if self._shared_snapshot.fingerprint == fingerprint:
+                return self._shared_snapshot
+        snapshot = SharedConfigSnapshot.publish(self.experiment_data, self.generation, fingerprint)
+        self.close_shared_snapshot()
+        self._shared_snapshot = snapshot
+        return snapshot
+
+    def close_shared_snapshot(self) -> None:
+        """
+        Marks the shared snapshot as stale and removes it, the workers keep the sections already read.
+        """
+        if self._shared_snapshot is not None:
+            self._shared_snapshot.close()
+            self._shared_snapshot = None
+
+    def enable_file_watcher(self) -> None:
+        """
+        Watches the loaded files with inotify, if available, so needs_reload only checks the files that had
+        changes instead of all of them.
+        """
+        if self.file_watcher is None:
+            self.file_watcher = create_file_watcher()
+            self.file_watcher.watch(self.current_loaded_files)
+
+    def get_changed_files(self) -> List[str]:
+        """
+        Returns the loaded files modified since they were loaded.
+
+        :return: paths of the modified files
+        :rtype: list
+        """
+        if self.file_watcher is not None:
+            return self.file_watcher.changed_files()
+        return [file for file, mod_time in self.current_loaded_files.items()
+                if os.path.exists(file) and os.path.getmtime(file) > mod_time]
+
     def reload(self, force_load=False, only_experiment_data=False, save=False):
         """
         Reloads the configuration files
         :param force_load: If True, reloads all the files, if False, reloads only the modified files
         """
         # Check if the files have been modified or if they need a reload
-        # Reload only the files that have been modified
+        # Reload only the files that have been modified, the normalized data of the others is reused
         # Only reload the data if there are changes or there is no data loaded yet
+        if force_load:
+            self._file_layers = {}
         if force_load or self.needs_reload():
             # Load all the files starting from the $expid/conf folder
             starter_conf = {}
             self.current_loaded_files = {}  # reset loaded files
-            for filename in self.get_yaml_filenames_to_load(self.conf_folder_yaml):
-                starter_conf = self.unify_conf(starter_conf, self.load_config_file(starter_conf, Path(filename)))
+            self._parsed_files = {}
+            self._provenance = {}
+            self._provenance_sources = []
+            self._key_lines = {}
+            conf_filenames = self.get_yaml_filenames_to_load(self.conf_folder_yaml)
+            self.prefetch_yaml_files(conf_filenames)
+            # Each file is read and normalized once, both the starter and the non-minimal data are built from it
+            conf_files_data = {filename: self.read_config_file(Path(filename)) for filename in conf_filenames}
+            for filename in conf_filenames:
+                # The merge shares the lists of the file data, that are later modified by the substitutions
+                file_data = self._copy_config(conf_files_data[filename])
+                starter_conf = self.unify_conf(starter_conf, file_data)
+                self._drop_provenance(file_data)
             starter_conf = self.load_as_env_variables(starter_conf)
             starter_conf = self.load_common_parameters(starter_conf)
             self.starter_conf = starter_conf
             # Same data without the minimal config ( if any ), need to be here to due current_loaded_files variable
             non_minimal_conf = {}
             non_minimal_files = {}
-            for filename in self.get_yaml_filenames_to_load(self.conf_folder_yaml, ignore_minimal=True):
+            for filename in conf_filenames:
+                if filename.endswith(("minimal.yml", "minimal.yaml")):
+                    continue
                 non_minimal_files[str(filename)] = Path(filename).stat().st_mtime
-                non_minimal_conf = self.unify_conf(non_minimal_conf,
-                                                   self.load_config_file(non_minimal_conf, Path(filename)))
+                non_minimal_conf = self.unify_conf(non_minimal_conf, conf_files_data[filename])
+            for file_data in conf_files_data.values():
+                self._drop_provenance(file_data)
             non_minimal_conf = self.load_common_parameters(non_minimal_conf)
             # Start loading the custom config files
             # Gets the files to load
@@ -1841,10 +2563,13 @@ class AutosubmitConfig(object):
                 starter_conf.get("DEFAULT", {}).get("CUSTOM_CONFIG", None))
             if not only_experiment_data:
                 # Loads all configuration associated with the project data "pre"
-                custom_conf_pre = self.load_custom_config_section({}, filenames_to_load["PRE"])
+                with self._provenance_layer("PRE"):
+                    custom_conf_pre = self.load_custom_config_section({}, filenames_to_load["PRE"])
                 # Loads all configuration associated with the user data "post"
-                self.experiment_data = self.load_custom_config_section(
-                    self.unify_conf(custom_conf_pre, non_minimal_conf), filenames_to_load["POST"])
+                current_data = self.unify_conf(custom_conf_pre, non_minimal_conf)
+                self._drop_provenance(non_minimal_conf)
+                with self._provenance_layer("POST"):
+                    self.experiment_data = self.load_custom_config_section(current_data, filenames_to_load["POST"])
             else:
                 self.experiment_data = starter_conf
             ###
@@ -1853,6 +2578,9 @@ class AutosubmitConfig(object):
                 del self.experiment_data["AS_TEMP"]
             # IF expid and hpcarch are not defined, use the ones from the minimal.yml file
             self.deep_add_missing_starter_conf(self.experiment_data, starter_conf)
+            self._key_provenance = {}
+            self._build_key_provenance(self.experiment_data)
+            self._provenance = None
             self.experiment_data['ROOTDIR'] = os.path.join(
                 BasicConfig.LOCAL_ROOT_DIR, self.expid)
             self.experiment_data['PROJDIR'] = self.get_project_dir()
@@ -1863,11 +2591,15 @@ class AutosubmitConfig(object):
             self._add_autosubmit_dict()
             self.misc_data = {}
             self.misc_files = list(set(self.misc_files))
+            self.prefetch_yaml_files(self.misc_files)
             for filename in self.misc_files:
-                self.misc_data = self.unify_conf(self.misc_data,
-                                                 self.load_config_file(self.misc_data, Path(filename), load_misc=True))
+                self.misc_data = self.load_config_file(self.misc_data, Path(filename), load_misc=True)
+            self._parsed_files = {}
             self.load_current_hpcarch_parameters()
             self.load_workflow_commit()
+            self.experiment_data_changed()
+            if self.file_watcher is not None:
+                self.file_watcher.watch(self.current_loaded_files)
 
     def _add_autosubmit_dict(self) -> None:
         """
@@ -1888,11 +2620,16 @@ class AutosubmitConfig(object):
             project_dir = f"{self.experiment_data.get('ROOTDIR', '')}/proj/{self.experiment_data.get('PROJECT', {}).get('PROJECT_DESTINATION', 'git_project')}"
             if Path(project_dir).joinpath(".git").exists():
                 with suppress(KeyError, ValueError, UnicodeDecodeError):
-                    self.experiment_data["AUTOSUBMIT"]["WORKFLOW_COMMIT"] = subprocess.check_output(
-                        "git rev-parse HEAD",
-                        cwd=project_dir,
-                        shell=True
-                    ).decode(locale.getpreferredencoding()).strip("\n")
+                    # git is only run for the repositories that can't be read directly
+                    commit = resolve_head(project_dir)
+                    if commit is None:
+                        commit = subprocess.check_output(
+                            "git rev-parse HEAD",
+                            cwd=project_dir,
+                            shell=True
+                        ).decode(locale.getpreferredencoding()).strip("\n")
+                    self.experiment_data["AUTOSUBMIT"]["WORKFLOW_COMMIT"] = commit
+                    self.experiment_data_changed()
 
     def load_current_hpcarch_parameters(self) -> None:
         """
@@ -1903,9 +2640,11 @@ class AutosubmitConfig(object):
             self.experiment_data[f"HPC{name}"] = value
         self.experiment_data["HPCARCH"] = hpcarch
 
-    def save(self):
+    def save(self, write_yaml=True):
         """
-        Saves the experiment data into the experiment_folder/conf/metadata folder as a yaml file
+        Saves the experiment data into the experiment_folder/conf/metadata folder as a binary snapshot and a yaml file.
+        The files already holding the same data, according to their fingerprint, are not written again.
+        :param write_yaml: if False, only the snapshot is written, the yaml file can be written later with save_yaml
         :return: True if the data has changed, False otherwise
         """
         if self.is_current_logged_user_owner:
@@ -1913,20 +2652,196 @@ class AutosubmitConfig(object):
                 self.metadata_folder.mkdir(parents=True, exist_ok=True)
                 self.metadata_folder.chmod(0o755)
 
-            if self.metadata_folder.joinpath("experiment_data.yml").exists():
-                shutil.copy(self.metadata_folder.joinpath("experiment_data.yml"),
-                            self.metadata_folder.joinpath("experiment_data.yml.bak"))
-
             try:
-                with open(self.metadata_folder.joinpath("experiment_data.yml"), 'w') as stream:
-                    # Not using typ="safe" to perserve the readability of the file
-                    YAML().dump(self.experiment_data, stream)
-                self.metadata_folder.joinpath("experiment_data.yml").chmod(0o755)
+                fingerprint = self.get_fingerprint()
+                changed = self._get_snapshot_fingerprint() != fingerprint
+                if changed:
+                    self._save_snapshot()
+                if write_yaml and self._get_yaml_fingerprint() != fingerprint:
+                    self.save_yaml()
             except Exception:
-                if self.metadata_folder.joinpath("experiment_data.yml").exists():
-                    os.remove(self.metadata_folder.joinpath("experiment_data.yml"))
+                # The files are written atomically, so the ones already there are intact and kept
                 self.data_changed = True
                 self.last_experiment_data = {}
+                return
+            if changed:
+                try:
+                    self.history.add(self.experiment_data)
+                except Exception as exc:
+                    Log.warning(f"Unable to store the configuration in the history: {exc}")
+
+    def get_config_revisions(self) -> List[Dict[str, Any]]:
+        """
+        Returns the revisions of the experiment data stored by save, from the oldest to the newest.
+
+        :return: number, timestamp and fingerprint of each revision
+        :rtype: list
+        """
+        revisions = []
+        for revision in self.history.revisions():
+            manifest = self.history.get_revision(revision)
+            revisions.append({"revision": revision, "timestamp": manifest["timestamp"],
+                              "fingerprint": manifest["fingerprint"]})
+        return revisions
+
+    def load_config_revision(self, revision: int) -> Dict[str, Any]:
+        """
+        Returns the experiment data of a revision, see get_config_revisions.
+
+        :param revision: number of the revision, negative numbers count from the newest one.
+        """
+        return self.history.load(revision)
+
+    def diff_config_revisions(self, revision: int, old_revision: int) -> Dict[str, Any]:
+        """
+        Returns the differences between two revisions, as detailed_deep_diff does. Only the sections that are not
+        the same in both revisions are loaded and compared.
+
+        :param revision: number of the revision, negative numbers count from the newest one.
+        :param old_revision: number of the revision to compare with.
+        """
+        sections = self.history.get_revision(revision)["sections"]
+        old_sections = self.history.get_revision(old_revision)["sections"]
+        current_data = {key: self.history.load_section(object_hash) for key, object_hash in sections.items()
+                        if old_sections.get(key, None) != object_hash}
+        old_data = {key: self.history.load_section(object_hash) for key, object_hash in old_sections.items()
+                    if sections.get(key, None) != object_hash}
+        return self.detailed_deep_diff(current_data, old_data)
+
+    def _fingerprint_value(self, value: Any) -> bytes:
+        """
+        Returns the fingerprint of a value, reusing the ones of the subtrees of experiment_data.
+        """
+        # The new hashes are not added to the fingerprints of experiment_data, value may be modified later
+        return self.fingerprint_tree(value, collections.ChainMap({}, self._get_fingerprints()))
+
+    def save_yaml(self):
+        """
+        Writes the experiment data into the human-readable experiment_folder/conf/metadata/experiment_data.yml, the
+        previous file is kept as experiment_data.yml.bak
+        """
+        def dump(stream):
+            # The fingerprint allows to know if the data has changed without parsing the file
+            stream.write(f"{FINGERPRINT_HEADER}{self.get_fingerprint()}\n")
+            # Not using typ="safe" to perserve the readability of the file
+            YAML().dump(self.experiment_data, stream)
+
+        self._write_atomically(self.metadata_folder.joinpath("experiment_data.yml"), 'w', dump,
+                               self.metadata_folder.joinpath("experiment_data.yml.bak"))
+
+    def _save_snapshot(self):
+        """
+        Writes the experiment data into experiment_folder/conf/metadata/experiment_data.pkl, see load_last_run
+        """
+        def dump(stream):
+            stream.write(SNAPSHOT_MAGIC)
+            stream.write(f"{self.get_fingerprint()}\n".encode())
+            pickle.dump(self.experiment_data, stream, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._write_atomically(self.metadata_folder.joinpath("experiment_data.pkl"), 'wb', dump)
+
+    @staticmethod
+    def _write_atomically(path: Path, mode: str, dump, backup: Path = None) -> None:
+        """
+        Writes a file through a temporary one that replaces it once it is complete and synced to disk, so the file
+        is never left half written.
+
+        :param path: file to write.
+        :param mode: mode used to open the file, 'w' or 'wb'.
+        :param dump: function that writes the content into the opened file.
+        :param backup: if given, the previous file is kept as it, through a hard link so the file always exists.
+        """
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, mode) as stream:
+                dump(stream)
+                stream.flush()
+                os.fsync(stream.fileno())
+            tmp_path.chmod(0o755)
+            if backup is not None and path.exists():
+                with suppress(FileNotFoundError):
+                    os.remove(backup)
+                try:
+                    os.link(path, backup)
+                except OSError:
+                    shutil.copy2(path, backup)
+            os.replace(tmp_path, path)
+        finally:
+            with suppress(OSError):
+                tmp_path.unlink()
+
+    def _get_snapshot_fingerprint(self) -> Union[str, None]:
+        """
+        Returns the fingerprint stored in the header of the snapshot, or None if there is no valid snapshot
+        """
+        try:
+            with open(self.metadata_folder.joinpath("experiment_data.pkl"), 'rb') as stream:
+                return self._read_snapshot_header(stream)
+        except OSError:
+            return None
+
+    @staticmethod
+    def _read_snapshot_header(stream) -> Union[str, None]:
+        """
+        Reads the header of the snapshot and returns its fingerprint, or None if it is not a valid snapshot
+        """
+        if stream.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            return None
+        return stream.readline().decode().strip() or None
+
+    def _snapshot_is_current(self) -> bool:
+        """
+        Returns if the snapshot holds the last saved data: the yaml file does not exist, it has the same
+        fingerprint, or it was written before the snapshot (see save with write_yaml=False)
+        """
+        snapshot = self.metadata_folder.joinpath("experiment_data.pkl")
+        yaml_file = self.metadata_folder.joinpath("experiment_data.yml")
+        snapshot_fingerprint = self._get_snapshot_fingerprint()
+        if snapshot_fingerprint is None:
+            return False
+        try:
+            snapshot_mtime = snapshot.stat().st_mtime_ns
+        except OSError:
+            return False
+        try:
+            yaml_mtime = yaml_file.stat().st_mtime_ns
+        except OSError:
+            return True
+        return snapshot_mtime >= yaml_mtime or self._get_yaml_fingerprint() == snapshot_fingerprint
+
+    def load_last_run(self) -> Dict[str, Any]:
+        """
+        Loads the experiment data saved by the last run into last_experiment_data. The binary snapshot is used if
+        it is current, the yaml file is parsed otherwise.
+
+        :return: data of the last run, empty if it was not saved
+        :rtype: dict
+        """
+        data = None
+        fingerprint = None
+        if self._snapshot_is_current():
+            try:
+                with open(self.metadata_folder.joinpath("experiment_data.pkl"), 'rb') as stream:
+                    fingerprint = self._read_snapshot_header(stream)
+                    data = pickle.load(stream)
+            except Exception as exc:
+                Log.debug(f"Discarding the snapshot of the last run: {exc}")
+        if data is None:
+            try:
+                with open(self.metadata_folder.joinpath("experiment_data.yml"), 'r') as stream:
+                    header = stream.readline()
+                    fingerprint = header[len(FINGERPRINT_HEADER):].strip() if header.startswith(
+                        FINGERPRINT_HEADER) else None
+                    data = YAML(typ="safe").load(header + stream.read())
+            except FileNotFoundError:
+                data = None
+        self.last_experiment_data = data or {}
+        if data and fingerprint:
+            # The header holds the hash of the saved data, so the last run is not hashed unless the diff
+            # functions have to look into its sections
+            with suppress(ValueError):
+                self._last_fingerprint = bytes.fromhex(fingerprint)
+        return self.last_experiment_data
 
     def detailed_deep_diff(self, current_data, last_run_data, level=0):
         """
@@ -1940,6 +2855,9 @@ class AutosubmitConfig(object):
             current_data = {}
         if last_run_data is None:
             last_run_data = {}
+        # Subtrees of experiment_data and last_experiment_data with the same content are not walked
+        if self._same_fingerprint(current_data, last_run_data):
+            return None if level > 0 else differences
         # Check if current_data key is present on last_run_data
         # If present, obtain the new value
         for key, val in current_data.items():
@@ -1986,6 +2904,8 @@ class AutosubmitConfig(object):
             return changed
         if changed:
             return True
+        if self._same_fingerprint(current_data, last_run_data):
+            return False
         try:
             for key, val in current_data.items():
                 if isinstance(val, collections.abc.Mapping):
@@ -2002,6 +2922,134 @@ class AutosubmitConfig(object):
             changed = True
         return changed
 
+    def _same_fingerprint(self, current_data, last_run_data) -> bool:
+        """
+        Returns True if one is a subtree of experiment_data and the other one a subtree of last_experiment_data, in
+        any order, with the same fingerprint. Data that is not part of them is never considered equal, so the diff
+        functions walk it.
+        """
+        for current, last in ((current_data, last_run_data), (last_run_data, current_data)):
+            if current is self._experiment_data and last is self._last_experiment_data:
+                return self.fingerprint_tree(current, self._get_fingerprints()) == self._get_last_fingerprint()
+        fingerprints = self._get_fingerprints()
+        last_fingerprints = self._get_last_fingerprints()
+        for current, last in ((current_data, last_run_data), (last_run_data, current_data)):
+            current_cached = fingerprints.get(id(current), None)
+            last_cached = last_fingerprints.get(id(last), None)
+            if (current_cached is not None and last_cached is not None and current_cached[0] is current and
+                    last_cached[0] is last):
+                return current_cached[1] == last_cached[1]
+        return False
+
+    def get_fingerprint(self) -> str:
+        """
+        Returns the content hash of experiment_data, see ``fingerprint_tree``. It is computed once per generation.
+
+        :return: hexadecimal hash
+        :rtype: str
+        """
+        return self.fingerprint_tree(self.experiment_data, self._get_fingerprints()).hex()
+
+    def _get_fingerprints(self) -> Dict[int, Tuple[Any, bytes]]:
+        """
+        Returns the fingerprints of the subtrees of experiment_data, computed once until experiment_data_changed is
+        called.
+        """
+        if self._fingerprints is None:
+            self._fingerprints = {}
+            self.fingerprint_tree(self.experiment_data, self._fingerprints)
+        return self._fingerprints
+
+    def _get_last_fingerprints(self) -> Dict[int, Tuple[Any, bytes]]:
+        """
+        Returns the fingerprints of the subtrees of last_experiment_data, computed once until it is assigned again.
+        """
+        if self._last_fingerprints is None:
+            self._last_fingerprints = {}
+            self.fingerprint_tree(self.last_experiment_data, self._last_fingerprints)
+        return self._last_fingerprints
+
+    def _get_last_fingerprint(self) -> bytes:
+        """
+        Returns the content hash of last_experiment_data, read from the header of the file it was loaded from if
+        possible, see load_last_run.
+        """
+        if self._last_fingerprint is None:
+            self._last_fingerprint = self.fingerprint_tree(self.last_experiment_data, self._get_last_fingerprints())
+        return self._last_fingerprint
+
+    def get_last_run_fingerprint(self) -> Union[str, None]:
+        """
+        Returns the fingerprint stored in the header of the snapshot or the experiment_data.yml of the last run,
+        without loading them.
+
+        :return: hexadecimal hash, None if the file does not exist or it has no fingerprint
+        :rtype: str
+        """
+        if self._snapshot_is_current():
+            return self._get_snapshot_fingerprint()
+        return self._get_yaml_fingerprint()
+
+    def _get_yaml_fingerprint(self) -> Union[str, None]:
+        """
+        Returns the fingerprint stored in the header of the experiment_data.yml, or None if it has none
+        """
+        try:
+            with open(self.metadata_folder.joinpath("experiment_data.yml"), 'r') as stream:
+                header = stream.readline()
+        except (OSError, UnicodeDecodeError):
+            return None
+        if header.startswith(FINGERPRINT_HEADER):
+            return header[len(FINGERPRINT_HEADER):].strip()
+        return None
+
+    def changed_since_last_run(self) -> bool:
+        """
+        Returns if experiment_data differs from the data saved by the last run, comparing their fingerprints.
+
+        :return: True if the data has changed or the last run has no fingerprint, False otherwise
+        :rtype: bool
+        """
+        return self.get_last_run_fingerprint() != self.get_fingerprint()
+
+    @staticmethod
+    def fingerprint_tree(data: Any, memo: Dict[int, Tuple[Any, bytes]] = None) -> bytes:
+        """
+        Content hash (Merkle tree) of configuration data.
+
+        The hash of a dict combines the hashes of its keys and values regardless of their order, the hash of a list
+        the hashes of its values in order, and the hash of any other value its type and repr. Equal hashes mean
+        equal data, so the hash of the whole experiment data tells if it has changed and the hashes of its
+        sections which ones.
+
+        The hashes kept in ``memo`` are reused as they are, so the data must not be modified in place while the
+        memo is in use.
+
+        :param data: data to hash.
+        :param memo: (dict or list, hash) of the dicts and lists already hashed, by id.
+        :return: hash
+        :rtype: bytes
+        """
+        if isinstance(data, (collections.abc.Mapping, list)):
+            if memo is None:
+                memo = {}
+            cached = memo.get(id(data), None)
+            if cached is not None and cached[0] is data:
+                return cached[1]
+            if isinstance(data, list):
+                fingerprint = hashlib.blake2b(b"list", digest_size=16)
+                for value in data:
+                    fingerprint.update(AutosubmitConfig.fingerprint_tree(value, memo))
+            else:
+                fingerprint = hashlib.blake2b(b"map", digest_size=16)
+                for key_value in sorted(AutosubmitConfig.fingerprint_tree(key, memo) +
+                                        AutosubmitConfig.fingerprint_tree(value, memo)
+                                        for key, value in data.items()):
+                    fingerprint.update(key_value)
+            memo[id(data)] = (data, fingerprint.digest())
+            return memo[id(data)][1]
+        return hashlib.blake2b(f"{type(data).__name__}:{data!r}".encode(), digest_size=16).digest()
+
     def deep_add_missing_starter_conf(self, experiment_data, starter_conf):
         """
         Add the missing keys from starter_conf to experiment_data
@@ -2012,10 +3060,44 @@ class AutosubmitConfig(object):
         for key in starter_conf.keys():
             if key not in experiment_data.keys():
                 experiment_data[key] = starter_conf[key]
+                if self._provenance is not None:
+                    self._track_provenance(experiment_data, starter_conf, [key])
             elif isinstance(starter_conf[key], collections.abc.Mapping):
                 experiment_data[key] = self.deep_add_missing_starter_conf(experiment_data[key], starter_conf[key])
         return experiment_data
 
+    @staticmethod
+    def copy_tree(data: Any, memo: Dict[int, Any] = None) -> Any:
+        """
+        Deep copy of configuration data, faster than ``copy.deepcopy`` for nested dicts and lists.
+
+        Dicts and lists are copied keeping the references that are shared inside ``data``, as ``copy.deepcopy``
+        does, since the merges share the lists between sections. Scalars are immutable and not copied, any other
+        object is copied with ``copy.deepcopy``.
+
+        :param data: data to copy.
+        :param memo: copies of the dicts and lists already copied, by id.
+        :return: copy of data
+        """
+        if type(data) in ATOMIC_TYPES:
+            return data
+        if memo is None:
+            memo = {}
+        copied = memo.get(id(data), None)
+        if copied is not None:
+            return copied
+        if type(data) is dict:
+            copied = memo[id(data)] = {}
+            for key, value in data.items():
+                copied[key] = value if type(value) in ATOMIC_TYPES else AutosubmitConfig.copy_tree(value, memo)
+        elif type(data) is list:
+            copied = memo[id(data)] = []
+            for value in data:
+                copied.append(value if type(value) in ATOMIC_TYPES else AutosubmitConfig.copy_tree(value, memo))
+        else:
+            copied = copy.deepcopy(data, memo)
+        return copied
+
     @staticmethod
     def deep_parameters_export(data, default_parameters):
         """
@@ -2037,13 +3119,41 @@ class AutosubmitConfig(object):
 
         return parameters_dict
 
+    def get_flat_parameters(self) -> Mapping[str, Any]:
+        """
+        Returns the flat index of the experiment data, with the same format as ``deep_parameters_export``.
+
+        The index is kept until the experiment data changes, so the values modified in place below the top level
+        sections must be notified through ``experiment_data_changed``. The top level sections replaced or added
+        since the last call are detected by identity, and only they are flattened again. The index is shared, so
+        a read-only view is returned, use ``load_parameters`` to get a copy that can be modified.
+
+        :return: a read-only mapping containing the parameters of the experiment
+        :rtype: Mapping
+        """
+        data = self._experiment_data
+        sections = self._flat_sections
+        if self._flat_index is None or len(sections) != len(data) or not all(
+                key in sections and sections[key][0] is value for key, value in data.items()):
+            flat_sections = dict()
+            flat_index = dict()
+            for key, value in data.items():
+                section = sections.get(key)
+                if section is None or section[0] is not value:
+                    section = (value, self.deep_parameters_export({key: value}, self.default_parameters))
+                flat_sections[key] = section
+                flat_index.update(section[1])
+            self._flat_sections = flat_sections
+            self._flat_index = flat_index
+        return types.MappingProxyType(self._flat_index)
+
     def load_parameters(self):
         """
         Load all experiment data
         :return: a dictionary containing tuples [parameter_name, parameter_value]
         :rtype: dict
         """
-        return self.deep_parameters_export(self.experiment_data, self.default_parameters)
+        return self.get_flat_parameters().copy()
 
     def load_platform_parameters(self):
         """
@@ -2111,6 +3221,7 @@ class AutosubmitConfig(object):
             content = content.replace(
                 re.search('EXPID:.*', content).group(0), "EXPID: " + exp_id)
         open(self._conf_parser_file, 'w').write(content)
+        self.experiment_data_changed()
 
     def get_project_type(self):
         """
@@ -2219,7 +3330,7 @@ class AutosubmitConfig(object):
         :return: fetch_single_branch(Y/N)
         :rtype: str
         """
-        return str(self.get_section(['GIT', 'FETCH_SINGLE_BRANCH'], "true")).lower()
+        return self.get_section_as(['GIT', 'FETCH_SINGLE_BRANCH'], to_lower_str, "true")
 
     def get_project_destination(self):
         """
@@ -2283,6 +3394,7 @@ class AutosubmitConfig(object):
         open(self._exp_parser_file, 'wb').write(content)
         Log.debug(
             "Project commit SHA succesfully registered to the configuration file.")
+        self.experiment_data_changed()
         return True
 
     def get_svn_project_url(self):
@@ -2319,36 +3431,94 @@ class AutosubmitConfig(object):
         :return: experiment's startdates
         :rtype: list
         """
-        date_list = list()
-        date_value = str(self.get_section(['EXPERIMENT', 'DATELIST'], "20220401"))
-        # Allows to use the old format for define a list.
-        if type(date_value) is not list:
+        return self.get_date_sequence().to_list()
+
+    def get_date_sequence(self):
+        """
+        Returns startdates from experiment's config file as a lazy sequence, see ExpandedList
+
+        :return: experiment's startdates
+        :rtype: ExpandedList
+        """
+        date_value = str(self._get_experiment_value('DATELIST', "20220401"))
+        cache_key = ("DATELIST", date_value)
+        if cache_key not in self._expanded_lists:
+            # Allows to use the old format for define a list.
             if not date_value.startswith("["):
                 string = '[{0}]'.format(date_value)
             else:
                 string = date_value
-            split_string = nestedExpr('[', ']').parseString(string).asList()
-            string_date = None
-            for split in split_string[0]:
-                if type(split) is list:
-                    for split_in in split:
-                        if split_in.find("-") != -1:
-                            numbers = split_in.split("-")
-                            for count in range(int(numbers[0]), int(numbers[1]) + 1):
-                                date_list.append(parse_date(string_date + str(count).zfill(len(numbers[0]))))
-                        else:
-                            date_list.append(parse_date(string_date + split_in))
-                    string_date = None
-                else:
-                    if string_date is not None and len(str(string_date)) > 0:
-                        date_list.append(parse_date(string_date))
-                    string_date = split
-            if string_date is not None and len(str(string_date)) > 0:
-                date_list.append(parse_date(string_date))
-        else:
-            for str_date in date_value:
-                date_list.append(parse_date(str_date))
-        return date_list
+            self._expanded_lists[cache_key] = ExpandedList.from_tokens(self.parse_bracket_list(string)[0],
+                                                                       self.parse_date_string)
+        return self._expanded_lists[cache_key]
+
+    def _get_experiment_value(self, param: str, d_value: Any) -> Any:
+        """
+        Returns ``get_section(['EXPERIMENT', param], d_value)`` reading the current value from experiment_data, so
+        the caches keyed on it (DATELIST and MEMBERS) see the changes made in place.
+        """
+        value = self._experiment_data.get("EXPERIMENT", "")
+        if value and type(value) is dict:
+            value = value.get(param, d_value)
+        if value is None or (not isinstance(value, numbers.Number) and len(value) == 0):
+            return d_value
+        return value
+
+    @staticmethod
+    def parse_bracket_list(string):
+        """
+        Parses the bracket syntax of DATELIST and MEMBERS, such as ``[1950[0101-1231] 2000]``.
+
+        The result is the same as ``nestedExpr('[', ']').parseString(string).asList()``: the tokens are separated by
+        whitespace or brackets and the text after the first list is ignored. The string is read in a single pass,
+        the unusual cases (quoted tokens or unbalanced brackets) are left to pyparsing.
+
+        :param string: string to parse
+        :type string: str
+        :return: nested lists of tokens
+        :rtype: list
+        """
+        index = 0
+        length = len(string)
+        while index < length and string[index] in BRACKET_LIST_WHITESPACE:
+            index += 1
+        if index == length or string[index] != "[" or "'" in string or '"' in string:
+            return nestedExpr('[', ']').parseString(string).asList()
+        stack = [[]]
+        while index < length:
+            char = string[index]
+            if char == "[":
+                stack.append([])
+                index += 1
+            elif char == "]":
+                closed = stack.pop()
+                stack[-1].append(closed)
+                if len(stack) == 1:
+                    return stack[0]
+                index += 1
+            elif char in BRACKET_LIST_WHITESPACE:
+                index += 1
+            else:
+                start = index
+                while index < length and string[index] not in BRACKET_LIST_WHITESPACE and string[index] not in "[]":
+                    index += 1
+                stack[-1].append(string[start:index])
+        return nestedExpr('[', ']').parseString(string).asList()
+
+    @staticmethod
+    def parse_date_string(string_date):
+        """
+        Parses a date as ``bscearth.utils.date.parse_date`` does, without strptime for the dates made of digits.
+
+        :param string_date: date to parse
+        :type string_date: str
+        :rtype: datetime
+        """
+        if len(string_date) in (8, 10, 12, 14) and string_date.isascii() and string_date.isdigit():
+            with suppress(ValueError):
+                return datetime(int(string_date[:4]), int(string_date[4:6]), int(string_date[6:8]),
+                                int(string_date[8:10] or 0), int(string_date[10:12] or 0), int(string_date[12:14] or 0))
+        return parse_date(string_date)
 
     def get_num_chunks(self):
         """
@@ -2357,7 +3527,7 @@ class AutosubmitConfig(object):
         :return: number of chunks
         :rtype: int
         """
-        return int(self.get_section(['EXPERIMENT', 'NUMCHUNKS']))
+        return self.get_section_as(['EXPERIMENT', 'NUMCHUNKS'], int)
 
     def get_chunk_ini(self, default=1):
         """
@@ -2382,6 +3552,31 @@ class AutosubmitConfig(object):
         """
         return self.get_section(['EXPERIMENT', 'CHUNKSIZEUNIT'])
 
+    def get_calendar(self):
+        """
+        Calendar of the experiment
+
+        :return: calendar, standard or noleap
+        :rtype: str
+        """
+        return self.get_section_as(['EXPERIMENT', 'CALENDAR'], to_lower_str, "standard")
+
+    def get_chunk_calendar(self):
+        """
+        Start and end dates of all the chunks of the experiment, computed at once and kept while the values it
+        is computed from do not change.
+
+        :return: dates of the chunks of every start date
+        :rtype: ChunkCalendar
+        """
+        dates = self.get_date_sequence()
+        parameters = (self.get_num_chunks(), self.get_chunk_size(), to_lower_str(self.get_chunk_size_unit()),
+                      self.get_calendar())
+        cached = self._chunk_calendar
+        if cached is None or cached[0] is not dates or cached[1] != parameters:
+            cached = self._chunk_calendar = (dates, parameters, ChunkCalendar(dates, *parameters))
+        return cached[2]
+
     def get_chunk_size(self, default=1):
         """
         Chunk Size as defined in the expdef file.
@@ -2402,33 +3597,24 @@ class AutosubmitConfig(object):
         :return: experiment's members
         :rtype: list
         """
-        member_list = list()
-        string = str(self.get_section(['EXPERIMENT', 'MEMBERS'], "") if run_only is False else self.get_section(
-            ['EXPERIMENT', 'RUN_ONLY_MEMBERS'], ""))
+        return self.get_member_sequence(run_only).to_list()
+
+    def get_member_sequence(self, run_only=False):
+        """
+        Returns members from experiment's config file as a lazy sequence, see ExpandedList
+
+        :return: experiment's members
+        :rtype: ExpandedList
+        """
+        string = str(self._get_experiment_value('MEMBERS' if run_only is False else 'RUN_ONLY_MEMBERS', ""))
         if not string:
-            return member_list
+            return ExpandedList([])
         elif not string.startswith("["):
             string = '[{0}]'.format(string)
-        split_string = nestedExpr('[', ']').parseString(string).asList()
-        string_member = None
-        for split in split_string[0]:
-            if type(split) is list:
-                for split_in in split:
-                    if split_in.find("-") != -1:
-                        numbers = split_in.split("-")
-                        for count in range(int(numbers[0]), int(numbers[1]) + 1):
-                            member_list.append(
-                                string_member + str(count).zfill(len(numbers[0])))
-                    else:
-                        member_list.append(string_member + split_in)
-                string_member = None
-            else:
-                if string_member is not None and len(str(string_member)) > 0:
-                    member_list.append(string_member)
-                string_member = split
-        if string_member is not None and len(str(string_member)) > 0:
-            member_list.append(string_member)
-        return member_list
+        cache_key = ("MEMBERS", string)
+        if cache_key not in self._expanded_lists:
+            self._expanded_lists[cache_key] = ExpandedList.from_tokens(self.parse_bracket_list(string)[0])
+        return self._expanded_lists[cache_key]
 
     def get_dependencies(self, section="None"):
         """
@@ -2450,7 +3636,7 @@ class AutosubmitConfig(object):
         :rtype: bool
         """
 
-        return str(self.get_section(['RERUN', 'RERUN'])).lower()
+        return self.get_section_as(['RERUN', 'RERUN'], to_lower_str)
 
     def get_platform(self) -> str:
         """
@@ -2482,6 +3668,7 @@ class AutosubmitConfig(object):
             content = content.replace(
                 re.search('HPCARCH:.*', content).group(0), "HPCARCH: " + hpc)
         open(self._exp_parser_file, 'w').write(content)
+        self.experiment_data_changed()
 
     def set_last_as_command(self, command):
         """
@@ -2505,6 +3692,7 @@ class AutosubmitConfig(object):
             content = "AS_MISC: True\nAS_COMMAND: {0}\n".format(command)
         open(misc, 'w').write(content)
         os.chmod(misc, 0o755)
+        self.experiment_data_changed()
 
     def set_version(self, autosubmit_version):
         """
@@ -2523,6 +3711,7 @@ class AutosubmitConfig(object):
             content = "CONFIG:\n  AUTOSUBMIT_VERSION: " + autosubmit_version + "\n"
         open(version_file, 'w').write(content)
         os.chmod(version_file, 0o755)
+        self.experiment_data_changed()
 
     def get_version(self):
         """
@@ -2531,7 +3720,7 @@ class AutosubmitConfig(object):
         :return: version
         :rtype: str
         """
-        return str(self.get_section(['CONFIG', 'AUTOSUBMIT_VERSION'], ""))
+        return self.get_section_as(['CONFIG', 'AUTOSUBMIT_VERSION'], str, "")
 
     def get_total_jobs(self):
         """
@@ -2540,7 +3729,7 @@ class AutosubmitConfig(object):
         :return: max number of running jobs
         :rtype: int
         """
-        return int(self.get_section(['CONFIG', 'TOTALJOBS'], -1))
+        return self.get_section_as(['CONFIG', 'TOTALJOBS'], int, -1)
 
     def get_output_type(self):
         """
@@ -2585,7 +3774,7 @@ class AutosubmitConfig(object):
         :return: main platforms
         :rtype: int
         """
-        return int(self.get_section(['CONFIG', 'MAXWAITINGJOBS'], -1))
+        return self.get_section_as(['CONFIG', 'MAXWAITINGJOBS'], int, -1)
 
     def get_default_job_type(self):
         """
@@ -2603,7 +3792,7 @@ class AutosubmitConfig(object):
         :return: safety sleep time
         :rtype: int
         """
-        return int(self.get_section(['CONFIG', 'SAFETYSLEEPTIME'], 10))
+        return self.get_section_as(['CONFIG', 'SAFETYSLEEPTIME'], int, 10)
 
     def set_safetysleeptime(self, sleep_time):
         """
@@ -2615,6 +3804,7 @@ class AutosubmitConfig(object):
         content = open(self._conf_parser_file).read()
         content = content.replace(re.search('SAFETYSLEEPTIME:.*', content).group(0), "SAFETYSLEEPTIME: %d" % sleep_time)
         open(self._conf_parser_file, 'w').write(content)
+        self.experiment_data_changed()
 
     def get_retrials(self):
         """
@@ -2641,7 +3831,7 @@ class AutosubmitConfig(object):
         :return: if notifications
         :rtype: string
         """
-        return str(self.get_section(['MAIL', 'NOTIFICATIONS'], "false")).lower()
+        return self.get_section_as(['MAIL', 'NOTIFICATIONS'], to_lower_str, "false")
 
     # based on https://github.com/cbirajdar/properties-to-yaml-converter/blob/master/properties_to_yaml.py
     @staticmethod
@@ -2799,7 +3989,7 @@ class AutosubmitConfig(object):
         :return: expression (or none)
         :rtype: string
         """
-        return str(self.get_section(['CONFIG', 'X11_JOBS'], "false")).lower()
+        return self.get_section_as(['CONFIG', 'X11_JOBS'], to_lower_str, "false")
 
     def get_wrapper_queue(self, wrapper={}):
         """
@@ -2854,7 +4044,7 @@ class AutosubmitConfig(object):
          :return: maximum number of jobs (or total jobs)
          :rtype: int
          """
-        return int(self.get_section('MAX_WRAPPED_H', -1))
+        return self.get_section_as('MAX_WRAPPED_H', int, -1)
 
     def get_min_wrapped_jobs_vertical(self, wrapper={}):
         """
@@ -2863,7 +4053,7 @@ class AutosubmitConfig(object):
          :return: maximum number of jobs (or total jobs)
          :rtype: int
          """
-        return int(self.get_section('MIN_WRAPPED_V', 1))
+        return self.get_section_as('MIN_WRAPPED_V', int, 1)
 
     def get_min_wrapped_jobs_horizontal(self, wrapper={}):
         """
@@ -2920,7 +4110,7 @@ class AutosubmitConfig(object):
         :return: if logs local copy
         :rtype: str
         """
-        return str(self.get_section(['STORAGE', 'COPY_REMOTE_LOGS'], "true")).lower()
+        return self.get_section_as(['STORAGE', 'COPY_REMOTE_LOGS'], to_lower_str, "true")
 
     def get_mails_to(self):
         """
@@ -2996,7 +4186,7 @@ class AutosubmitConfig(object):
         # get githook files from proj_dir
         githook_files = [os.path.join(os.path.join(os.path.join(proj_dir, project_name), ".githooks"), f) for f in
                          os.listdir(os.path.join(os.path.join(proj_dir, project_name), ".githooks"))]
-        parameters = self.load_parameters()
+        parameters = self.get_flat_parameters()
 
         # find all '%(?<!%%)\w+%(?!%%)' in githook files
         for githook_file in githook_files:
@@ -3014,17 +4204,27 @@ class AutosubmitConfig(object):
         pass
 
     @staticmethod
-    def get_parser(parser_factory, file_path):
+    def get_parser(parser_factory, file_path, parse_cache=None, parsed_files=None):
         """
         Gets parser for given file
 
         :param parser_factory:
         :param file_path: path to file to be parsed
         :type file_path: Path
+        :param parse_cache: cache of parsed files, if any
+        :type parse_cache: YAMLParseCache
+        :param parsed_files: documents already parsed by prefetch_yaml_files, if any
+        :type parsed_files: dict
         :return: parser
         :rtype: YAMLParser
         """
         parser = parser_factory.create_parser()
+        if parsed_files and str(file_path) in parsed_files:
+            parsed_data = parsed_files[str(file_path)]
+            if isinstance(parsed_data, Exception):
+                raise parsed_data
+            parser.data = parsed_data if parsed_data is not None else {}
+            return parser
         # For testing purposes
         if file_path == Path('/dummy/local/root/dir/a000/conf/') or file_path == Path('dummy/file/path'):
             parser.data = parser.load(file_path)
@@ -3036,7 +4236,10 @@ class AutosubmitConfig(object):
 
         if file_path.match("*proj*"):
             if file_path.exists():
-                parser.data = parser.load(file_path)
+                if parse_cache is not None and file_path.is_file():
+                    parser.data = parse_cache.load(parser, file_path)
+                else:
+                    parser.data = parser.load(file_path)
                 if parser.data is None:
                     parser.data = {}
             else:
@@ -3046,10 +4249,13 @@ class AutosubmitConfig(object):
         else:
             # This block may rise an exception but all its callers handle it
             try:
-                with open(file_path) as f:
-                    parser.data = parser.load(f)
-                    if parser.data is None:
-                        parser.data = {}
+                if parse_cache is not None:
+                    parser.data = parse_cache.load(parser, file_path)
+                else:
+                    with open(file_path) as f:
+                        parser.data = parser.load(f)
+                if parser.data is None:
+                    parser.data = {}
             except IOError:
                 parser.data = {}
                 return parser
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager, suppress
+from datetime import date, datetime
+from typing import Any, Dict, Optional
+
+from log.log import Log
+
+# Each message is its length followed by the request or response encoded as JSON
+FRAME_HEADER = struct.Struct("!Q")
+MAX_FRAME_SIZE = 1024 * 1024 * 1024
+# Key of the JSON objects holding a value that JSON can't represent: a tuple, a date, or a dict whose keys are not
+# all strings
+TYPE_KEY = "__autosubmit_type__"
+# Environment variables of the client that change the loaded configuration, besides the AS_ENV ones
+ENVIRONMENT_VARIABLES = ("USER", "SUDO_USER", "AUTOSUBMIT_CONFIGURATION")
+
+
+def default_socket_path() -> str:
+    """
+    Returns the socket of the daemon of the current user, in a folder only accessible by the user, see
+    ``check_socket_folder``.
+    """
+    folder = os.environ.get("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"autosubmit-{os.getuid()}")
+    return os.path.join(folder, "autosubmit-config.sock")
+
+
+def check_socket_folder(folder: str) -> None:
+    """
+    Checks that the folder of the socket is a real folder owned by the current user and only accessible by them,
+    so no other user can replace the socket.
+
+    :raises PermissionError: if the folder can't be trusted.
+    """
+    info = os.lstat(folder)
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"The folder of the config daemon socket {folder} is not a folder")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"The folder of the config daemon socket {folder} belongs to another user")
+    if info.st_mode & 0o077:
+        raise PermissionError(f"The folder of the config daemon socket {folder} is accessible by other users")
+
+
+def peer_uid(sock: socket.socket) -> Optional[int]:
+    """
+    Returns the user of the process at the other end of a Unix socket, None if the platform does not tell it.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid
+
+
+def get_environment() -> Dict[str, str]:
+    """
+    Returns the environment variables of this process that change the loaded configuration: the AS_ENV ones, the
+    user (see ``AutosubmitConfig.load_as_env_variables``) and the autosubmitrc file (see ``BasicConfig.read``).
+    """
+    return {key: value for key, value in os.environ.items()
+            if key.startswith("AS_ENV") or key in ENVIRONMENT_VARIABLES}
+
+
+def _to_json(value: Any) -> Any:
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        if TYPE_KEY not in value and all(isinstance(key, str) for key in value):
+            return {key: _to_json(item) for key, item in value.items()}
+        return {TYPE_KEY: "dict", "items": [[_to_json(key), _to_json(item)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, tuple):
+        return {TYPE_KEY: "tuple", "items": [_to_json(item) for item in value]}
+    if isinstance(value, datetime):
+        return {TYPE_KEY: "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {TYPE_KEY: "date", "value": value.isoformat()}
+    raise TypeError(f"Values of type {type(value).__name__} can't be sent by the config daemon")
+
+
+def _from_json(value: Dict[str, Any]) -> Any:
+    value_type = value.get(TYPE_KEY, None)
+    if value_type is None:
+        return value
+    if value_type == "dict":
+        return {key: item for key, item in value["items"]}
+    if value_type == "tuple":
+        return tuple(value["items"])
+    if value_type == "datetime":
+        return datetime.fromisoformat(value["value"])
+    if value_type == "date":
+        return date.fromisoformat(value["value"])
+    raise ValueError(f"Unknown type {value_type} in a config daemon message")
+
+
+def encode_message(message: Any) -> bytes:
+    return json.dumps(_to_json(message), separators=(",", ":")).encode()
+
+
+def send_frame(sock: socket.socket, content: bytes) -> None:
+    sock.sendall(FRAME_HEADER.pack(len(content)) + content)
+
+
+def send_message(sock: socket.socket, message: Any) -> None:
+    send_frame(sock, encode_message(message))
+
+
+def _receive_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Connection closed by the peer")
+        received += count
+    return bytes(buffer)
+
+
+def receive_message(sock: socket.socket) -> Any:
+    """
+    Receives a message, the content is only decoded as JSON so a message can't run any code.
+
+    :raises ValueError: if the message is not valid.
+    """
+    size, = FRAME_HEADER.unpack(_receive_exactly(sock, FRAME_HEADER.size))
+    if size > MAX_FRAME_SIZE:
+        raise ConnectionError(f"Message of {size} bytes exceeds the limit of {MAX_FRAME_SIZE}")
+    return json.loads(_receive_exactly(sock, size), object_hook=_from_json)
+
+
+@contextmanager
+def _applied_environment(environment: Dict[str, str]):
+    """
+    Replaces the environment variables that change the loaded configuration by the ones of a client, see
+    ``get_environment``, and restores them afterwards.
+    """
+    previous = get_environment()
+    for key in previous:
+        del os.environ[key]
+    os.environ.update({key: value for key, value in environment.items()
+                       if key.startswith("AS_ENV") or key in ENVIRONMENT_VARIABLES})
+    try:
+        yield
+    finally:
+        for key in get_environment():
+            del os.environ[key]
+        os.environ.update(previous)
+
+
+class ConfigDaemonClient:
+    """
+    Client of a ``ConfigDaemon``.
+
+    :param socket_path: socket of the daemon, ``default_socket_path()`` by default.
+    :param timeout: seconds to wait for the daemon, loading an experiment not cached can take a while.
+    :raises OSError: if the daemon is not running.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, timeout: float = 300):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+
+    def request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sends a request to the daemon and returns its response.
+
+        :raises PermissionError: if the socket or the daemon are not of the current user.
+        :raises RuntimeError: if the daemon failed to answer the request.
+        """
+        check_socket_folder(os.path.dirname(os.path.abspath(self.socket_path)))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            uid = peer_uid(sock)
+            if uid is not None and uid != os.getuid():
+                raise PermissionError(f"The config daemon listening on {self.socket_path} is run by another user")
+            send_message(sock, request)
+            response = receive_message(sock)
+        if not response.get("ok", False):
+            raise RuntimeError(f"Config daemon error: {response.get('error', 'unknown')}")
+        return response
+
+    def ping(self) -> bool:
+        """
+        Returns True if the daemon is running.
+        """
+        try:
+            return self.request({"op": "ping"})["ok"]
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+    def get(self, expid: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Returns the resolved configuration of an experiment, loaded with the environment of this process (see
+        ``get_environment``): ``experiment_data``, the ``loaded_files`` with their modification time, the
+        ``starter_conf``, the ``misc_files`` and ``misc_data``, the ``key_provenance`` with its
+        ``provenance_sources`` and the ``generation`` of the data in the daemon.
+
+        :param expid: experiment identifier.
+        :param force: reload all the files of the experiment.
+        """
+        return self.request({"op": "get", "expid": expid, "force": force, "environment": get_environment()})
+
+    def stop(self) -> None:
+        self.request({"op": "stop"})
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self) -> None:
+        daemon = self.server.daemon
+        if not daemon.is_authorized(self.request):
+            return
+        try:
+            request = receive_message(self.request)
+        except (OSError, ValueError) as exc:
+            Log.debug(f"Config daemon: invalid request: {exc}")
+            return
+        try:
+            content = daemon.handle(request)
+        except Exception as exc:
+            content = encode_message({"ok": False, "error": f"{type(exc).__name__}: {exc}"})
+        with suppress(OSError):
+            send_frame(self.request, content)
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class ConfigDaemon:
+    """
+    Keeps the resolved configuration of the recently used experiments and serves it over a Unix socket.
+
+    Each request checks if the files of the experiment changed, as ``AutosubmitConfig.needs_reload``, and
+    reloads them before answering, so the clients get the same data that loading the experiment in-process.
+    The experiments are loaded with the environment of the client, and kept apart for each environment. The
+    socket is created in a folder only accessible by the user, and the connections of other users are rejected.
+
+    :param socket_path: socket to listen on, ``default_socket_path()`` by default.
+    :param max_experiments: number of experiments kept, the least recently used ones are dropped.
+    :param idle_timeout: seconds without requests after which ``serve`` returns, None to serve until stopped.
+    """
+
+    def __init__(self, socket_path: Optional[str] = None, max_experiments: int = 32,
+                 idle_timeout: Optional[float] = None):
+        self.socket_path = socket_path or default_socket_path()
+        self.max_experiments = max_experiments
+        self.idle_timeout = idle_timeout
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self._configs = OrderedDict()
+        self._config_locks = dict()
+        self._lock = threading.Lock()
+        # The environment of the process is shared by the threads, the experiments are loaded one at a time
+        self._environment_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._server = None
+
+    def bind(self) -> None:
+        """
+        Creates the socket, replacing the one of a daemon that is not running anymore.
+
+        :raises OSError: if another daemon is listening on the socket.
+        :raises PermissionError: if the folder of the socket can be accessed by other users, see
+            ``check_socket_folder``.
+        """
+        folder = os.path.dirname(os.path.abspath(self.socket_path))
+        with suppress(FileExistsError):
+            os.makedirs(folder, mode=0o700)
+        check_socket_folder(folder)
+        if os.path.exists(self.socket_path):
+            if ConfigDaemonClient(self.socket_path, timeout=5).ping():
+                raise OSError(f"A config daemon is already listening on {self.socket_path}")
+            os.unlink(self.socket_path)
+        self._server = _Server(self.socket_path, _RequestHandler)
+        self._server.daemon = self
+        os.chmod(self.socket_path, 0o600)
+
+    def is_authorized(self, sock: socket.socket) -> bool:
+        """
+        Returns True if the peer is the same user, when the platform allows checking it.
+        """
+        uid = peer_uid(sock)
+        return uid is None or uid == os.getuid()
+
+    def _get_config(self, expid: str, force: bool, environment: Dict[str, str]) -> bytes:
+        # Imported here as configcommon uses the client of this module
+        from .configcommon import AutosubmitConfig
+        key = (expid, tuple(sorted(environment.items())))
+        with self._lock:
+            lock = self._config_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                as_conf = self._configs.get(key)
+            if as_conf is None or force or as_conf.needs_reload():
+                self.misses += 1
+                with self._environment_lock, _applied_environment(environment):
+                    if as_conf is None:
+                        as_conf = AutosubmitConfig(expid)
+                        force = True
+                    else:
+                        as_conf.basic_config.read()
+                    as_conf.reload(force_load=force)
+            else:
+                self.hits += 1
+            with self._lock:
+                self._configs[key] = as_conf
+                self._configs.move_to_end(key)
+                while len(self._configs) > self.max_experiments:
+                    self._configs.popitem(last=False)
+            # Encoded while holding the lock, so another request can't reload the data meanwhile
+            return encode_message({
+                "ok": True,
+                "experiment_data": as_conf.experiment_data,
+                "loaded_files": {str(file): mtime for file, mtime in as_conf.current_loaded_files.items()},
+                "starter_conf": as_conf.starter_conf,
+                "misc_files": [str(file) for file in as_conf.misc_files],
+                "misc_data": as_conf.misc_data,
+                "key_provenance": as_conf._key_provenance,
+                "provenance_sources": as_conf._provenance_sources,
+                "generation": as_conf.generation,
+            })
+
+    def handle(self, request: Dict[str, Any]) -> bytes:
+        """
+        Answers a request: ``ping``, ``get`` an experiment or ``stop`` the daemon.
+
+        :return: the encoded response.
+        """
+        self.requests += 1
+        operation = request.get("op")
+        if operation == "ping":
+            return encode_message({"ok": True, "pid": os.getpid()})
+        if operation == "get":
+            return self._get_config(request["expid"], request.get("force", False), request.get("environment", {}))
+        if operation == "stop":
+            self._stopped.set()
+            return encode_message({"ok": True})
+        raise ValueError(f"Unknown operation {operation}")
+
+    def serve(self) -> None:
+        """
+        Serves the requests until the daemon is stopped or idle for ``idle_timeout`` seconds.
+        """
+        if self._server is None:
+            self.bind()
+        self._server.timeout = 0.5
+        last_request = time.monotonic()
+        try:
+            while not self._stopped.is_set():
+                requests = self.requests
+                self._server.handle_request()
+                if self.requests != requests:
+                    last_request = time.monotonic()
+                elif self.idle_timeout is not None and time.monotonic() - last_request > self.idle_timeout:
+                    break
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            with suppress(OSError):
+                os.unlink(self.socket_path)
+
+
+def start_daemon(socket_path: Optional[str] = None, idle_timeout: float = 3600, wait: float = 10) -> bool:
+    """
+    Starts a daemon in the background, unless one is already running.
+
+    :param socket_path: socket of the daemon, ``default_socket_path()`` by default.
+    :param idle_timeout: seconds without requests after which the daemon exits.
+    :param wait: seconds to wait for the daemon to be ready.
+    :return: True if the daemon is running.
+    :rtype: bool
+    """
+    socket_path = socket_path or default_socket_path()
+    client = ConfigDaemonClient(socket_path, timeout=wait)
+    if client.ping():
+        return True
+    subprocess.Popen([sys.executable, "-m", __name__, "--socket", socket_path, "--idle-timeout", str(idle_timeout)],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True, close_fds=True)
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if client.ping():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main(args=None) -> None:
+    parser = argparse.ArgumentParser(description="Serves the configuration of the Autosubmit experiments")
+    parser.add_argument("--socket", default=None, help="socket to listen on")
+    parser.add_argument("--max-experiments", type=int, default=32, help="number of experiments kept")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="seconds without requests to exit")
+    args = parser.parse_args(args)
+    ConfigDaemon(args.socket, args.max_experiments, args.idle_timeout).serve()
+
+
+if __name__ == "__main__":
+    main()
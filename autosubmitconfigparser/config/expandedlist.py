@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+from bisect import bisect_right
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+# Formats of the dates accepted by bscearth's parse_date, by length of the string
+DATE_FORMATS = {
+    4: "{0.year:04d}",
+    6: "{0.year:04d}{0.month:02d}",
+    8: "{0.year:04d}{0.month:02d}{0.day:02d}",
+    10: "{0.year:04d}{0.month:02d}{0.day:02d}{0.hour:02d}",
+    12: "{0.year:04d}{0.month:02d}{0.day:02d}{0.hour:02d}{0.minute:02d}",
+    14: "{0.year:04d}{0.month:02d}{0.day:02d}{0.hour:02d}{0.minute:02d}{0.second:02d}",
+}
+
+
+class ExpandedList(Sequence):
+    """
+    Read-only sequence with the values of a DATELIST or MEMBERS expression, such as ``fc[000-999]``.
+
+    The values are stored as segments: a single value, or a prefix followed by a range of zero-padded numbers.
+    They are only built when they are accessed, so ``len``, indexing, slicing and membership do not depend on
+    the number of values but on the number of segments. If a ``converter`` is given (dates), it is applied to
+    each value when it is accessed, invalid values raise the error at that point.
+
+    :param segments: tuples (value, None, None) or (prefix, numbers, width), where numbers is a ``range``.
+    :type segments: list
+    :param converter: function applied to the values built from a range.
+    :type converter: Callable
+    """
+
+    def __init__(self, segments: List[Tuple[Any, Optional[range], Optional[int]]],
+                 converter: Optional[Callable[[str], Any]] = None):
+        self._segments = tuple(segment for segment in segments if segment[1] is None or len(segment[1]) > 0)
+        self._converter = converter
+        self._offsets = []
+        length = 0
+        for _, numbers, _ in self._segments:
+            self._offsets.append(length)
+            length += 1 if numbers is None else len(numbers)
+        self._length = length
+        # Values built by to_list, converted once
+        self._values = None
+
+    @classmethod
+    def from_tokens(cls, tokens: list, converter: Optional[Callable[[str], Any]] = None) -> 'ExpandedList':
+        """
+        Builds the sequence from the tokens of a bracket list, see ``AutosubmitConfig.parse_bracket_list``.
+
+        A token followed by a list is the prefix of its values, ``start-end`` values are ranges padded to the
+        width of ``start``.
+
+        :param tokens: tokens of the first level of the bracket list.
+        :param converter: function applied to the values, such as the date parser for DATELIST.
+        """
+        segments = []
+
+        def add_value(value):
+            segments.append((converter(value) if converter else value, None, None))
+
+        prefix = None
+        for token in tokens:
+            if type(token) is list:
+                for value in token:
+                    if value.find("-") != -1:
+                        numbers = value.split("-")
+                        values = range(int(numbers[0]), int(numbers[1]) + 1)
+                        if len(values) > 0:
+                            # The prefix must be a string, as the values are built from it
+                            segments.append((prefix + "", values, len(numbers[0])))
+                    else:
+                        add_value(prefix + value)
+                prefix = None
+            else:
+                if prefix is not None and len(str(prefix)) > 0:
+                    add_value(prefix)
+                prefix = token
+        if prefix is not None and len(str(prefix)) > 0:
+            add_value(prefix)
+        return cls(segments, converter)
+
+    def _value(self, segment, number):
+        value = f"{segment[0]}{str(number).zfill(segment[2])}"
+        return self._converter(value) if self._converter else value
+
+    def to_list(self) -> list:
+        """
+        Returns the values as a new list. They are built and converted once, the next calls copy them.
+        """
+        if self._values is None:
+            values = []
+            for value, numbers, width in self._segments:
+                if numbers is None:
+                    values.append(value)
+                else:
+                    values.extend(self._value((value, numbers, width), number) for number in numbers)
+            self._values = values
+        return list(self._values)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._slice(index)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("ExpandedList index out of range")
+        position = bisect_right(self._offsets, index) - 1
+        segment = self._segments[position]
+        if segment[1] is None:
+            return segment[0]
+        return self._value(segment, segment[1][index - self._offsets[position]])
+
+    def _slice(self, index: slice) -> 'ExpandedList':
+        indices = range(self._length)[index]
+        segments = []
+        if len(indices) == 0:
+            return ExpandedList(segments, self._converter)
+        positions = range(len(self._segments))
+        for position in (positions if indices.step > 0 else reversed(positions)):
+            value, numbers, width = self._segments[position]
+            start = self._offsets[position]
+            local = self._local_slice(indices, start, start + (1 if numbers is None else len(numbers)))
+            if numbers is None:
+                if len(range(1)[local]) > 0:
+                    segments.append((value, None, None))
+            else:
+                segments.append((value, numbers[local], width))
+        return ExpandedList(segments, self._converter)
+
+    @staticmethod
+    def _local_slice(indices: range, start: int, end: int) -> slice:
+        """
+        Returns the slice selecting the indices between start and end of a segment, relative to its start.
+        """
+        step = indices.step
+        if step > 0:
+            first = indices.start
+            if first < start:
+                first += -(-(start - first) // step) * step
+            return slice(first - start, max(min(indices.stop, end) - start, 0), step)
+        first = indices.start
+        if first > end - 1:
+            first -= -(-(first - end + 1) // -step) * -step
+        if first < start:
+            return slice(0, 0)
+        stop = max(indices.stop, start - 1) - start
+        return slice(first - start, stop if stop >= 0 else None, step)
+
+    def __contains__(self, item) -> bool:
+        for value, numbers, width in self._segments:
+            if numbers is None:
+                if value == item:
+                    return True
+            elif self._range_contains(value, numbers, width, item):
+                return True
+        return False
+
+    def _range_contains(self, prefix: str, numbers: range, width: int, item) -> bool:
+        if self._converter is None:
+            candidates = [item] if isinstance(item, str) else []
+        elif isinstance(item, datetime):
+            # The dates are matched through their string in the formats that the values of the range can have
+            lengths = sorted(len(prefix) + len(str(number).zfill(width)) for number in (numbers[0], numbers[-1]))
+            candidates = [DATE_FORMATS[length].format(item) for length in range(lengths[0], lengths[1] + 1)
+                          if length in DATE_FORMATS]
+        else:
+            return False
+        for candidate in candidates:
+            suffix = candidate[len(prefix):]
+            if candidate.startswith(prefix) and suffix.isascii() and suffix.isdigit():
+                number = int(suffix)
+                if number in numbers and str(number).zfill(width) == suffix and (
+                        self._converter is None or self._converter(candidate) == item):
+                    return True
+        return False
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (ExpandedList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ExpandedList({list(self)!r})"
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import ctypes
+import ctypes.util
+import os
+import struct
+from contextlib import suppress
+from typing import Dict, List, Set
+
+from log.log import Log
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+# Events of the watched folders that can change the modification time of one of their files
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+# Events of the watched folders loaded as a whole (CUSTOM_CONFIG), that change their own modification time
+DIRECTORY_MASK = IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | \
+    IN_ONLYDIR
+DIRECTORY_EVENTS = IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+EVENT_HEADER = struct.Struct("iIII")
+
+# inotify only sees the changes done by the local host on these filesystems (and FUSE ones), so their files are polled
+REMOTE_FILESYSTEMS = frozenset({
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "gpfs", "lustre", "ceph", "cephfs", "beegfs", "panfs", "glusterfs",
+    "afs", "9p", "wekafs",
+})
+
+
+class FileWatcher:
+    """
+    Detects the configuration files modified since they were loaded by comparing their modification time.
+
+    This is the fallback of ``InotifyWatcher``, every check stats all the watched files.
+    """
+
+    def __init__(self):
+        self.files = dict()
+
+    def watch(self, files: Dict[str, float]) -> None:
+        """
+        Starts watching the given files, replacing the previous ones.
+
+        :param files: modification time of each file when it was loaded.
+        """
+        self.files = dict(files)
+
+    def _modified(self, files) -> List[str]:
+        modified = []
+        for file in files:
+            with suppress(OSError):
+                if os.path.getmtime(file) > self.files[file]:
+                    modified.append(file)
+        return modified
+
+    def changed_files(self) -> List[str]:
+        """
+        Returns the watched files that exist and have been modified since they were loaded.
+        """
+        return self._modified(self.files)
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher(FileWatcher):
+    """
+    Detects the modified configuration files with Linux inotify.
+
+    The folders of the files are watched, so the files replaced by a rename (as many editors do) are detected too.
+    The loaded folders are also watched themselves, so adding, removing or renaming one of their files is detected.
+    Only the files with an event since the last check are stat-ed, the ones in remote filesystems or behind a
+    symbolic link are always polled as inotify does not see their changes. All the files are checked once when the
+    watches are added, for the changes done since they were loaded, and again if the event queue overflows.
+
+    :raises OSError: if inotify is not available.
+    """
+
+    def __init__(self):
+        super().__init__()
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError(f"inotify is not available in {libc_name}")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._folders = dict()  # watch descriptor -> folder
+        self._directories = dict()  # watch descriptor -> loaded folder
+        self._polled = set()
+        self._candidates = set()
+        self._check_all = False
+
+    def __reduce__(self):
+        # The inotify descriptor can't be copied, the copies poll the files
+        return FileWatcher, (), {"files": dict(self.files)}
+
+    def watch(self, files: Dict[str, float]) -> None:
+        super().watch(files)
+        for wd in list(self._folders):
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._folders = dict()
+        self._directories = dict()
+        self._polled = set()
+        self._candidates = set()
+        self._check_all = False
+        self._read_events()  # discards the events of the previous folders
+        remote = remote_folders({os.path.dirname(os.path.abspath(file)) for file in self.files} |
+                                {os.path.abspath(file) for file in self.files if os.path.isdir(file)})
+        # A folder can be both the folder of some files and a loaded folder, its watch has the events of both
+        masks = dict()
+        directories = set()
+        for file in self.files:
+            folder = os.path.dirname(os.path.abspath(file))
+            if folder in remote or os.path.realpath(file) != os.path.abspath(file):
+                self._polled.add(file)
+                continue
+            masks[folder] = masks.get(folder, 0) | WATCH_MASK
+            if os.path.isdir(file):
+                if os.path.abspath(file) in remote:
+                    self._polled.add(file)
+                else:
+                    directories.add(os.path.abspath(file))
+                    masks[os.path.abspath(file)] = masks.get(os.path.abspath(file), 0) | DIRECTORY_MASK
+        watched = dict()
+        for folder, mask in masks.items():
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), mask)
+            watched[folder] = wd
+            if wd >= 0:
+                self._folders[wd] = folder
+                if folder in directories:
+                    self._directories[wd] = folder
+        for file in self.files:
+            if file in self._polled:
+                continue
+            if watched[os.path.dirname(os.path.abspath(file))] < 0 or watched.get(os.path.abspath(file), 0) < 0:
+                self._polled.add(file)
+        # The files modified after they were loaded but before the watches were added have no event
+        self._candidates.update(self._modified(set(self.files) - self._polled))
+
+    def _read_events(self) -> Set[str]:
+        """
+        Reads the pending events and returns the paths of the files they refer to.
+        """
+        paths = set()
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return paths
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(buffer):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(buffer, offset)
+                name = buffer[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length].rstrip(b"\0")
+                offset += EVENT_HEADER.size + length
+                if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    self._check_all = True
+                else:
+                    if wd in self._folders and name:
+                        paths.add(os.path.join(self._folders[wd], os.fsdecode(name)))
+                    if wd in self._directories and mask & DIRECTORY_EVENTS:
+                        paths.add(self._directories[wd])
+
+    def changed_files(self) -> List[str]:
+        if self._check_all:
+            return super().changed_files()
+        absolute_paths = {os.path.abspath(file): file for file in self.files}
+        for path in self._read_events():
+            if path in absolute_paths:
+                self._candidates.add(absolute_paths[path])
+        if self._check_all:
+            return super().changed_files()
+        modified = self._modified(self._candidates | self._polled)
+        # The files with an event but the same modification time don't need to be checked again
+        self._candidates.intersection_update(modified)
+        return modified
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            with suppress(OSError):
+                os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        self.close()
+
+
+def remote_folders(folders: Set[str]) -> Set[str]:
+    """
+    Returns the folders that are in a remote filesystem, according to /proc/self/mounts.
+    """
+    mounts = []
+    try:
+        with open("/proc/self/mounts", "r") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    mount_point = fields[1].replace("\\040", " ").replace("\\011", "\t").replace("\\134", "\\")
+                    mounts.append((mount_point, fields[2]))
+    except OSError:
+        return set(folders)
+    remote = set()
+    for folder in folders:
+        real_folder = os.path.realpath(folder)
+        best = ("", "")
+        for mount_point, filesystem in mounts:
+            if (real_folder == mount_point or real_folder.startswith(mount_point.rstrip("/") + "/")) and len(
+                    mount_point) >= len(best[0]):
+                best = (mount_point, filesystem)
+        if best[1] in REMOTE_FILESYSTEMS or best[1].startswith("fuse"):
+            remote.add(folder)
+    return remote
+
+
+def create_file_watcher() -> FileWatcher:
+    """
+    Returns an ``InotifyWatcher`` if inotify is available, a polling ``FileWatcher`` otherwise.
+    """
+    try:
+        return InotifyWatcher()
+    except (OSError, AttributeError) as exc:
+        Log.debug(f"Polling the configuration files, inotify is not available: {exc}")
+        return FileWatcher()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import string
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+# Depth of the symbolic references followed, as git does
+MAX_SYMREF_DEPTH = 5
+# Environment variables that change the repository git uses, the resolver does not handle them
+GIT_ENVIRONMENT = ("GIT_DIR", "GIT_COMMON_DIR", "GIT_WORK_TREE")
+
+# project folder -> (modification time of the files read, commit)
+_head_cache: Dict[str, Tuple[List[Tuple[str, Optional[int]]], str]] = dict()
+_head_cache_lock = Lock()
+
+
+def _is_object_name(name: str) -> bool:
+    return len(name) in (40, 64) and all(char in string.hexdigits for char in name)
+
+
+def _mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read(path: str, stamps: List[Tuple[str, Optional[int]]]) -> Optional[str]:
+    """
+    Returns the content of a file, or None if it does not exist, recording its modification time in stamps.
+    """
+    stamps.append((path, _mtime(path)))
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _find_git_dir(project_dir: str, stamps: List[Tuple[str, Optional[int]]]) -> Optional[str]:
+    """
+    Returns the git folder of a project: its .git folder, or the one a .git file points to (worktrees, submodules).
+    """
+    dot_git = os.path.join(project_dir, ".git")
+    if os.path.isdir(dot_git):
+        stamps.append((dot_git, _mtime(dot_git)))
+        return dot_git
+    content = _read(dot_git, stamps)
+    if content is None or not content.startswith("gitdir:"):
+        return None
+    git_dir = content[len("gitdir:"):].strip()
+    return os.path.normpath(os.path.join(project_dir, git_dir))
+
+
+def _packed_ref(common_dir: str, ref: str, stamps: List[Tuple[str, Optional[int]]]) -> Optional[str]:
+    content = _read(os.path.join(common_dir, "packed-refs"), stamps)
+    if content is None:
+        return None
+    for line in content.splitlines():
+        if line and line[0] not in "#^":
+            name, _, packed = line.partition(" ")
+            if packed == ref:
+                return name
+    return None
+
+
+def _resolve_head(project_dir: str, stamps: List[Tuple[str, Optional[int]]]) -> Optional[str]:
+    git_dir = _find_git_dir(project_dir, stamps)
+    if git_dir is None:
+        return None
+    common_dir = git_dir
+    content = _read(os.path.join(git_dir, "commondir"), stamps)
+    if content is not None:
+        common_dir = os.path.normpath(os.path.join(git_dir, content.strip()))
+    if os.path.exists(os.path.join(common_dir, "reftable")):
+        return None
+    ref = "HEAD"
+    for _ in range(MAX_SYMREF_DEPTH):
+        # HEAD and the per worktree references are in the git folder, the rest of references are shared
+        per_worktree = ref == "HEAD" or ref.startswith(("refs/worktree/", "refs/bisect/", "refs/rewritten/"))
+        content = _read(os.path.join(git_dir if per_worktree else common_dir, ref), stamps)
+        if content is None:
+            content = _packed_ref(common_dir, ref, stamps)
+            if content is None:
+                return None
+        content = content.strip()
+        if content.startswith("ref:"):
+            ref = content[len("ref:"):].strip()
+        elif _is_object_name(content):
+            return content.lower()
+        else:
+            return None
+    return None
+
+
+def resolve_head(project_dir: str) -> Optional[str]:
+    """
+    Returns the commit of HEAD of a git project, as ``git rev-parse HEAD``, reading the files of its git folder.
+
+    The loose references, packed-refs, symbolic references and the .git files of worktrees and submodules are
+    supported. The result is cached until one of the files read changes. Returns None if the commit can't be
+    resolved this way (no repository, unborn branch, reftable storage or GIT_DIR in the environment), the caller
+    can then ask git.
+
+    :param project_dir: folder of the working tree.
+    :type project_dir: str
+    :return: the commit hash or None.
+    :rtype: Optional[str]
+    """
+    if any(variable in os.environ for variable in GIT_ENVIRONMENT):
+        return None
+    project_dir = os.path.abspath(project_dir)
+    with _head_cache_lock:
+        cached = _head_cache.get(project_dir)
+    if cached is not None and all(_mtime(path) == mtime for path, mtime in cached[0]):
+        return cached[1]
+    stamps = []
+    try:
+        commit = _resolve_head(project_dir, stamps)
+    except (OSError, UnicodeDecodeError):
+        commit = None
+    with _head_cache_lock:
+        if commit is None:
+            _head_cache.pop(project_dir, None)
+        else:
+            _head_cache[project_dir] = (stamps, commit)
+    return commit
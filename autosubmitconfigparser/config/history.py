@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import pickle
+import threading
+import time
+import zlib
+from contextlib import suppress
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Union
+
+
+class ConfigHistory:
+    """
+    Store of the experiment data saved by each run, in the conf/metadata/history folder.
+
+    Every revision is a small manifest in ``revisions`` with the hash of each top level section, and the sections
+    are stored once in ``objects``, compressed and named after their hash. A section that does not change between
+    revisions is not stored again, so the store grows with the changes and not with the number of revisions.
+
+    :param path: folder of the store, created on demand.
+    :type path: Union[str, Path]
+    :param fingerprint: function returning the content hash (bytes) of a section, see
+        ``AutosubmitConfig.fingerprint_tree``.
+    :type fingerprint: Callable
+    """
+
+    def __init__(self, path: Union[str, Path], fingerprint: Callable[[Any], bytes]):
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+
+    @property
+    def objects_folder(self) -> Path:
+        return self.path / "objects"
+
+    @property
+    def revisions_folder(self) -> Path:
+        return self.path / "revisions"
+
+    def _write(self, path: Path, content: bytes, exclusive: bool = False) -> bool:
+        """
+        Writes a file through a temporary one, so it is never seen half written.
+
+        :param exclusive: if True, the file is only created if it does not exist yet. It is linked instead of
+            renamed, which fails as ``O_CREAT | O_EXCL`` does when another process has created it.
+        :return: False if the file is exclusive and it already exists, True otherwise.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            if not exclusive:
+                os.replace(tmp_path, path)
+                return True
+            try:
+                os.link(tmp_path, path)
+            except FileExistsError:
+                return False
+            return True
+        finally:
+            with suppress(OSError):
+                tmp_path.unlink()
+
+    def _object_path(self, object_hash: str) -> Path:
+        return self.objects_folder / object_hash[:2] / object_hash
+
+    def revisions(self) -> List[int]:
+        """
+        Returns the numbers of the stored revisions, from the oldest to the newest.
+        """
+        try:
+            names = os.listdir(self.revisions_folder)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name[:-len(".json")]) for name in names if name.endswith(".json") and name[:-5].isdigit())
+
+    def get_revision(self, revision: int) -> Dict[str, Any]:
+        """
+        Returns the manifest of a revision: its ``timestamp``, ``fingerprint`` and the hash of each section in
+        ``sections``.
+
+        :param revision: number of the revision, negative numbers count from the newest one.
+        """
+        if revision < 0:
+            revision = self.revisions()[revision]
+        with open(self.revisions_folder / f"{revision:08d}.json", "r") as f:
+            return json.load(f)
+
+    def add(self, data: Dict[str, Any]) -> int:
+        """
+        Stores a new revision, unless the data is the same as the newest one.
+
+        :param data: experiment data.
+        :return: number of the revision holding the data.
+        :rtype: int
+        """
+        sections = {}
+        for key, value in data.items():
+            object_hash = self.fingerprint(value).hex()
+            sections[key] = object_hash
+            object_path = self._object_path(object_hash)
+            if not object_path.exists():
+                self._write(object_path, zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)))
+        fingerprint = self.fingerprint(data).hex()
+        manifest = json.dumps({"timestamp": time.time(), "fingerprint": fingerprint, "sections": sections}).encode()
+        # Several processes may add a revision at once, the one that creates the manifest first gets the number
+        # and the others try again with the next one
+        while True:
+            revisions = self.revisions()
+            if revisions and self.get_revision(revisions[-1])["fingerprint"] == fingerprint:
+                return revisions[-1]
+            revision = revisions[-1] + 1 if revisions else 1
+            if self._write(self.revisions_folder / f"{revision:08d}.json", manifest, exclusive=True):
+                return revision
+
+    def load_section(self, object_hash: str) -> Any:
+        """
+        Returns a stored section by its hash.
+        """
+        with open(self._object_path(object_hash), "rb") as f:
+            return pickle.loads(zlib.decompress(f.read()))
+
+    def load(self, revision: int) -> Dict[str, Any]:
+        """
+        Returns the experiment data of a revision.
+
+        :param revision: number of the revision, negative numbers count from the newest one.
+        """
+        return {key: self.load_section(object_hash)
+                for key, object_hash in self.get_revision(revision)["sections"].items()}
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import os
+import pickle
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from pathlib import Path
+from threading import Event, Lock
+from typing import Any, Optional, Union
+
+from log.log import Log
+
+
+class YAMLParseCache:
+    """
+    On-disk cache of parsed YAML documents.
+
+    Each entry is keyed on the file path, size, modification time (ns) and a hash of its content, and it is
+    stored as a pickle so unchanged files are deserialized instead of parsed again. Missing, stale or corrupted
+    entries are ignored and the file is parsed normally. As loading a pickle can run code, the folder is created
+    only accessible by the user, and the entries of other users or writable by them are never loaded.
+
+    :param cache_dir: folder where the entries are stored, created on demand.
+    :type cache_dir: Union[str, Path]
+    :param max_size: maximum size in bytes of all the entries, the oldest ones are evicted first.
+    :type max_size: int
+    :param max_age: maximum age in seconds of an entry since it was last used.
+    :type max_age: int
+    """
+
+    MAGIC = b"ASPC1\n"
+    SUFFIX = ".pickle"
+
+    def __init__(self, cache_dir: Union[str, Path], max_size: int = 256 * 1024 * 1024,
+                 max_age: int = 30 * 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._pruned = False
+
+    @staticmethod
+    def entry_key(file_path: Union[str, Path], content: bytes) -> str:
+        """
+        Returns the key of the cache entry for a file and its content.
+
+        :param file_path: path of the parsed file.
+        :param content: raw content of the file.
+        :return: hexadecimal key.
+        :rtype: str
+        """
+        file_stat = os.stat(file_path)
+        content_hash = hashlib.blake2b(content, digest_size=20).hexdigest()
+        key = f"{Path(file_path).resolve()}|{file_stat.st_size}|{file_stat.st_mtime_ns}|{content_hash}"
+        return hashlib.blake2b(key.encode(), digest_size=20).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached document or None if there is no valid entry.
+
+        :param key: entry key, see ``entry_key``.
+        """
+        entry = self.entry_path(key)
+        try:
+            with open(entry, "rb") as f:
+                entry_stat = os.fstat(f.fileno())
+                if entry_stat.st_uid != os.getuid() or entry_stat.st_mode & 0o022:
+                    # Not trusted, it is replaced by the next put
+                    Log.debug(f"Ignoring parse cache entry {entry}, it can be written by other users")
+                    return None
+                if f.read(len(self.MAGIC)) != self.MAGIC:
+                    raise ValueError(f"Invalid parse cache entry {entry}")
+                data = pickle.load(f)
+            os.utime(entry)  # used as the last access time for the eviction
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            Log.debug(f"Discarding parse cache entry {entry}: {exc}")
+            with suppress(OSError):
+                entry.unlink()
+            return None
+
+    def put(self, key: str, data: Any) -> None:
+        """
+        Stores a parsed document. Errors writing the cache are ignored.
+
+        :param key: entry key, see ``entry_key``.
+        :param data: parsed document.
+        """
+        entry = self.entry_path(key)
+        tmp_entry = entry.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with open(os.open(tmp_entry, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+                f.write(self.MAGIC)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_entry, entry)
+        except Exception as exc:
+            Log.debug(f"Unable to store parse cache entry {entry}: {exc}")
+            with suppress(OSError):
+                tmp_entry.unlink()
+            return
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+
+    def load(self, parser, file_path: Union[str, Path]) -> Any:
+        """
+        Parses a YAML file with the given parser unless a valid cached entry exists.
+
+        :param parser: parser used on a cache miss, see ``YAMLParserFactory``.
+        :param file_path: path of the file to parse.
+        :return: parsed document.
+        """
+        with open(file_path, "rb") as f:
+            content = f.read()
+        key = self.entry_key(file_path, content)
+        data = self.get(key)
+        if data is not None:
+            self.hits += 1
+            return data
+        self.misses += 1
+        data = parser.load(content)
+        if data is not None:
+            self.put(key, data)
+        return data
+
+    def prune(self) -> None:
+        """
+        Evicts the entries not used in ``max_age`` seconds and the least recently used ones beyond ``max_size``.
+        """
+        try:
+            entries = []
+            for entry in self.cache_dir.glob(f"*{self.SUFFIX}"):
+                entry_stat = entry.stat()
+                entries.append((entry_stat.st_mtime, entry_stat.st_size, entry))
+        except OSError:
+            return
+        now = time.time()
+        total_size = 0
+        for mtime, size, entry in sorted(entries, reverse=True):
+            total_size += size
+            if now - mtime > self.max_age or total_size > self.max_size:
+                with suppress(OSError):
+                    entry.unlink()
+
+    def clear(self) -> None:
+        """
+        Removes all the entries.
+        """
+        for entry in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            with suppress(OSError):
+                entry.unlink()
+
+
+class MemoryParseCache:
+    """
+    In-memory cache of parsed YAML documents, shared by the ``AutosubmitConfig`` of several experiments.
+
+    The entries are keyed on the hash of the file content only, so the files included by many experiments
+    (platforms, site defaults, the model files of the same git project) are parsed once even if they are copies
+    in different folders. The documents are stored pickled and each load returns its own copy, as callers modify
+    them. It can be used from several threads, a file being parsed by one of them is waited for by the others.
+
+    :param max_size: maximum size in bytes of the pickled documents, the least recently used ones are evicted.
+    :type max_size: int
+    """
+
+    def __init__(self, max_size: int = 256 * 1024 * 1024):
+        self.max_size = max_size
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pending = dict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        """
+        Returns the pickled document of a key, waiting for it if another thread is parsing it. Otherwise the key
+        is marked as pending and None is returned, the caller must then call ``_put``.
+        """
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = Event()
+                    self.misses += 1
+                    return None
+            pending.wait()
+
+    def _put(self, key: bytes, entry: Optional[bytes]) -> None:
+        with self._lock:
+            if entry is not None and len(entry) <= self.max_size:
+                self._entries[key] = entry
+                self.size += len(entry)
+                while self.size > self.max_size:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+            self._pending.pop(key).set()
+
+    def load(self, parser, file_path: Union[str, Path]) -> Any:
+        """
+        Parses a YAML file with the given parser unless a document with the same content is cached.
+
+        :param parser: parser used on a cache miss, see ``YAMLParserFactory``.
+        :param file_path: path of the file to parse.
+        :return: parsed document.
+        """
+        with open(file_path, "rb") as f:
+            content = f.read()
+        key = hashlib.blake2b(content, digest_size=20).digest()
+        entry = self._get(key)
+        if entry is not None:
+            return pickle.loads(entry)
+        entry = None
+        try:
+            data = parser.load(content)
+            if data is not None:
+                with suppress(Exception):
+                    entry = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            return data
+        finally:
+            self._put(key, entry)
+
+    def clear(self) -> None:
+        """
+        Removes all the entries.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+# Copyright 2015-2025 Earth Sciences Department, BSC-CNS
+
+# This file is part of Autosubmit.
+
+# Autosubmit is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# Autosubmit is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Autosubmit.  If not, see <http://www.gnu.org/licenses/>.
+import pickle
+import struct
+import sys
+import weakref
+from collections.abc import Mapping
+from contextlib import suppress
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator
+
+SHARED_SNAPSHOT_MAGIC = b"ASSHM1\n\0"
+# magic, state, generation, fingerprint, size of the index
+SHARED_SNAPSHOT_HEADER = struct.Struct("8sBQ16sQ")
+STATE_OFFSET = 8
+STATE_CURRENT = 0
+STATE_STALE = 1
+
+
+class SnapshotMapping(Mapping):
+    """
+    Read-only mapping with the top level sections of a shared snapshot.
+
+    Each section is deserialized the first time it is accessed and kept, so a worker only pays for the sections it
+    uses. The values are copies owned by the worker, modifying them does not change the snapshot.
+    """
+
+    def __init__(self, snapshot: 'SharedConfigSnapshot', index: Dict[str, tuple]):
+        self._snapshot = snapshot
+        self._index = index
+        self._sections = dict()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._sections[key]
+        except KeyError:
+            offset, length = self._index[key]
+            value = pickle.loads(self._snapshot.buffer[offset:offset + length])
+            self._sections[key] = value
+            return value
+
+    def __contains__(self, key) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns all the sections in a new dictionary.
+        """
+        return {key: self[key] for key in self._index}
+
+
+def _release(shm: shared_memory.SharedMemory, owner: bool) -> None:
+    if owner:
+        with suppress(Exception):
+            shm.buf[STATE_OFFSET] = STATE_STALE
+    with suppress(Exception):
+        shm.close()
+    if owner:
+        with suppress(FileNotFoundError):
+            shm.unlink()
+
+
+class SharedConfigSnapshot:
+    """
+    Frozen copy of the experiment data in shared memory, published once and read by many worker processes.
+
+    The sections are pickled one by one after a header with the ``generation`` and the fingerprint of the data,
+    so the workers attach to the block by its ``name`` and deserialize only the sections they read, see
+    ``SnapshotMapping``. When the publisher replaces or closes the snapshot it is marked as ``stale``, which the
+    attached workers see, and its name is removed. The memory is freed when the last process closes it.
+
+    Before Python 3.13 the attached processes register the block in the resource tracker of multiprocessing, so
+    the workers should be started by multiprocessing from the publisher process, which shares its tracker.
+
+    Use ``publish`` and ``attach`` to create the instances. A pickled snapshot is attached when it is unpickled,
+    so it can also be passed directly as an argument of the workers.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self.owner = owner
+        magic, _, self.generation, fingerprint, index_size = SHARED_SNAPSHOT_HEADER.unpack_from(shm.buf)
+        if magic != SHARED_SNAPSHOT_MAGIC:
+            shm.close()
+            raise ValueError(f"{shm.name} is not a configuration snapshot")
+        self.fingerprint = fingerprint.hex() if any(fingerprint) else ""
+        start = SHARED_SNAPSHOT_HEADER.size + index_size
+        index = pickle.loads(shm.buf[SHARED_SNAPSHOT_HEADER.size:start])
+        self.data = SnapshotMapping(self, {key: (start + offset, length) for key, (offset, length) in index.items()})
+        self._finalizer = weakref.finalize(self, _release, shm, owner)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def buffer(self) -> memoryview:
+        if not self._finalizer.alive:
+            raise ValueError("The shared snapshot is closed")
+        return self._shm.buf
+
+    @property
+    def stale(self) -> bool:
+        """
+        True if the publisher replaced or closed this snapshot.
+        """
+        return not self._finalizer.alive or self._shm.buf[STATE_OFFSET] != STATE_CURRENT
+
+    @classmethod
+    def publish(cls, data: Dict[str, Any], generation: int = 0, fingerprint: str = "") -> 'SharedConfigSnapshot':
+        """
+        Copies the data to a new shared memory block.
+
+        :param data: experiment data.
+        :param generation: generation of the data, see ``AutosubmitConfig.generation``.
+        :param fingerprint: hexadecimal content hash of the data, see ``AutosubmitConfig.get_fingerprint``.
+        :return: the snapshot, owned by the caller, which must close it.
+        """
+        sections = [(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)) for key, value in data.items()]
+        # The offsets of the sections are relative to the end of the index
+        index = dict()
+        size = 0
+        for key, content in sections:
+            index[key] = (size, len(content))
+            size += len(content)
+        index_content = pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL)
+        start = SHARED_SNAPSHOT_HEADER.size + len(index_content)
+        shm = shared_memory.SharedMemory(create=True, size=start + size)
+        try:
+            SHARED_SNAPSHOT_HEADER.pack_into(shm.buf, 0, SHARED_SNAPSHOT_MAGIC, STATE_CURRENT, generation,
+                                             bytes.fromhex(fingerprint)[:16], len(index_content))
+            shm.buf[SHARED_SNAPSHOT_HEADER.size:start] = index_content
+            position = start
+            for _, content in sections:
+                shm.buf[position:position + len(content)] = content
+                position += len(content)
+        except Exception:
+            _release(shm, True)
+            raise
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedConfigSnapshot':
+        """
+        Attaches to a snapshot published by another process.
+
+        :param name: name of the snapshot.
+        :raises FileNotFoundError: if the snapshot was already removed by its publisher.
+        """
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def close(self) -> None:
+        """
+        Detaches from the snapshot. If this process published it, it is also marked as stale and removed.
+        The sections already read are still available.
+        """
+        self._finalizer()
+
+    def __enter__(self) -> 'SharedConfigSnapshot':
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __reduce__(self):
+        # Only the name is sent to the workers, which attach to the same memory
+        return SharedConfigSnapshot.attach, (self.name,)
@@ -1,11 +1,62 @@
+import os
+import re
+from pathlib import Path
+
 from ruamel.yaml import YAML
 
+try:
+    import yaml as pyyaml
+    try:
+        from yaml import CSafeLoader as PyYAMLBaseLoader
+    except ImportError:
+        from yaml import SafeLoader as PyYAMLBaseLoader
+except ImportError:
+    pyyaml = None
+    PyYAMLBaseLoader = None
+
+YAML_BACKENDS = ("ruamel", "pyyaml", "auto")
+YAML_BACKEND_ENV = "AS_YAML_BACKEND"
+
 
 class YAMLParserFactory:
-    def __init__(self):
-        pass
+    """
+    Creates the parsers used to load the configuration files.
+
+    The backend is chosen with the ``backend`` parameter or, if not given, with the ``AS_YAML_BACKEND``
+    environment variable:
+
+    - ``ruamel`` (default): ruamel.yaml safe loader, which uses its C parser when ruamel.yaml.clib is installed.
+    - ``pyyaml``: PyYAML ``CSafeLoader`` (libyaml) following the YAML 1.2 rules of ruamel, so the resulting
+      data is the same.
+    - ``auto``: ``pyyaml`` if libyaml is available, ``ruamel`` otherwise.
+
+    :param backend: name of the backend
+    :type backend: str
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend
+
+    @property
+    def backend(self):
+        """
+        Name of the backend used by the parsers, ``auto`` is resolved to the one available.
+        """
+        backend = self._backend
+        if backend is None:
+            backend = os.environ.get(YAML_BACKEND_ENV, "ruamel")
+        backend = backend.lower()
+        if backend not in YAML_BACKENDS:
+            raise ValueError(f"Unknown YAML backend {backend}, choose one of {', '.join(YAML_BACKENDS)}")
+        if backend == "auto":
+            backend = "pyyaml" if pyyaml is not None and getattr(pyyaml, "__with_libyaml__", False) else "ruamel"
+        elif backend == "pyyaml" and pyyaml is None:
+            raise ValueError("The pyyaml YAML backend requires PyYAML to be installed")
+        return backend
 
     def create_parser(self):
+        if self.backend == "pyyaml":
+            return PyYAMLParser()
         return YAMLParser()
 
 
@@ -14,3 +65,72 @@ class YAMLParser(YAML):
     def __init__(self):
         self.data = []
         super(YAMLParser, self).__init__(typ="safe")
+
+
+if PyYAMLBaseLoader is not None:
+    class PyYAMLLoader(PyYAMLBaseLoader):
+        """
+        PyYAML safe loader that resolves and constructs scalars as the YAML 1.2 ruamel.yaml safe loader does.
+        """
+
+        yaml_implicit_resolvers = {
+            first: [(tag, regexp) for tag, regexp in resolvers
+                    if tag not in ("tag:yaml.org,2002:bool", "tag:yaml.org,2002:int", "tag:yaml.org,2002:float")]
+            for first, resolvers in PyYAMLBaseLoader.yaml_implicit_resolvers.items()
+        }
+
+        def construct_yaml_int(self, node):
+            value = self.construct_scalar(node).replace("_", "")
+            sign = -1 if value[0] == "-" else 1
+            if value[0] in "+-":
+                value = value[1:]
+            if value.startswith("0b"):
+                return sign * int(value[2:], 2)
+            if value.startswith("0x"):
+                return sign * int(value[2:], 16)
+            if value.startswith("0o"):
+                return sign * int(value[2:], 8)
+            return sign * int(value)
+
+        def construct_mapping(self, node, deep=False):
+            mapping = super().construct_mapping(node, deep=deep)
+            keys = [key_node.value for key_node, _ in node.value if key_node.tag != "tag:yaml.org,2002:merge"]
+            if len(keys) != len(set(keys)):
+                duplicated = sorted({key for key in keys if keys.count(key) > 1})
+                raise pyyaml.constructor.ConstructorError(
+                    "while constructing a mapping", node.start_mark,
+                    f"found duplicate keys {duplicated}", node.start_mark)
+            return mapping
+
+    PyYAMLLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:bool", re.compile(r"^(?:true|True|TRUE|false|False|FALSE)$"), list("tTfF"))
+    PyYAMLLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:float", re.compile(r"""^(?:
+         [-+]?(?:[0-9][0-9_]*)\.[0-9_]*(?:[eE][-+]?[0-9]+)?
+        |[-+]?(?:[0-9][0-9_]*)(?:[eE][-+]?[0-9]+)
+        |[-+]?\.[0-9_]+(?:[eE][-+][0-9]+)?
+        |[-+]?\.(?:inf|Inf|INF)
+        |\.(?:nan|NaN|NAN))$""", re.X), list("-+0123456789."))
+    PyYAMLLoader.add_implicit_resolver(
+        "tag:yaml.org,2002:int", re.compile(r"""^(?:[-+]?0b[0-1_]+
+        |[-+]?0o?[0-7_]+
+        |[-+]?[0-9_]+
+        |[-+]?0x[0-9a-fA-F_]+)$""", re.X), list("-+0123456789"))
+    PyYAMLLoader.add_constructor("tag:yaml.org,2002:int", PyYAMLLoader.construct_yaml_int)
+else:
+    PyYAMLLoader = None
+
+
+class PyYAMLParser:
+    """
+    Parser with the same interface as ``YAMLParser`` backed by PyYAML.
+    """
+
+    def __init__(self):
+        self.data = []
+
+    def load(self, stream):
+        if isinstance(stream, Path):
+            with open(stream, "rb") as f:
+                return pyyaml.load(f, Loader=PyYAMLLoader)
+        return pyyaml.load(stream, Loader=PyYAMLLoader)
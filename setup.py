@@ -17,6 +17,7 @@ test_requires = [
     'pytest',
     'pytest-cov',
     'pytest-mock',
+    'PyYAML',
     'ruff'
 ]
 
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+from autosubmitconfigparser.config.yamlparser import YAMLParserFactory
+
+pytest.importorskip("yaml")
+
+DESTINE_WORKFLOWS = Path(__file__).resolve().parent / "DestinE_workflows"
+
+
+@pytest.mark.parametrize("yaml_file", sorted(
+    str(path.relative_to(DESTINE_WORKFLOWS)) for path in DESTINE_WORKFLOWS.rglob("*")
+    if path.suffix in {".yml", ".yaml"}
+))
+def test_backends_conformance(yaml_file):
+    """
+    Both YAML backends must produce the same data for the DestinE workflows.
+    """
+    path = DESTINE_WORKFLOWS / yaml_file
+    ruamel_data = YAMLParserFactory("ruamel").create_parser().load(path)
+    pyyaml_data = YAMLParserFactory("pyyaml").create_parser().load(path)
+    assert ruamel_data == pyyaml_data
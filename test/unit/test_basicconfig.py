@@ -39,3 +39,72 @@ def test_expid_dir_structure(foo, dir_func, autosubmit_config):
     expected_path = dir_func(root_path, exp_id)
     result = foo(exp_id)
     assert result == expected_path
+
+
+def test_read_cache(tmp_path, monkeypatch, mocker):
+    config_file = tmp_path / "autosubmitrc"
+    config_file.write_text("[config]\nparse_workers = 3\n[hosts]\nauthorized = [run host1,host2]\n")
+    monkeypatch.setenv('AUTOSUBMIT_CONFIGURATION', str(config_file))
+    original = {name: getattr(BasicConfig, name) for name in ["PARSE_WORKERS", "ALLOWED_HOSTS", "CONFIG_FILE_FOUND"]}
+    try:
+        BasicConfig.clear_read_cache()
+        parse = mocker.spy(BasicConfig, "_BasicConfig__parse_file_config")
+        BasicConfig.read()
+        assert BasicConfig.PARSE_WORKERS == 3
+        assert BasicConfig.ALLOWED_HOSTS == {"run": ["host1", "host2"]}
+        # The values are applied again, without parsing the file
+        BasicConfig.PARSE_WORKERS = 5
+        BasicConfig.ALLOWED_HOSTS["run"].append("host3")
+        BasicConfig.read()
+        assert parse.call_count == 1
+        assert BasicConfig.PARSE_WORKERS == 3
+        assert BasicConfig.ALLOWED_HOSTS == {"run": ["host1", "host2"]}
+        # The cache is keyed on the resolved path
+        (tmp_path / "link").symlink_to(config_file)
+        monkeypatch.setenv('AUTOSUBMIT_CONFIGURATION', str(tmp_path / "link"))
+        BasicConfig.read()
+        assert parse.call_count == 1
+        # A modified file is parsed again
+        config_file.write_text("[config]\nparse_workers = 4\n")
+        os.utime(config_file, ns=(config_file.stat().st_mtime_ns + 10 ** 9,) * 2)
+        BasicConfig.read()
+        assert parse.call_count == 2
+        assert BasicConfig.PARSE_WORKERS == 4
+        BasicConfig.clear_read_cache()
+        BasicConfig.read()
+        assert parse.call_count == 3
+    finally:
+        for name, value in original.items():
+            setattr(BasicConfig, name, value)
+        BasicConfig.clear_read_cache()
+
+
+def test_read_threads(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    config_file = tmp_path / "autosubmitrc"
+    config_file.write_text("[config]\nparse_workers = 3\n")
+    monkeypatch.setenv('AUTOSUBMIT_CONFIGURATION', str(config_file))
+    original = BasicConfig.PARSE_WORKERS
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda _: BasicConfig.read(), range(100)))
+        assert BasicConfig.PARSE_WORKERS == 3
+    finally:
+        BasicConfig.PARSE_WORKERS = original
+        BasicConfig.clear_read_cache()
+
+
+def test_props_cache():
+    props = BasicConfig().props()
+    assert "LOCAL_ROOT_DIR" in props and "read" not in props and "props" not in props
+    original = BasicConfig.SMTP_SERVER
+    try:
+        BasicConfig.SMTP_SERVER = "smtp.example.com"
+        BasicConfig.NEW_OPTION = 1
+        props = BasicConfig().props()
+        assert props["SMTP_SERVER"] == "smtp.example.com"
+        assert props["NEW_OPTION"] == 1
+    finally:
+        BasicConfig.SMTP_SERVER = original
+        del BasicConfig.NEW_OPTION
+    assert "NEW_OPTION" not in BasicConfig().props()
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from autosubmitconfigparser.config.batchloader import load_experiments
+from autosubmitconfigparser.config.parsecache import MemoryParseCache
+
+PLATFORMS = "PLATFORMS:\n  MN5:\n    TYPE: slurm\n    HOST: mn5\n"
+
+
+def test_load_experiments(autosubmit_config):
+    expids = ["a000", "a001", "a002", "a003"]
+    for i, expid in enumerate(expids):
+        conf_folder = Path(autosubmit_config(expid=expid).conf_folder_yaml)
+        (conf_folder / "platforms.yml").write_text(PLATFORMS)
+        (conf_folder / "expdef.yml").write_text(f"DEFAULT:\n  EXPID: {expid}\n  HPCARCH: MN5\nVALUE: {i}\n")
+
+    report = load_experiments(expids + ["a000", "zzzz"], workers=3)
+
+    assert list(report.results) == expids + ["zzzz"]
+    assert set(report.configs) == set(expids)
+    for i, expid in enumerate(expids):
+        as_conf = report[expid].as_conf
+        assert as_conf.experiment_data["VALUE"] == i
+        assert as_conf.experiment_data["DEFAULT"]["EXPID"] == expid
+        assert as_conf.experiment_data["PLATFORMS"]["MN5"]["HOST"] == "mn5"
+        assert report[expid].elapsed > 0
+    # The platforms file is parsed once for all the experiments
+    assert report.parse_cache.misses == len(expids) + 1
+    assert report.parse_cache.hits == len(expids) - 1
+    assert list(report.errors) == ["zzzz"]
+    assert isinstance(report["zzzz"].error, IOError)
+    assert "does not exist" in report["zzzz"].traceback
+    assert "Loaded 4 of 5 experiments" in report.summary()
+
+    # A cache given is shared with the next batch
+    cache = MemoryParseCache()
+    load_experiments(expids[:1], parse_cache=cache)
+    assert load_experiments(expids[1:2], parse_cache=cache).parse_cache.hits == 1
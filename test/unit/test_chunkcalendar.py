@@ -0,0 +1,55 @@
+from datetime import datetime
+
+import pytest
+from bscearth.utils.date import chunk_end_date, chunk_start_date
+
+from autosubmitconfigparser.config.chunkcalendar import ChunkCalendar
+
+DATES = [datetime(2000, 1, 31), datetime(2000, 2, 29), datetime(1999, 12, 31, 6), datetime(1950, 3, 15)]
+
+
+@pytest.mark.parametrize("chunk_unit", ["hour", "day", "month", "year"])
+@pytest.mark.parametrize("calendar", ["standard", "noleap"])
+@pytest.mark.parametrize("chunk_size", [1, 7])
+def test_chunk_calendar(chunk_unit, calendar, chunk_size):
+    """The dates are the same as the ones of bscearth.utils."""
+    chunk_calendar = ChunkCalendar(DATES, 30, chunk_size, chunk_unit, calendar)
+
+    for date in DATES:
+        starts = []
+        ends = []
+        for chunk in range(1, 31):
+            start = chunk_start_date(date, chunk, chunk_size, chunk_unit, calendar)
+            end = chunk_end_date(start, chunk_size, chunk_unit, calendar)
+            assert chunk_calendar.start_date(date, chunk) == start
+            assert chunk_calendar.end_date(date, chunk) == end
+            starts.append(start)
+            ends.append(end)
+        assert chunk_calendar.start_dates(date) == starts
+        assert chunk_calendar.end_dates(date) == ends
+
+
+def test_chunk_calendar_out_of_range():
+    chunk_calendar = ChunkCalendar(DATES, 2, 1, "month")
+    with pytest.raises(IndexError):
+        chunk_calendar.start_date(DATES[0], 3)
+    with pytest.raises(KeyError):
+        chunk_calendar.end_date(datetime(2020, 1, 1), 1)
+
+
+def test_get_chunk_calendar(autosubmit_config):
+    as_conf = autosubmit_config(expid="a000", experiment_data={
+        "EXPERIMENT": {"DATELIST": "20000101", "NUMCHUNKS": 1200, "CHUNKSIZE": 1, "CHUNKSIZEUNIT": "month",
+                       "CALENDAR": "noleap"},
+    })
+
+    chunk_calendar = as_conf.get_chunk_calendar()
+    assert as_conf.get_chunk_calendar() is chunk_calendar
+    assert chunk_calendar.start_date(datetime(2000, 1, 1), 1200) == datetime(2099, 12, 1)
+    assert chunk_calendar.end_date(datetime(2000, 1, 1), 1200) == datetime(2100, 1, 1)
+
+    # The values modified in place are seen
+    as_conf.experiment_data["EXPERIMENT"]["NUMCHUNKS"] = 2
+    assert as_conf.get_chunk_calendar().num_chunks == 2
+    as_conf.experiment_data["EXPERIMENT"]["DATELIST"] = "20100101"
+    assert as_conf.get_chunk_calendar().start_date(datetime(2010, 1, 1), 2) == datetime(2010, 2, 1)
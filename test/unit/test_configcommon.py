@@ -1,5 +1,7 @@
+from datetime import datetime
 from typing import Callable
 from pathlib import Path
+from pyparsing import nestedExpr
 from textwrap import dedent
 import pytest
 
@@ -143,3 +145,142 @@ def test_key_error_raise(autosubmit_config: Callable):
     assert as_conf.jobs_data == {"SIM": {}}
     assert as_conf.platforms_data == {"LOCAL": {}}
     assert as_conf.get_platform() == "DUMMY"
+
+
+def test_copy_tree():
+    """The copy is independent but keeps the lists shared between sections, as ``copy.deepcopy``."""
+    shared = ["%A%", "b"]
+    date = datetime(2000, 1, 1)
+    data = {"A": {"LIST": shared, "DATE": date, "NUMBER": 1}, "B": {"LIST": shared}, "C": [{"D": None}]}
+
+    copied = AutosubmitConfig.copy_tree(data)
+
+    assert copied == data
+    assert copied["A"]["LIST"] is copied["B"]["LIST"]
+    assert copied["A"]["LIST"] is not shared
+    assert copied["C"][0] is not data["C"][0]
+    copied["A"]["LIST"][0] = "a"
+    copied["C"][0]["D"] = 1
+    assert data == {"A": {"LIST": ["%A%", "b"], "DATE": date, "NUMBER": 1}, "B": {"LIST": ["%A%", "b"]},
+                    "C": [{"D": None}]}
+
+
+def test_get_section_cache(autosubmit_config: Callable):
+    """The lookups are cached, see the data modified in place and keep the behaviour of ``get_section``."""
+    as_conf: AutosubmitConfig = autosubmit_config(expid="a000", experiment_data={
+        "CONFIG": {"TOTALJOBS": "20", "EMPTY": ""},
+        "MAIL": {"NOTIFICATIONS": True},
+        "JOBS": {"SIM": {"PROCESSORS": 4}},
+    })
+
+    assert as_conf.get_total_jobs() == 20
+    assert as_conf.get_mails_to() == ""
+    assert as_conf.get_notifications() == "true"
+    assert as_conf.get_processors("JOBS") == "1"
+    assert as_conf.get_section(["jobs", "sim", "processors"]) == 4
+    assert as_conf.get_section(["JOBS", "POST", "PROCESSORS"], 1) == 1
+    assert as_conf.get_section(["JOBS", "POST", "PROCESSORS"], {"PROCESSORS": 2}) == 2
+    with pytest.raises(AutosubmitCritical):
+        as_conf.get_section(["CONFIG", "EMPTY"], must_exists=True)
+    with pytest.raises(AutosubmitCritical):
+        as_conf.get_section(["CONFIG", "TOTALJOBS", "VALUE"], must_exists=True)
+    misses = as_conf.section_cache_misses
+
+    assert as_conf.get_total_jobs() == 20
+    assert as_conf.get_section(["JOBS", "POST", "PROCESSORS"], 1) == 1
+    assert as_conf.section_cache_misses == misses
+    assert as_conf.section_cache_hits >= 2
+
+    # The data modified in place is seen without calling experiment_data_changed
+    as_conf.experiment_data["JOBS"]["SIM"]["PROCESSORS"] = 8
+    assert as_conf.get_section(["JOBS", "SIM", "PROCESSORS"]) == 8
+    as_conf.experiment_data["CONFIG"]["TOTALJOBS"] = "30"
+    assert as_conf.get_total_jobs() == 30
+    as_conf.experiment_data["JOBS"]["SIM"] = {"PROCESSORS": 16}
+    assert as_conf.get_section(["JOBS", "SIM", "PROCESSORS"]) == 16
+    del as_conf.experiment_data["JOBS"]["SIM"]
+    assert as_conf.get_section(["JOBS", "SIM", "PROCESSORS"], 1) == 1
+    as_conf.experiment_data["JOBS"]["POST"] = {"PROCESSORS": 3}
+    assert as_conf.get_section(["JOBS", "POST", "PROCESSORS"], 1) == 3
+    misses = as_conf.section_cache_misses
+
+    as_conf.experiment_data["CONFIG"]["TOTALJOBS"] = 10
+    as_conf.experiment_data_changed()
+    assert as_conf.get_total_jobs() == 10
+    assert as_conf.section_cache_misses == misses + 1
+
+    as_conf.experiment_data = {}
+    assert as_conf.get_total_jobs() == -1
+
+
+def test_get_section_as_cache(autosubmit_config: Callable):
+    as_conf: AutosubmitConfig = autosubmit_config(expid="a000", experiment_data={
+        "JOBS": {"SIM": {"PROCESSORS": "4"}},
+        "SIM": {"X11": "TRUE"},
+    })
+    calls = []
+
+    def converter(value):
+        calls.append(value)
+        return int(value)
+
+    assert as_conf.get_section_as(["JOBS", "SIM", "PROCESSORS"], converter, 1) == 4
+    assert as_conf.get_section_as(["JOBS", "SIM", "PROCESSORS"], converter, 1) == 4
+    assert as_conf.get_section_as(["JOBS", "POST", "PROCESSORS"], converter, 1) == 1
+    assert as_conf.get_section_as(["JOBS", "POST", "PROCESSORS"], converter, 2) == 2
+    assert calls == ["4", 1, 2]
+    assert as_conf.typed_cache_hits == 1
+    assert as_conf.typed_cache_misses == 3
+    assert as_conf.get_x11("SIM") == "true"
+
+    # The raw value is read every time, so the data modified in place is seen
+    as_conf.experiment_data["JOBS"]["SIM"]["PROCESSORS"] = "8"
+    assert as_conf.get_section_as(["JOBS", "SIM", "PROCESSORS"], converter, 1) == 8
+    # A new generation starts a new cache
+    as_conf.experiment_data_changed()
+    assert as_conf.get_section_as(["JOBS", "SIM", "PROCESSORS"], converter, 1) == 8
+    assert calls == ["4", 1, 2, "8", "8"]
+    # The default values that are not hashable are not cached
+    assert as_conf.get_section_as(["JOBS", "POST"], len, {"A": 1}) == 1
+    assert as_conf.typed_cache_misses == 6
+
+
+@pytest.mark.parametrize("string", [
+    "[20200101 20200201]",
+    "[1950[0101-1231] 2000[0101 0201]]",
+    "  [fc[0-3] fc10]trailing",
+    "[a,b [c]]",
+    "[\"quoted text\" b]",
+])
+def test_parse_bracket_list(string):
+    """The bracket lists are parsed as pyparsing's ``nestedExpr`` does."""
+    assert AutosubmitConfig.parse_bracket_list(string) == nestedExpr('[', ']').parseString(string).asList()
+
+
+def test_date_and_member_lists(autosubmit_config: Callable):
+    as_conf: AutosubmitConfig = autosubmit_config(expid="a000", experiment_data={
+        "EXPERIMENT": {"DATELIST": "2000[0101-0103] 20100101 2020010112", "MEMBERS": "fc[08-10] fc20"},
+    })
+
+    dates = as_conf.get_date_list()
+    assert dates == [datetime(2000, 1, 1), datetime(2000, 1, 2), datetime(2000, 1, 3), datetime(2010, 1, 1),
+                     datetime(2020, 1, 1, 12)]
+    assert as_conf.get_member_list() == ["fc08", "fc09", "fc10", "fc20"]
+    # The expansions are cached on the raw value and the results are copies
+    dates.clear()
+    assert len(as_conf.get_date_list()) == 5
+
+    as_conf.experiment_data = {"EXPERIMENT": {"DATELIST": "1950[01-02]", "MEMBERS": ""}}
+    assert as_conf.get_date_list() == [datetime(1950, 1, 1), datetime(1950, 2, 1)]
+    assert as_conf.get_member_list() == []
+
+    # The raw values modified in place are expanded again
+    as_conf.experiment_data["EXPERIMENT"]["DATELIST"] = "19500301"
+    as_conf.experiment_data["EXPERIMENT"]["MEMBERS"] = "fc0 fc1"
+    assert as_conf.get_date_list() == [datetime(1950, 3, 1)]
+    assert as_conf.get_member_list() == ["fc0", "fc1"]
+    del as_conf.experiment_data["EXPERIMENT"]["DATELIST"]
+    assert as_conf.get_date_list() == [datetime(2022, 4, 1)]
+    as_conf.experiment_data["EXPERIMENT"] = {"MEMBERS": "fc2", "RUN_ONLY_MEMBERS": "fc3"}
+    assert as_conf.get_member_list() == ["fc2"]
+    assert as_conf.get_member_list(run_only=True) == ["fc3"]
@@ -0,0 +1,162 @@
+import json
+import os
+import socket
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+from autosubmitconfigparser.config.basicconfig import BasicConfig
+from autosubmitconfigparser.config import configdaemon
+from autosubmitconfigparser.config.configdaemon import ConfigDaemon, ConfigDaemonClient, check_socket_folder, \
+    encode_message, receive_message, send_frame, start_daemon
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    daemon = ConfigDaemon(str(tmp_path / "daemon" / "config.sock"))
+    daemon.bind()
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.stop()
+    thread.join(10)
+
+
+def _write(path: Path, content: str, mtime: float) -> None:
+    path.write_text(content)
+    os.utime(path, (mtime, mtime))
+
+
+def test_load_from_daemon(autosubmit_config, daemon, monkeypatch):
+    # The mock of the fixture would be part of the experiment data, and it can't be sent
+    monkeypatch.setattr(BasicConfig, "read", staticmethod(lambda: None))
+    monkeypatch.setenv("AS_ENV_TEST", "client")
+    as_conf = autosubmit_config(expid="a000")
+    expdef = Path(as_conf.conf_folder_yaml) / "expdef.yml"
+    _write(expdef, "DEFAULT:\n  EXPID: a000\n  HPCARCH: LOCAL\nVALUE: 1\nENV: '%AS_ENV_TEST%'\n",
+           time.time() - 100)
+    as_conf.reload(force_load=True)
+
+    client_conf = autosubmit_config(expid="a000")
+    assert client_conf.load_from_daemon(daemon.socket_path)
+    assert client_conf.experiment_data == as_conf.experiment_data
+    assert client_conf.experiment_data["ENV"] == "client"
+    assert client_conf.current_loaded_files == {str(file): mtime for file, mtime in
+                                                as_conf.current_loaded_files.items()}
+    assert client_conf.starter_conf == as_conf.starter_conf
+    assert client_conf.misc_data == as_conf.misc_data
+    assert client_conf.get_key_provenance("VALUE") == as_conf.get_key_provenance("VALUE") == (str(expdef), "conf", 4)
+    assert not client_conf.needs_reload()
+    assert (daemon.hits, daemon.misses) == (0, 1)
+    assert autosubmit_config(expid="a000").load_from_daemon(daemon.socket_path)
+    assert (daemon.hits, daemon.misses) == (1, 1)
+
+    # The experiment is loaded again for a client with another environment, and the daemon keeps its own
+    monkeypatch.setenv("AS_ENV_TEST", "other")
+    assert client_conf.load_from_daemon(daemon.socket_path)
+    assert client_conf.experiment_data["ENV"] == client_conf.experiment_data["AS_ENV_TEST"] == "other"
+    assert (daemon.hits, daemon.misses) == (1, 2)
+    # The environment of the request is applied while loading, and the one of the daemon restored
+    response = json.loads(daemon.handle({"op": "get", "expid": "a000",
+                                         "environment": dict(configdaemon.get_environment(), AS_ENV_TEST="request")}))
+    assert response["experiment_data"]["ENV"] == "request"
+    assert os.environ["AS_ENV_TEST"] == "other"
+    assert (daemon.hits, daemon.misses) == (1, 3)
+
+    # The daemon reloads the modified files
+    _write(expdef, "DEFAULT:\n  EXPID: a000\n  HPCARCH: LOCAL\nVALUE: 2\n", time.time())
+    assert client_conf.needs_reload()
+    assert client_conf.load_from_daemon(daemon.socket_path)
+    assert client_conf.experiment_data["VALUE"] == 2
+    assert (daemon.hits, daemon.misses) == (1, 4)
+
+    with pytest.raises(RuntimeError, match="does not exist"):
+        ConfigDaemonClient(daemon.socket_path).get("zzzz")
+    with pytest.raises(OSError, match="already listening"):
+        ConfigDaemon(daemon.socket_path).bind()
+
+
+def test_load_from_daemon_fallback(autosubmit_config, tmp_path):
+    as_conf = autosubmit_config(expid="a000")
+    _write(Path(as_conf.conf_folder_yaml) / "expdef.yml", "VALUE: 1\n", time.time())
+    assert not ConfigDaemonClient(str(tmp_path / "missing.sock")).ping()
+    assert not as_conf.load_from_daemon(str(tmp_path / "missing.sock"))
+    assert as_conf.experiment_data["VALUE"] == 1
+
+
+def test_daemon_stop_and_idle(tmp_path):
+    socket_path = str(tmp_path / "config.sock")
+    daemon = ConfigDaemon(socket_path)
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    daemon.bind()
+    thread.start()
+    client = ConfigDaemonClient(socket_path)
+    assert client.ping()
+    assert oct(os.stat(socket_path).st_mode & 0o777) == oct(0o600)
+    client.stop()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert not os.path.exists(socket_path)
+    assert not client.ping()
+
+    start = time.monotonic()
+    ConfigDaemon(socket_path, idle_timeout=0.2).serve()
+    assert time.monotonic() - start < 5
+    assert not os.path.exists(socket_path)
+
+
+def test_start_daemon(tmp_path):
+    socket_path = str(tmp_path / "config.sock")
+    assert start_daemon(socket_path, idle_timeout=30)
+    client = ConfigDaemonClient(socket_path)
+    assert client.ping()
+    pid = client.request({"op": "ping"})["pid"]
+    assert pid != os.getpid()
+    # Already running
+    assert start_daemon(socket_path)
+    assert client.request({"op": "ping"})["pid"] == pid
+    client.stop()
+    for _ in range(100):
+        if not client.ping():
+            break
+        time.sleep(0.05)
+    assert not client.ping()
+
+
+def test_daemon_socket_security(tmp_path, daemon, monkeypatch):
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)
+    with pytest.raises(PermissionError, match="accessible by other users"):
+        check_socket_folder(str(shared))
+    with pytest.raises(PermissionError, match="accessible by other users"):
+        ConfigDaemon(str(shared / "config.sock")).bind()
+    (tmp_path / "link").symlink_to(os.path.dirname(daemon.socket_path))
+    with pytest.raises(PermissionError, match="is not a folder"):
+        check_socket_folder(str(tmp_path / "link"))
+    assert not ConfigDaemonClient(str(tmp_path / "link" / "config.sock")).ping()
+
+    # The client only talks to a daemon of the same user
+    client = ConfigDaemonClient(daemon.socket_path)
+    assert client.ping()
+    monkeypatch.setattr(configdaemon, "peer_uid", lambda sock: os.getuid() + 1)
+    with pytest.raises(PermissionError, match="another user"):
+        client.request({"op": "ping"})
+    assert not client.ping()
+
+
+def test_daemon_messages():
+    message = {"DATA": {"LIST": [1, 2.5, None, True], ("A", 1): (date(2000, 1, 2), datetime(2000, 1, 2, 3, 4)),
+                        1: {configdaemon.TYPE_KEY: "tuple"}}}
+    left, right = socket.socketpair()
+    with left, right:
+        send_frame(left, encode_message(message))
+        assert receive_message(right) == message
+        send_frame(left, b"\x80\x04K\x01.")
+        with pytest.raises(ValueError):
+            receive_message(right)
+    with pytest.raises(TypeError):
+        encode_message({"VALUE": object()})
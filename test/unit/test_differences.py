@@ -1,3 +1,6 @@
+import os
+from pathlib import Path
+
 from autosubmitconfigparser.config.configcommon import AutosubmitConfig
 
 """Tests for the configuration diff functions."""
@@ -175,3 +178,95 @@ def test_detailed_deep_imitate_autosubmit_usage(as_conf_large: AutosubmitConfig)
     }
 
     assert changes == expected_changes
+
+
+
+def test_fingerprints(as_conf_large: AutosubmitConfig, mocker) -> None:
+    """Equal subtrees of the current and last run data are compared through their fingerprints."""
+    assert AutosubmitConfig.fingerprint_tree({"A": 1, "B": [1, "2"]}) == AutosubmitConfig.fingerprint_tree(
+        {"B": [1, "2"], "A": 1})
+    assert AutosubmitConfig.fingerprint_tree({"A": 1}) != AutosubmitConfig.fingerprint_tree({"A": "1"})
+
+    as_conf_large.last_experiment_data = AutosubmitConfig.copy_tree(as_conf_large.experiment_data)
+    spy = mocker.spy(as_conf_large, "detailed_deep_diff")
+    assert not as_conf_large.quick_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data)
+    assert as_conf_large.detailed_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data) == {}
+    assert spy.call_count == 1
+
+    # Only the changed sections are walked, the others are compared by their fingerprint
+    spy.reset_mock()
+    as_conf_large.experiment_data["CONFIG"]["TOTALJOBS"] = 1000
+    as_conf_large.experiment_data_changed()
+    assert as_conf_large.quick_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data)
+    assert as_conf_large.detailed_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data) == {
+        "CONFIG": {"TOTALJOBS": as_conf_large.last_experiment_data["CONFIG"]["TOTALJOBS"]}}
+    sections = [value for value in as_conf_large.experiment_data.values() if isinstance(value, dict)]
+    assert spy.call_count == 1 + len(sections)
+
+    # The fingerprints are computed again on a new generation
+    fingerprint = as_conf_large.get_fingerprint()
+    as_conf_large.experiment_data["CONFIG"]["TOTALJOBS"] = as_conf_large.last_experiment_data["CONFIG"]["TOTALJOBS"]
+    as_conf_large.experiment_data_changed()
+    assert as_conf_large.get_fingerprint() != fingerprint
+    assert not as_conf_large.quick_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data)
+    assert as_conf_large.detailed_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data) == {}
+    assert AutosubmitConfig.fingerprint_tree(as_conf_large.experiment_data) == bytes.fromhex(
+        as_conf_large.get_fingerprint())
+
+
+def test_fingerprints_not_walked(as_conf_large: AutosubmitConfig, mocker) -> None:
+    """The diff of data with the same fingerprint does not walk nor hash the trees again."""
+    as_conf_large.last_experiment_data = AutosubmitConfig.copy_tree(as_conf_large.experiment_data)
+    assert as_conf_large.get_fingerprint()
+    assert not as_conf_large.quick_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data)
+
+    fingerprint_spy = mocker.spy(AutosubmitConfig, "fingerprint_tree")
+    quick_spy = mocker.spy(as_conf_large, "quick_deep_diff")
+    detailed_spy = mocker.spy(as_conf_large, "detailed_deep_diff")
+    for _ in range(3):
+        assert not as_conf_large.quick_deep_diff(as_conf_large.experiment_data, as_conf_large.last_experiment_data)
+        assert as_conf_large.detailed_deep_diff(as_conf_large.experiment_data,
+                                                as_conf_large.last_experiment_data) == {}
+        assert as_conf_large.get_fingerprint()
+    assert quick_spy.call_count == detailed_spy.call_count == 3
+    # Only the roots, found in the memo
+    assert all(call.args[0] is as_conf_large.experiment_data for call in fingerprint_spy.call_args_list)
+
+
+def test_fingerprints_last_run(autosubmit_config, tmpdir, mocker) -> None:
+    """The fingerprint of the last run is read from the header of the file it is loaded from."""
+    os.environ["USER"] = Path(tmpdir).owner()
+    as_conf = autosubmit_config(expid="t000", experiment_data={"DEFAULT": {"HPCARCH": "local"},
+                                                               "JOBS": {"SIM": {"WALLCLOCK": "00:30"}},
+                                                               "ROOTDIR": tmpdir.strpath})
+    as_conf.save()
+    for write_yaml in (True, False):
+        if not write_yaml:
+            Path(as_conf.metadata_folder, "experiment_data.pkl").unlink()
+        spy = mocker.spy(AutosubmitConfig, "fingerprint_tree")
+        as_conf.load_last_run()
+        assert not as_conf.quick_deep_diff(as_conf.experiment_data, as_conf.last_experiment_data)
+        assert as_conf.detailed_deep_diff(as_conf.experiment_data, as_conf.last_experiment_data) == {}
+        assert all(call.args[0] is as_conf.experiment_data for call in spy.call_args_list)
+        mocker.stop(spy)
+
+    # The sections are hashed once the roots differ
+    as_conf.experiment_data = dict(as_conf.last_experiment_data, JOBS={"SIM": {"WALLCLOCK": "01:00"}})
+    assert as_conf.quick_deep_diff(as_conf.experiment_data, as_conf.last_experiment_data)
+    assert as_conf.detailed_deep_diff(as_conf.experiment_data, as_conf.last_experiment_data) == {
+        "JOBS": {"SIM": {"WALLCLOCK": "01:00"}}}
+
+
+def test_changed_since_last_run(autosubmit_config, tmpdir) -> None:
+    os.environ["USER"] = Path(tmpdir).owner()
+    as_conf = autosubmit_config(expid="t000", experiment_data={"DEFAULT": {"HPCARCH": "local"},
+                                                               "ROOTDIR": tmpdir.strpath})
+    assert as_conf.get_last_run_fingerprint() is None
+    assert as_conf.changed_since_last_run()
+
+    as_conf.save()
+    assert as_conf.get_last_run_fingerprint() == as_conf.get_fingerprint()
+    assert not as_conf.changed_since_last_run()
+
+    as_conf.experiment_data = {"DEFAULT": {"HPCARCH": "marenostrum"}, "ROOTDIR": tmpdir.strpath}
+    assert as_conf.changed_since_last_run()
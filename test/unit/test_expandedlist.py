@@ -0,0 +1,76 @@
+from datetime import datetime
+
+import pytest
+
+from autosubmitconfigparser.config.configcommon import AutosubmitConfig
+from autosubmitconfigparser.config.expandedlist import ExpandedList
+
+
+def _members(string):
+    return ExpandedList.from_tokens(AutosubmitConfig.parse_bracket_list(string)[0])
+
+
+def test_expanded_list_members():
+    members = _members("[fc[000-999] fc1000 x[8-10]]")
+    expected = [f"fc{number:03d}" for number in range(1000)] + ["fc1000", "x8", "x9", "x10"]
+
+    assert len(members) == len(expected)
+    assert members == expected
+    assert members[0] == "fc000" and members[-1] == "x10" and members[1000] == "fc1000"
+    with pytest.raises(IndexError):
+        members[len(expected)]
+    assert "fc042" in members and "x9" in members
+    assert "fc42" not in members and "x08" not in members and "fc1001" not in members and 42 not in members
+
+
+@pytest.mark.parametrize("index", [
+    slice(None), slice(5, 20), slice(995, 1002), slice(None, None, 7), slice(None, None, -3), slice(1003, 990, -2),
+    slice(-2, None), slice(2000, None),
+])
+def test_expanded_list_slices(index):
+    members = _members("[fc[000-999] fc1000 x[8-10]]")
+    sliced = members[index]
+
+    assert isinstance(sliced, ExpandedList)
+    assert list(sliced) == list(members)[index]
+
+
+def test_expanded_list_dates():
+    dates = ExpandedList.from_tokens(AutosubmitConfig.parse_bracket_list("[1950[0101-0131] 2000 20100101[00-23]]")[0],
+                                     AutosubmitConfig.parse_date_string)
+
+    assert len(dates) == 31 + 1 + 24
+    assert dates[0] == datetime(1950, 1, 1) and dates[31] == datetime(2000, 1, 1)
+    assert dates[-1] == datetime(2010, 1, 1, 23)
+    assert datetime(1950, 1, 15) in dates and datetime(2010, 1, 1, 5) in dates
+    assert datetime(1950, 2, 1) not in dates and datetime(1950, 1, 15, 1) not in dates
+
+
+def test_date_and_member_sequences(autosubmit_config):
+    as_conf = autosubmit_config(expid="a000", experiment_data={
+        "EXPERIMENT": {"DATELIST": "2000[0101-0103]", "MEMBERS": "fc[0-1]"},
+    })
+
+    assert as_conf.get_date_sequence() is as_conf.get_date_sequence()
+    assert as_conf.get_date_list() == list(as_conf.get_date_sequence())
+    assert as_conf.get_member_sequence() == ["fc0", "fc1"]
+    assert as_conf.get_member_sequence(run_only=True) == []
+
+
+def test_expanded_list_to_list():
+    calls = []
+
+    def converter(value):
+        calls.append(value)
+        return AutosubmitConfig.parse_date_string(value)
+
+    dates = ExpandedList.from_tokens(AutosubmitConfig.parse_bracket_list("[2000[0101-0103] 2010]")[0], converter)
+    calls.clear()
+    values = dates.to_list()
+    assert values == [datetime(2000, 1, 1), datetime(2000, 1, 2), datetime(2000, 1, 3), datetime(2010, 1, 1)]
+    assert calls == ["20000101", "20000102", "20000103"]
+
+    # The values are converted once, each call returns a new list
+    values.clear()
+    assert len(dates.to_list()) == 4
+    assert calls == ["20000101", "20000102", "20000103"]
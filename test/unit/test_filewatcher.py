@@ -0,0 +1,142 @@
+import os
+import pickle
+import time
+from pathlib import Path
+
+import pytest
+
+from autosubmitconfigparser.config.filewatcher import FileWatcher, InotifyWatcher, create_file_watcher
+
+
+def _touch(path: Path, content: str, mtime: float) -> None:
+    path.write_text(content)
+    os.utime(path, (mtime, mtime))
+
+
+def _inotify_watcher():
+    try:
+        return InotifyWatcher()
+    except OSError:
+        pytest.skip("inotify is not available")
+
+
+@pytest.mark.parametrize("watcher_factory", [FileWatcher, _inotify_watcher], ids=["polling", "inotify"])
+def test_changed_files(tmp_path, watcher_factory):
+    loaded = time.time() - 100
+    files = {}
+    for name in ["a.yml", "b.yml", "c.yml"]:
+        _touch(tmp_path / name, "A: 1", loaded)
+        files[str(tmp_path / name)] = loaded
+    watcher = watcher_factory()
+    watcher.watch(files)
+    assert watcher.changed_files() == []
+
+    # Modified in place
+    _touch(tmp_path / "a.yml", "A: 2", loaded + 10)
+    assert watcher.changed_files() == [str(tmp_path / "a.yml")]
+    # Replaced by a rename, as editors do
+    _touch(tmp_path / "new.yml", "B: 2", loaded + 10)
+    os.replace(tmp_path / "new.yml", tmp_path / "b.yml")
+    assert sorted(watcher.changed_files()) == [str(tmp_path / "a.yml"), str(tmp_path / "b.yml")]
+    # Touched without changing the modification time
+    _touch(tmp_path / "c.yml", "A: 1", loaded)
+    assert sorted(watcher.changed_files()) == [str(tmp_path / "a.yml"), str(tmp_path / "b.yml")]
+    # Removed files are not reported
+    os.remove(tmp_path / "a.yml")
+    assert watcher.changed_files() == [str(tmp_path / "b.yml")]
+
+    watcher.watch({file: os.path.getmtime(file) for file in files if os.path.exists(file)})
+    assert watcher.changed_files() == []
+    watcher.close()
+
+
+def test_inotify_watcher_removed_folder(tmp_path):
+    watcher = _inotify_watcher()
+    folder = tmp_path / "conf"
+    folder.mkdir()
+    _touch(folder / "a.yml", "A: 1", time.time() - 100)
+    watcher.watch({str(folder / "a.yml"): time.time() - 100})
+    assert watcher.changed_files() == []
+    # The folder is replaced, its files are checked from now on
+    os.rename(folder, tmp_path / "old")
+    folder.mkdir()
+    _touch(folder / "a.yml", "A: 2", time.time())
+    assert watcher.changed_files() == [str(folder / "a.yml")]
+    watcher.close()
+
+
+def test_inotify_watcher_pickle(tmp_path):
+    watcher = _inotify_watcher()
+    _touch(tmp_path / "a.yml", "A: 1", time.time() - 100)
+    watcher.watch({str(tmp_path / "a.yml"): time.time() - 50})
+    copy = pickle.loads(pickle.dumps(watcher))
+    assert type(copy) is FileWatcher
+    assert copy.files == watcher.files
+    watcher.close()
+
+
+def test_needs_reload_with_file_watcher(autosubmit_config, tmp_path):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    as_conf.conf_folder_yaml = tmp_path / 'conf'
+    as_conf.conf_folder_yaml.mkdir(parents=True, exist_ok=True)
+    config_file = as_conf.conf_folder_yaml / 'test.yml'
+    config_file.write_text('VAR: 1')
+    as_conf.reload(force_load=True)
+    assert str(config_file) in as_conf.current_loaded_files
+
+    as_conf.enable_file_watcher()
+    assert as_conf.file_watcher is not None
+    assert not as_conf.needs_reload()
+    assert as_conf.get_changed_files() == []
+
+    _touch(config_file, 'VAR: 2', time.time() + 10)
+    assert as_conf.needs_reload()
+    assert as_conf.get_changed_files() == [str(config_file)]
+    as_conf.reload()
+    assert as_conf.experiment_data['VAR'] == 2
+    assert not as_conf.needs_reload()
+    as_conf.file_watcher.close()
+
+
+def test_create_file_watcher():
+    watcher = create_file_watcher()
+    assert isinstance(watcher, FileWatcher)
+    watcher.close()
+
+
+@pytest.mark.parametrize("watcher_factory", [FileWatcher, _inotify_watcher], ids=["polling", "inotify"])
+def test_changed_folders(tmp_path, watcher_factory):
+    loaded = time.time() - 100
+    folder = tmp_path / "custom"
+    folder.mkdir()
+    _touch(folder / "a.yml", "A: 1", loaded)
+    os.utime(folder, (loaded, loaded))
+    watcher = watcher_factory()
+    watcher.watch({str(folder): loaded, str(folder / "a.yml"): loaded})
+    assert watcher.changed_files() == []
+
+    # A file added to a loaded folder changes the folder
+    (folder / "b.yml").write_text("B: 1")
+    assert watcher.changed_files() == [str(folder)]
+    watcher.watch({str(folder): os.path.getmtime(folder), str(folder / "a.yml"): loaded})
+    assert watcher.changed_files() == []
+    # And so does a removed one
+    os.utime(folder, (loaded, loaded))
+    watcher.watch({str(folder): loaded, str(folder / "a.yml"): loaded})
+    os.remove(folder / "b.yml")
+    assert watcher.changed_files() == [str(folder)]
+    watcher.close()
+
+
+@pytest.mark.parametrize("watcher_factory", [FileWatcher, _inotify_watcher], ids=["polling", "inotify"])
+def test_changed_before_watch(tmp_path, watcher_factory):
+    loaded = time.time() - 100
+    _touch(tmp_path / "a.yml", "A: 1", loaded)
+    _touch(tmp_path / "b.yml", "B: 1", loaded)
+    # Modified after it was read, before the watch starts
+    _touch(tmp_path / "a.yml", "A: 2", loaded + 10)
+    watcher = watcher_factory()
+    watcher.watch({str(tmp_path / "a.yml"): loaded, str(tmp_path / "b.yml"): loaded})
+    assert watcher.changed_files() == [str(tmp_path / "a.yml")]
+    assert watcher.changed_files() == [str(tmp_path / "a.yml")]
+    watcher.close()
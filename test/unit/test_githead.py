@@ -0,0 +1,102 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from autosubmitconfigparser.config.githead import resolve_head
+
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "test", "GIT_AUTHOR_EMAIL": "test@test.com",
+    "GIT_COMMITTER_NAME": "test", "GIT_COMMITTER_EMAIL": "test@test.com",
+}
+
+
+def git(cwd, *args) -> str:
+    return subprocess.check_output(["git", *args], cwd=cwd, env={**os.environ, **GIT_ENV}, text=True).strip()
+
+
+def rev_parse(cwd) -> str:
+    return git(cwd, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repository(tmp_path) -> Path:
+    path = tmp_path / "repository"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    for i in range(2):
+        (path / "file.txt").write_text(str(i))
+        git(path, "add", "file.txt")
+        git(path, "commit", "-q", "-m", f"commit {i}")
+    return path
+
+
+def test_resolve_head_layouts(repository, tmp_path):
+    # Loose reference
+    assert resolve_head(str(repository)) == rev_parse(repository)
+    # Packed reference
+    git(repository, "pack-refs", "--all")
+    assert not (repository / ".git" / "refs" / "heads" / "main").exists()
+    assert resolve_head(str(repository)) == rev_parse(repository)
+    # Detached HEAD
+    git(repository, "checkout", "-q", "HEAD~1")
+    assert resolve_head(str(repository)) == rev_parse(repository)
+    # Symbolic reference pointing to a branch
+    git(repository, "checkout", "-q", "main")
+    git(repository, "symbolic-ref", "refs/heads/alias", "refs/heads/main")
+    git(repository, "symbolic-ref", "HEAD", "refs/heads/alias")
+    assert resolve_head(str(repository)) == rev_parse(repository)
+    # Worktree, with a .git file and a commondir
+    git(repository, "worktree", "add", "-q", "-b", "other", str(tmp_path / "worktree"), "main~1")
+    assert (tmp_path / "worktree" / ".git").is_file()
+    assert resolve_head(str(tmp_path / "worktree")) == rev_parse(tmp_path / "worktree")
+    assert resolve_head(str(tmp_path / "worktree")) != resolve_head(str(repository))
+    # Separate git folder, as the submodules
+    git(tmp_path, "clone", "-q", "--separate-git-dir", str(tmp_path / "separate.git"), str(repository), "separate")
+    assert resolve_head(str(tmp_path / "separate")) == rev_parse(tmp_path / "separate")
+
+
+def test_resolve_head_cache(repository):
+    first = resolve_head(str(repository))
+    assert first == rev_parse(repository)
+    (repository / "file.txt").write_text("new")
+    git(repository, "commit", "-q", "-am", "new commit")
+    assert resolve_head(str(repository)) == rev_parse(repository) != first
+    git(repository, "pack-refs", "--all")
+    git(repository, "reset", "-q", "--hard", first)
+    assert resolve_head(str(repository)) == first
+
+
+def test_resolve_head_unresolved(tmp_path, monkeypatch):
+    assert resolve_head(str(tmp_path)) is None
+    git(tmp_path, "init", "-q", "-b", "main")
+    # Unborn branch
+    assert resolve_head(str(tmp_path)) is None
+    (tmp_path / "file.txt").write_text("0")
+    git(tmp_path, "add", "file.txt")
+    git(tmp_path, "commit", "-q", "-m", "commit")
+    assert resolve_head(str(tmp_path)) == rev_parse(tmp_path)
+    monkeypatch.setenv("GIT_DIR", str(tmp_path / ".git"))
+    assert resolve_head(str(tmp_path)) is None
+
+
+def test_load_workflow_commit_without_git(autosubmit_config, repository, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    mocker.patch(
+        "autosubmitconfigparser.config.configcommon.AutosubmitConfig.is_current_logged_user_owner",
+        new_callable=mocker.PropertyMock,
+        return_value=True
+    )
+    as_conf.experiment_data = {
+        "AUTOSUBMIT": {},
+        "ROOTDIR": str(repository.parent),
+        "PROJECT": {"PROJECT_DESTINATION": "git_project"}
+    }
+    (repository.parent / "proj").mkdir()
+    repository.rename(repository.parent / "proj" / "git_project")
+    commit = rev_parse(repository.parent / "proj" / "git_project")
+    check_output = mocker.patch("autosubmitconfigparser.config.configcommon.subprocess.check_output")
+    as_conf.load_workflow_commit()
+    check_output.assert_not_called()
+    assert as_conf.experiment_data["AUTOSUBMIT"]["WORKFLOW_COMMIT"] == commit
@@ -0,0 +1,62 @@
+import os
+from pathlib import Path
+
+from autosubmitconfigparser.config.configcommon import AutosubmitConfig
+from autosubmitconfigparser.config.history import ConfigHistory
+
+
+def test_history_deduplicates_sections(tmp_path):
+    history = ConfigHistory(tmp_path / "history", AutosubmitConfig.fingerprint_tree)
+    data = {"JOBS": {"SIM": {"WALLCLOCK": "00:30"}}, "DEFAULT": {"EXPID": "a000"}, "VAR": 1}
+
+    assert history.revisions() == []
+    assert history.add(data) == 1
+    assert history.add(data) == 1
+    objects = [path for path in (tmp_path / "history" / "objects").rglob("*") if path.is_file()]
+
+    changed = dict(data, VAR=2)
+    assert history.add(changed) == 2
+    # Only the changed section is stored again
+    assert len([path for path in (tmp_path / "history" / "objects").rglob("*") if path.is_file()]) == len(objects) + 1
+    assert history.revisions() == [1, 2]
+    assert history.load(1) == data
+    assert history.load(-1) == changed
+
+
+def test_config_revisions(autosubmit_config, tmpdir):
+    os.environ["USER"] = Path(tmpdir).owner()
+    data = {"DEFAULT": {"HPCARCH": "local"}, "ROOTDIR": tmpdir.strpath, "JOBS": {"SIM": {"WALLCLOCK": "00:30"}}}
+    as_conf = autosubmit_config(expid="t000", experiment_data=data)
+    as_conf.save()
+    as_conf.save()
+    as_conf.experiment_data = dict(data, JOBS={"SIM": {"WALLCLOCK": "01:00"}})
+    as_conf.save()
+
+    revisions = as_conf.get_config_revisions()
+    assert [revision["revision"] for revision in revisions] == [1, 2]
+    assert revisions[-1]["fingerprint"] == as_conf.get_fingerprint()
+    assert as_conf.load_config_revision(1) == data
+    assert as_conf.diff_config_revisions(2, 1) == as_conf.detailed_deep_diff(as_conf.load_config_revision(2),
+                                                                          as_conf.load_config_revision(1))
+    assert as_conf.diff_config_revisions(2, 1) == {"JOBS": {"SIM": {"WALLCLOCK": "01:00"}}}
+
+
+def test_history_concurrent_revisions(tmp_path, mocker):
+    history = ConfigHistory(tmp_path / "history", AutosubmitConfig.fingerprint_tree)
+    history.add({"VAR": 1})
+    other = ConfigHistory(tmp_path / "history", AutosubmitConfig.fingerprint_tree)
+    revisions = history.revisions
+
+    def add_concurrently():
+        # Another process stores its revision after this one has read the numbers in use
+        numbers = revisions()
+        if numbers == [1]:
+            other.add({"VAR": 2})
+        return numbers
+
+    mocker.patch.object(history, "revisions", side_effect=add_concurrently)
+    assert history.add({"VAR": 3}) == 3
+    mocker.stopall()
+    assert history.revisions() == [1, 2, 3]
+    assert history.load(2) == {"VAR": 2} and history.load(3) == {"VAR": 3}
+    assert [path.name for path in (tmp_path / "history").rglob("*.tmp")] == []
@@ -0,0 +1,64 @@
+from pathlib import Path
+from textwrap import dedent
+
+
+def test_key_provenance(autosubmit_config, tmpdir, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    # The provenance of the data already merged is dropped during the reload, without changing the result
+    drop = mocker.spy(as_conf, "_drop_provenance")
+    as_conf.conf_folder_yaml = Path(tmpdir) / 'conf'
+    as_conf.conf_folder_yaml.mkdir(parents=True, exist_ok=True)
+    pre_file = Path(tmpdir) / 'pre.yml'
+    post_file = Path(tmpdir) / 'post.yml'
+    nested_file = Path(tmpdir) / 'nested.yml'
+    minimal_file = as_conf.conf_folder_yaml / 'minimal.yml'
+    jobs_file = as_conf.conf_folder_yaml / 'jobs.yml'
+
+    minimal_file.write_text(dedent(f'''\
+        DEFAULT:
+          EXPID: a000
+          HPCARCH: local
+          CUSTOM_CONFIG:
+            PRE: {pre_file}
+            POST: {post_file}
+        '''))
+    jobs_file.write_text(dedent('''\
+        JOBS:
+          SIM:
+            WALLCLOCK: "01:00"
+            PROCESSORS: 1
+        '''))
+    pre_file.write_text(dedent(f'''\
+        DEFAULT:
+          CUSTOM_CONFIG:
+            PRE: {nested_file}
+        JOBS:
+          SIM:
+            PLATFORM: local
+            WALLCLOCK: "00:10"
+        '''))
+    nested_file.write_text(dedent('''\
+        JOBS:
+          SIM:
+            PLATFORM: marenostrum5
+            QUEUE: debug
+        '''))
+    post_file.write_text(dedent('''\
+        JOBS:
+          SIM:
+            PROCESSORS: 4
+        '''))
+
+    as_conf.reload(force_load=True)
+
+    assert drop.call_count > 0
+    assert as_conf._provenance is None
+    assert as_conf.experiment_data['JOBS']['SIM']['PROCESSORS'] == 4
+    assert as_conf.get_key_provenance('JOBS.SIM.WALLCLOCK') == (str(jobs_file), 'conf', 3)
+    assert as_conf.get_key_provenance('jobs.sim.processors') == (str(post_file), 'POST', 3)
+    assert as_conf.get_key_provenance('JOBS.SIM.PLATFORM') == (str(pre_file), 'PRE', 6)
+    assert as_conf.get_key_provenance('JOBS.SIM.QUEUE') == (str(nested_file), 'PRE.PRE', 4)
+    assert as_conf.get_key_provenance('DEFAULT.EXPID') == (str(minimal_file), 'conf', 2)
+    assert as_conf.get_key_provenance('ROOTDIR') is None
+    assert as_conf.get_keys_set_by_file(pre_file) == ['JOBS.SIM.PLATFORM']
+    assert sorted(as_conf.get_keys_set_by_file(jobs_file)) == ['JOBS.SIM.WALLCLOCK']
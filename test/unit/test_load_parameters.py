@@ -1,3 +1,6 @@
+import pytest
+
+
 def test_load_parameters(autosubmit_config):
 
     as_conf = autosubmit_config(
@@ -7,3 +10,42 @@ def test_load_parameters(autosubmit_config):
                                    'M': '%M%', 'M_': '%M_%', 'm': '%m%', 'm_': '%m_%'})
     parameters = as_conf.load_parameters()
     assert parameters['VAR.DEEP_VAR'] == ['%NOTFOUND%', '%TEST%', '%TEST2%']
+
+
+def test_load_parameters_index(autosubmit_config, mocker):
+    as_conf = autosubmit_config(
+        expid='a000',
+        experiment_data={'DEFAULT': {'EXPID': 'a000'}, 'JOBS': {'SIM': {'WALLCLOCK': '00:30'}}})
+    spy = mocker.spy(as_conf.__class__, 'deep_parameters_export')
+    parameters = as_conf.load_parameters()
+    assert parameters == {'DEFAULT.EXPID': 'a000', 'JOBS.SIM.WALLCLOCK': '00:30'}
+    assert spy.call_count == 2
+    # The result is a copy, and the index is reused while the data does not change
+    parameters['DEFAULT.EXPID'] = 'a001'
+    assert as_conf.load_parameters()['DEFAULT.EXPID'] == 'a000'
+    assert spy.call_count == 2
+
+    # Only the replaced top level sections are flattened again
+    as_conf.experiment_data['JOBS'] = {'POST': {'WALLCLOCK': '01:00'}}
+    assert as_conf.load_parameters() == {'DEFAULT.EXPID': 'a000', 'JOBS.POST.WALLCLOCK': '01:00'}
+    assert spy.call_count == 3
+
+    # Nested changes made in place are notified, and the index is built again
+    generation = as_conf.generation
+    as_conf.experiment_data['JOBS']['POST']['WALLCLOCK'] = '02:00'
+    as_conf.experiment_data['JOBS']['SIM'] = {'DEPENDENCIES': ['POST']}
+    as_conf.experiment_data_changed()
+    assert as_conf.generation == generation + 1
+    assert as_conf.load_parameters() == {'DEFAULT.EXPID': 'a000', 'JOBS.POST.WALLCLOCK': '02:00',
+                                         'JOBS.SIM.DEPENDENCIES': ['POST']}
+    assert spy.call_count == 5
+
+    # The index itself is a read-only view
+    flat_parameters = as_conf.get_flat_parameters()
+    assert flat_parameters['JOBS.SIM.DEPENDENCIES'] == ['POST']
+    with pytest.raises(TypeError):
+        flat_parameters['DEFAULT.EXPID'] = 'a002'
+    assert spy.call_count == 5
+
+    as_conf.experiment_data = {'VAR': 1}
+    assert as_conf.load_parameters() == {'VAR': 1}
@@ -0,0 +1,139 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from autosubmitconfigparser.config.parsecache import YAMLParseCache
+from autosubmitconfigparser.config.yamlparser import YAMLParserFactory
+
+
+def _write(path: Path, content: str) -> Path:
+    path.write_text(content)
+    return path
+
+
+def test_parse_cache_hit_and_miss(tmp_path):
+    cache = YAMLParseCache(tmp_path / "cache")
+    yaml_file = _write(tmp_path / "jobs.yml", "JOBS:\n  SIM:\n    WALLCLOCK: '00:30'\n")
+    parser = YAMLParserFactory().create_parser()
+
+    assert cache.load(parser, yaml_file) == {"JOBS": {"SIM": {"WALLCLOCK": "00:30"}}}
+    assert (cache.hits, cache.misses) == (0, 1)
+    assert cache.load(parser, yaml_file) == {"JOBS": {"SIM": {"WALLCLOCK": "00:30"}}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A modified file is a different entry
+    _write(yaml_file, "JOBS:\n  SIM:\n    WALLCLOCK: '01:30'\n")
+    assert cache.load(parser, yaml_file) == {"JOBS": {"SIM": {"WALLCLOCK": "01:30"}}}
+    assert cache.misses == 2
+
+
+def test_parse_cache_corrupted_entry(tmp_path):
+    cache = YAMLParseCache(tmp_path / "cache")
+    yaml_file = _write(tmp_path / "expdef.yml", "DEFAULT:\n  EXPID: a000\n")
+    parser = YAMLParserFactory().create_parser()
+    cache.load(parser, yaml_file)
+    for entry in (tmp_path / "cache").iterdir():
+        entry.write_bytes(b"garbage")
+
+    assert cache.load(parser, yaml_file) == {"DEFAULT": {"EXPID": "a000"}}
+    assert cache.misses == 2
+
+
+def test_parse_cache_untrusted_entry(tmp_path, monkeypatch):
+    cache = YAMLParseCache(tmp_path / "cache")
+    yaml_file = _write(tmp_path / "expdef.yml", "DEFAULT:\n  EXPID: a000\n")
+    parser = YAMLParserFactory().create_parser()
+    cache.load(parser, yaml_file)
+    assert oct((tmp_path / "cache").stat().st_mode & 0o777) == oct(0o700)
+    entry, = (tmp_path / "cache").iterdir()
+    assert oct(entry.stat().st_mode & 0o777) == oct(0o600)
+
+    # Entries writable by other users are not loaded
+    entry.chmod(0o666)
+    assert cache.load(parser, yaml_file) == {"DEFAULT": {"EXPID": "a000"}}
+    assert (cache.hits, cache.misses) == (0, 2)
+    assert oct(entry.stat().st_mode & 0o777) == oct(0o600)
+    assert cache.load(parser, yaml_file) == {"DEFAULT": {"EXPID": "a000"}}
+    assert cache.hits == 1
+
+    # Nor the entries of other users
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    assert cache.load(parser, yaml_file) == {"DEFAULT": {"EXPID": "a000"}}
+    assert (cache.hits, cache.misses) == (1, 3)
+
+
+def test_parse_cache_prune(tmp_path):
+    cache = YAMLParseCache(tmp_path / "cache", max_age=3600)
+    parser = YAMLParserFactory().create_parser()
+    for index in range(3):
+        cache.load(parser, _write(tmp_path / f"file{index}.yml", f"VAR: {index}\n"))
+    entries = sorted((tmp_path / "cache").iterdir())
+    assert len(entries) == 3
+
+    old = time.time() - 7200
+    os.utime(entries[0], (old, old))
+    cache.prune()
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+    cache.max_size = 1
+    cache.prune()
+    assert len(list((tmp_path / "cache").iterdir())) == 0
+
+
+def test_reload_with_parse_cache(autosubmit_config, tmp_path):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    as_conf.parse_cache = YAMLParseCache(tmp_path / "parse_cache")
+    _write(Path(as_conf.conf_folder_yaml) / "test.yml", "VAR: [a, b]\nDEFAULT:\n  HPCARCH: local\n")
+
+    as_conf.reload(force_load=True)
+    first_data = as_conf.experiment_data
+    assert as_conf.parse_cache.misses > 0
+    hits = as_conf.parse_cache.hits
+
+    as_conf.reload(force_load=True)
+    assert as_conf.parse_cache.hits > hits
+    assert as_conf.experiment_data["VAR"] == first_data["VAR"] == ["a", "b"]
+
+
+def test_memory_parse_cache(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from autosubmitconfigparser.config.parsecache import MemoryParseCache
+    cache = MemoryParseCache()
+    parser_factory = YAMLParserFactory()
+    # Copies of the same file in different folders share the entry
+    files = []
+    for name in ["a000", "a001", "a002", "a003"]:
+        (tmp_path / name).mkdir()
+        files.append(_write(tmp_path / name / "platforms.yml", "PLATFORMS:\n  MN5:\n    TYPE: slurm\n"))
+    with ThreadPoolExecutor(4) as executor:
+        documents = list(executor.map(lambda file: cache.load(parser_factory.create_parser(), file), files * 4))
+    assert all(document == {"PLATFORMS": {"MN5": {"TYPE": "slurm"}}} for document in documents)
+    assert (cache.hits, cache.misses, len(cache)) == (15, 1, 1)
+    # Each load gets its own copy
+    documents[0]["PLATFORMS"]["MN5"]["TYPE"] = "pbs"
+    assert cache.load(parser_factory.create_parser(), files[0]) == {"PLATFORMS": {"MN5": {"TYPE": "slurm"}}}
+
+    _write(files[0], "PLATFORMS:\n  MN5:\n    TYPE: pbs\n")
+    assert cache.load(parser_factory.create_parser(), files[0]) == {"PLATFORMS": {"MN5": {"TYPE": "pbs"}}}
+    assert (cache.misses, len(cache)) == (2, 2)
+
+    # The least recently used documents are evicted
+    cache.max_size = cache.size - 1
+    _write(files[1], "A: 1\n")
+    cache.load(parser_factory.create_parser(), files[1])
+    assert len(cache) == 2 and cache.size <= cache.max_size
+    cache.clear()
+    assert (len(cache), cache.size) == (0, 0)
+
+
+def test_memory_parse_cache_error(tmp_path):
+    from autosubmitconfigparser.config.parsecache import MemoryParseCache
+    cache = MemoryParseCache()
+    yaml_file = _write(tmp_path / "wrong.yml", "A: [1\n")
+    for _ in range(2):
+        with pytest.raises(Exception):
+            cache.load(YAMLParserFactory().create_parser(), yaml_file)
+    assert (cache.misses, len(cache)) == (2, 0)
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+
+def _prepare_conf(conf_folder: Path, custom_folder: Path) -> None:
+    custom_folder.mkdir(parents=True, exist_ok=True)
+    for index in range(6):
+        (custom_folder / f"custom_{index}.yml").write_text(f"CUSTOM_{index}:\n  VALUE: {index}\nOVERRIDE: {index}\n")
+    (conf_folder / "expdef.yml").write_text(
+        f"DEFAULT:\n  EXPID: a000\n  HPCARCH: local\n  CUSTOM_CONFIG: {custom_folder}\nOVERRIDE: conf\n")
+    (conf_folder / "jobs.yml").write_text("JOBS:\n  SIM:\n    FILE: sim.sh\n    RUNNING: once\n")
+
+
+@pytest.mark.parametrize("parse_workers", [1, 4])
+def test_prefetch_same_result(autosubmit_config, tmp_path, parse_workers):
+    as_conf = autosubmit_config(expid='a000', experiment_data={}, parse_workers=parse_workers)
+    _prepare_conf(Path(as_conf.conf_folder_yaml), tmp_path / "custom")
+    as_conf.reload(force_load=True)
+
+    assert as_conf.experiment_data["OVERRIDE"] == "conf"
+    for index in range(6):
+        assert as_conf.experiment_data[f"CUSTOM_{index}"]["VALUE"] == index
+    assert as_conf.experiment_data["JOBS"]["SIM"]["FILE"] == "sim.sh"
+    assert as_conf._parsed_files == {}
+
+
+def test_prefetch_yaml_files(autosubmit_config, tmp_path):
+    as_conf = autosubmit_config(expid='a000', experiment_data={}, parse_workers=4)
+    _prepare_conf(Path(as_conf.conf_folder_yaml), tmp_path / "custom")
+    filenames = as_conf.get_yaml_filenames_to_load(tmp_path / "custom")
+    as_conf.prefetch_yaml_files(filenames + [f"{tmp_path}/%NOT_RESOLVED%.yml"])
+    assert sorted(as_conf._parsed_files.keys()) == sorted(filenames)
+
+    # The prefetched document is used instead of reading the file again
+    Path(filenames[0]).unlink()
+    data = as_conf.load_config_file({}, Path(filenames[0]))
+    assert data["CUSTOM_0"] == {"VALUE": 0}
+    assert data["OVERRIDE"] == 0
+
+
+def test_prefetch_error_raised_on_load(autosubmit_config, tmp_path):
+    as_conf = autosubmit_config(expid='a000', experiment_data={}, parse_workers=2)
+    (tmp_path / "good.yml").write_text("A: 1\n")
+    (tmp_path / "bad.yml").write_text("A: [1\n")
+    as_conf.prefetch_yaml_files([tmp_path / "good.yml", tmp_path / "bad.yml"])
+
+    assert as_conf.load_config_file({}, tmp_path / "good.yml")["A"] == 1
+    with pytest.raises(Exception):
+        as_conf.load_config_file({}, tmp_path / "bad.yml")
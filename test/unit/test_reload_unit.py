@@ -1,8 +1,11 @@
+import os
 import time
 from pathlib import Path
 
 import pytest
 
+from autosubmitconfigparser.config.configcommon import AutosubmitConfig
+
 
 @pytest.mark.parametrize("force_load, current_loaded_files, expected_result", [
     (True, None, ['%NOTFOUND%', '%TEST%', '%TEST2%']),
@@ -61,3 +64,58 @@ def test_needs_reload(autosubmit_config, tmpdir, current_loaded_files, reload_wh
         as_conf.experiment_data["CONFIG"] = {}
         as_conf.experiment_data["CONFIG"]["RELOAD_WHILE_RUNNING"] = False
     assert as_conf.needs_reload() == expected_result
+
+
+def test_reload_reads_conf_files_once(autosubmit_config, tmpdir, mocker):
+    as_conf = autosubmit_config(
+        expid='a000',
+        experiment_data={})
+    as_conf.conf_folder_yaml = tmpdir / 'conf'
+    Path(as_conf.conf_folder_yaml).mkdir(parents=True, exist_ok=True)
+
+    with open(as_conf.conf_folder_yaml / 'minimal.yml', 'w') as f:
+        f.write('DEFAULT:\n  EXPID: a000\n  HPCARCH: local\nVAR: minimal')
+    with open(as_conf.conf_folder_yaml / 'test.yml', 'w') as f:
+        f.write('VAR: test\nVAR2: ["%VAR%"]')
+    read_config_file = mocker.spy(as_conf, 'read_config_file')
+    as_conf.reload(force_load=True)
+
+    read_files = [str(call.args[0]) for call in read_config_file.call_args_list]
+    assert sorted(read_files) == sorted(as_conf.get_yaml_filenames_to_load(as_conf.conf_folder_yaml))
+    assert as_conf.experiment_data['VAR'] == 'test'
+    assert as_conf.experiment_data['VAR2'] == ['test']
+    assert as_conf.starter_conf['VAR'] == 'test'
+
+
+def test_incremental_reload(autosubmit_config, tmpdir, mocker):
+    as_conf = autosubmit_config(
+        expid='a000',
+        experiment_data={})
+    conf_folder = Path(as_conf.conf_folder_yaml)
+    custom_folder = Path(tmpdir) / 'custom'
+    custom_folder.mkdir()
+    (conf_folder / 'minimal.yml').write_text(
+        f'DEFAULT:\n  EXPID: a000\n  HPCARCH: local\n  CUSTOM_CONFIG:\n    PRE: {custom_folder}\n')
+    (conf_folder / 'jobs.yml').write_text('JOBS:\n  SIM:\n    FILE: sim.sh\n    WALLCLOCK: "%WALL%"\n')
+    (custom_folder / 'platforms.yml').write_text('WALL: "01:00"\nPLATFORMS:\n  MN5:\n    TYPE: slurm\n')
+    as_conf.reload(force_load=True)
+    assert as_conf.experiment_data['JOBS']['SIM']['WALLCLOCK'] == '01:00'
+
+    # Nothing changed, nothing is parsed
+    get_parser = mocker.spy(AutosubmitConfig, 'get_parser')
+    as_conf.reload()
+    assert get_parser.call_count == 0
+
+    # Only the modified file is parsed again
+    modified_file = custom_folder / 'platforms.yml'
+    modified_file.write_text('WALL: "02:00"\nPLATFORMS:\n  MN5:\n    TYPE: pjm\n')
+    future = time.time() + 100
+    os.utime(modified_file, (future, future))
+    as_conf.reload()
+    assert [str(call.args[1]) for call in get_parser.call_args_list] == [str(modified_file)]
+
+    full_as_conf = autosubmit_config(expid='a000', experiment_data={})
+    full_as_conf.reload(force_load=True)
+    assert as_conf.experiment_data == full_as_conf.experiment_data
+    assert as_conf.experiment_data['JOBS']['SIM']['WALLCLOCK'] == '02:00'
+    assert as_conf.experiment_data['PLATFORMS']['MN5']['TYPE'] == 'pjm'
@@ -1,9 +1,12 @@
 import os
+import threading
 
 import pytest
 from pathlib import Path
 from ruamel.yaml import YAML
 
+from autosubmitconfigparser.config.configcommon import AutosubmitConfig
+
 
 @pytest.mark.parametrize("data, owner", [
     ({
@@ -37,13 +40,95 @@ def test_save(autosubmit_config, tmpdir, mocker, data, owner):
             yaml = YAML(typ="safe")
             assert data == yaml.load(f)
 
+        # Nothing is written if the data has not changed
+        mtime = (Path(as_conf.metadata_folder) / 'experiment_data.yml').stat().st_mtime_ns
+        as_conf.save()
+        assert (Path(as_conf.metadata_folder) / 'experiment_data.yml').stat().st_mtime_ns == mtime
+        assert not (Path(as_conf.metadata_folder) / 'experiment_data.yml.bak').exists()
+
         # Test .bak generated.
+        as_conf.experiment_data = dict(data, CHANGED=True)
         as_conf.save()
         assert (Path(as_conf.metadata_folder) / 'experiment_data.yml.bak').exists()
-        # force fail save
+        with open(Path(as_conf.metadata_folder) / 'experiment_data.yml.bak', 'r') as f:
+            assert data == YAML(typ="safe").load(f)
+        assert [path.name for path in Path(as_conf.metadata_folder).iterdir() if path.suffix == '.tmp'] == []
+        # The backup is a copy, a previous one is replaced
+        as_conf.experiment_data = dict(data, CHANGED=1)
+        as_conf.save()
+        with open(Path(as_conf.metadata_folder) / 'experiment_data.yml.bak', 'r') as f:
+            assert dict(data, CHANGED=True) == YAML(typ="safe").load(f)
+
+        # Modified in place and notified, the data is saved again
+        as_conf.experiment_data["CHANGED"] = 2
+        as_conf.experiment_data_changed()
+        as_conf.save()
+        with open(Path(as_conf.metadata_folder) / 'experiment_data.yml', 'r') as f:
+            assert dict(data, CHANGED=2) == YAML(typ="safe").load(f)
+        assert as_conf.load_last_run() == dict(data, CHANGED=2)
+
+        # force fail save, the files of the previous save are kept
+        as_conf.experiment_data = dict(data, CHANGED=False)
         mocker.patch("builtins.open", side_effect=Exception("Forced exception"))
         mocker.patch("shutil.copyfile", return_value=True)
         as_conf.save()
-        assert Path(as_conf.metadata_folder) / 'experiment_data.yml' not in Path(as_conf.metadata_folder).iterdir()
+        mocker.stopall()
+        with open(Path(as_conf.metadata_folder) / 'experiment_data.yml', 'r') as f:
+            assert dict(data, CHANGED=2) == YAML(typ="safe").load(f)
+        assert (Path(as_conf.metadata_folder) / 'experiment_data.pkl').exists()
+        assert [path.name for path in Path(as_conf.metadata_folder).iterdir() if path.suffix == '.tmp'] == []
         assert as_conf.data_changed is True
         assert as_conf.last_experiment_data == {}
+
+
+def test_save_snapshot(autosubmit_config, tmpdir):
+    os.environ["USER"] = Path(tmpdir).owner()
+    data = {"DEFAULT": {"HPCARCH": "local"}, "ROOTDIR": tmpdir.strpath, "LIST": [1, "a"]}
+    as_conf = autosubmit_config(expid='t000', experiment_data=data)
+    assert as_conf.load_last_run() == {}
+
+    as_conf.save()
+    snapshot = Path(as_conf.metadata_folder) / 'experiment_data.pkl'
+    assert snapshot.exists()
+    assert as_conf.load_last_run() == data
+    assert as_conf.last_experiment_data == data
+
+    # Without the yaml file, the snapshot is newer and it is preferred
+    as_conf.experiment_data = dict(data, NEW=1)
+    as_conf.save(write_yaml=False)
+    with open(Path(as_conf.metadata_folder) / 'experiment_data.yml', 'r') as f:
+        assert "NEW" not in YAML(typ="safe").load(f)
+    assert as_conf.load_last_run() == dict(data, NEW=1)
+    assert not as_conf.changed_since_last_run()
+
+    # A corrupted snapshot is ignored
+    as_conf.save_yaml()
+    snapshot.write_bytes(b"garbage")
+    assert as_conf.load_last_run() == dict(data, NEW=1)
+
+
+def test_write_atomically_threads(tmp_path):
+    path = tmp_path / "experiment_data.yml"
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def write(content):
+        def dump(stream):
+            stream.write(content[:10])
+            # Both threads are writing their temporary file at once
+            barrier.wait(5)
+            stream.write(content[10:])
+
+        try:
+            AutosubmitConfig._write_atomically(path, 'w', dump)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(letter * 100,)) for letter in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    assert errors == []
+    assert path.read_text() in ("a" * 100, "b" * 100)
+    assert [file.name for file in tmp_path.iterdir()] == [path.name]
@@ -0,0 +1,100 @@
+import multiprocessing
+import pickle
+
+import pytest
+
+from autosubmitconfigparser.config.sharedsnapshot import SharedConfigSnapshot
+
+DATA = {
+    "DEFAULT": {"EXPID": "a000", "HPCARCH": "MN5"},
+    "JOBS": {"SIM": {"WALLCLOCK": "00:30", "DEPENDENCIES": {"SIM-1": {}}}},
+    "EXPERIMENT": {"DATELIST": "20000101", "NUMCHUNKS": 2},
+    "EMPTY": {},
+    "LIST": [1, "2", 3.0, None],
+}
+
+
+def _read_section(args):
+    name, key = args
+    with SharedConfigSnapshot.attach(name) as snapshot:
+        return snapshot.generation, snapshot.stale, snapshot.data[key]
+
+
+def _read_snapshot(snapshot):
+    return snapshot.data.to_dict(), snapshot.owner
+
+
+def test_shared_snapshot():
+    with SharedConfigSnapshot.publish(DATA, generation=3, fingerprint="ab" * 16) as snapshot:
+        attached = SharedConfigSnapshot.attach(snapshot.name)
+        unread = SharedConfigSnapshot.attach(snapshot.name)
+        assert (attached.generation, attached.fingerprint) == (3, "ab" * 16)
+        assert not attached.owner and snapshot.owner
+        assert list(attached.data) == list(DATA)
+        assert len(attached.data) == len(DATA) and "JOBS" in attached.data and "PLATFORMS" not in attached.data
+        # The sections are only deserialized when read
+        assert attached.data._sections == {}
+        assert attached.data["JOBS"] == DATA["JOBS"]
+        assert list(attached.data._sections) == ["JOBS"]
+        assert attached.data.to_dict() == DATA
+        with pytest.raises(TypeError):
+            attached.data["JOBS"] = {}
+        # The sections read are copies
+        attached.data["JOBS"]["SIM"]["WALLCLOCK"] = "01:00"
+        assert SharedConfigSnapshot.attach(snapshot.name).data["JOBS"] == DATA["JOBS"]
+
+        assert not attached.stale
+    # Closed by the publisher
+    assert attached.stale
+    assert attached.data["DEFAULT"] == DATA["DEFAULT"]
+    with pytest.raises(FileNotFoundError):
+        SharedConfigSnapshot.attach(snapshot.name)
+    attached.close()
+    assert attached.stale
+    assert attached.data["EXPERIMENT"] == DATA["EXPERIMENT"]
+    unread.close()
+    with pytest.raises(ValueError):
+        unread.data["EXPERIMENT"]
+
+
+def test_shared_snapshot_workers():
+    snapshot = SharedConfigSnapshot.publish(DATA, generation=1)
+    try:
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            results = pool.map(_read_section, [(snapshot.name, key) for key in DATA])
+            assert [result[2] for result in results] == list(DATA.values())
+            assert all(result[:2] == (1, False) for result in results)
+            # The snapshots are sent by name
+            assert len(pickle.dumps(snapshot)) < 200
+            assert pool.apply(_read_snapshot, (snapshot,)) == (DATA, False)
+    finally:
+        snapshot.close()
+
+
+def test_publish_shared_snapshot(autosubmit_config):
+    as_conf = autosubmit_config(expid="a000", experiment_data=dict(DATA))
+    snapshot = as_conf.publish_shared_snapshot()
+    assert snapshot.generation == as_conf.generation
+    assert snapshot.fingerprint == as_conf.get_fingerprint()
+    assert snapshot.data.to_dict() == DATA
+    # Not published again while the data does not change
+    as_conf.experiment_data_changed()
+    assert as_conf.publish_shared_snapshot() is snapshot
+
+    worker = SharedConfigSnapshot.attach(snapshot.name)
+    as_conf.experiment_data = {**DATA, "NEW": {"KEY": 1}}
+    new_snapshot = as_conf.publish_shared_snapshot()
+    assert new_snapshot is not snapshot and snapshot.stale and worker.stale
+    assert new_snapshot.generation == as_conf.generation > worker.generation
+    assert SharedConfigSnapshot.attach(new_snapshot.name).data["NEW"] == {"KEY": 1}
+
+    # The data modified in place and notified is published again
+    as_conf.experiment_data["NEW"]["KEY"] = 2
+    as_conf.experiment_data_changed()
+    changed_snapshot = as_conf.publish_shared_snapshot()
+    assert changed_snapshot is not new_snapshot and new_snapshot.stale
+    assert changed_snapshot.fingerprint == as_conf.get_fingerprint()
+    assert SharedConfigSnapshot.attach(changed_snapshot.name).data["NEW"] == {"KEY": 2}
+    as_conf.close_shared_snapshot()
+    assert changed_snapshot.stale
+    worker.close()
@@ -189,3 +189,89 @@ def test_substitute_placeholders_after_all_files_loaded(autosubmit_config, tmpdi
 
     assert as_conf.experiment_data["TEST_IN_PLACE"] == "something/first/something"
     assert as_conf.experiment_data["TEST_AT_THE_END"] == "something/last/something"
+
+
+def test_substitute_dynamic_variables_chain(autosubmit_config, mocker):
+    as_conf = autosubmit_config(
+        expid='a000',
+        experiment_data={
+            "FIRST": "%SECOND%/first",
+            "SECOND": "%JOBS.SIM.PATH%/second",
+            "JOBS": {"SIM": {"PATH": "%THIRD%/path"}},
+            "THIRD": "third",
+        })
+    as_conf.deep_read_loops(as_conf.experiment_data)
+    order, cycles = as_conf.sort_dynamic_variables(as_conf.dynamic_variables, '%[a-zA-Z0-9_.-]*%')
+    assert order == ["JOBS.SIM.PATH", "SECOND", "FIRST"]
+    assert cycles == []
+
+    process_spy = mocker.spy(as_conf, '_process_dynamic_variables')
+    as_conf.experiment_data = as_conf.substitute_dynamic_variables(as_conf.experiment_data)
+    assert process_spy.call_count == 1
+    assert as_conf.experiment_data["FIRST"] == "third/path/second/first"
+    assert as_conf.experiment_data["SECOND"] == "third/path/second"
+    assert as_conf.experiment_data["JOBS"]["SIM"]["PATH"] == "third/path"
+    assert as_conf.dynamic_variables == {}
+
+
+def test_substitute_dynamic_variables_cycle(autosubmit_config, mocker):
+    as_conf = autosubmit_config(
+        expid='a000',
+        experiment_data={
+            "FIRST": "%SECOND%",
+            "SECOND": "%THIRD%",
+            "THIRD": "%FIRST%",
+            "OTHER": "%TEST%/other",
+            "TEST": "test",
+        })
+    mocked_log = mocker.patch('autosubmitconfigparser.config.configcommon.Log')
+    as_conf.deep_read_loops(as_conf.experiment_data)
+    as_conf.experiment_data = as_conf.substitute_dynamic_variables(as_conf.experiment_data)
+
+    assert as_conf.placeholder_cycles == [["FIRST", "SECOND", "THIRD", "FIRST"]]
+    assert mocked_log.warning.call_count == 1
+    assert as_conf.experiment_data["OTHER"] == "test/other"
+    assert sorted(as_conf.dynamic_variables) == ["FIRST", "SECOND", "THIRD"]
+
+
+def test_unify_conf_skips_unresolvable_placeholders(autosubmit_config, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    current_data = as_conf.unify_conf({}, {
+        "JOBS": {"SIM": {"SCRIPT": "run %CHUNK% %SDATE%", "PATH": "%PROJECT.DIR%/sim"}},
+    })
+    assert sorted(as_conf.dynamic_variables) == ["JOBS.SIM.PATH", "JOBS.SIM.SCRIPT"]
+
+    process_spy = mocker.spy(as_conf, '_process_dynamic_variables')
+    current_data = as_conf.unify_conf(current_data, {"OTHER": "value"})
+    assert process_spy.call_count == 0
+
+    current_data = as_conf.unify_conf(current_data, {"PROJECT": {"DIR": "/proj"}})
+    assert process_spy.call_count == 1
+    assert process_spy.call_args.args[0] == {"JOBS.SIM.PATH": "%PROJECT.DIR%/sim"}
+    assert current_data["JOBS"]["SIM"] == {"SCRIPT": "run %CHUNK% %SDATE%", "PATH": "/proj/sim"}
+
+
+def test_parse_data_loops_reads_the_template_once(autosubmit_config, mocker):
+    as_conf = autosubmit_config(expid='a000', experiment_data={})
+    data = as_conf.normalize_variables({
+        "JOBS": {
+            "SIM": {
+                "FOR": {"NAME": ["a", "b", "c"], "PROCESSORS": [1, 2, 3]},
+                "PATH": "/%NAME%/%CHUNK%",
+                "VARS": ["%NAME%", "x"],
+                "DEPENDENCIES": {"INI": {}},
+            }
+        }
+    }, must_exists=False)
+    sort_spy = mocker.spy(as_conf, 'sort_dynamic_variables')
+    data = as_conf.unify_conf({}, data)
+
+    assert sort_spy.call_count == 2  # the unified data and the FOR template
+    assert sorted(data["JOBS"]) == ["SIM_A", "SIM_B", "SIM_C"]
+    assert data["JOBS"]["SIM_B"] == {"PATH": "/b/%CHUNK%", "VARS": ["b", "x"], "DEPENDENCIES": {"INI": {}},
+                                     "NAME": "b", "PROCESSORS": "2"}
+    data["JOBS"]["SIM_A"]["DEPENDENCIES"]["INI"]["STATUS"] = "RUNNING"
+    data["JOBS"]["SIM_A"]["VARS"].append("y")
+    assert data["JOBS"]["SIM_C"]["DEPENDENCIES"] == {"INI": {}}
+    assert data["JOBS"]["SIM_C"]["VARS"] == ["c", "x"]
+    assert not any(name.startswith("JOBS.SIM.") for name in as_conf.dynamic_variables)
@@ -0,0 +1,65 @@
+import pytest
+
+from autosubmitconfigparser.config.yamlparser import YAMLParserFactory, YAMLParser, YAML_BACKEND_ENV
+
+pytest.importorskip("yaml")
+
+SCALARS = """
+WALLCLOCK: 48:00
+SHORT_WALLCLOCK: 00:30
+BOOL_1_1: yes
+SWITCH: on
+TRUE_VALUE: True
+DECIMAL: 017
+OCTAL: 0o17
+HEX: 0x1f
+BINARY: 0b101
+UNDERSCORES: 1_000
+FLOAT: 1.5
+EXPONENT: 1e3
+LEADING_DOT: .5
+INFINITE: -.inf
+NOT_OCTAL: 08
+DATELIST: 20000101
+DATE: 2000-01-01
+NULL_VALUE: ~
+LIST: [a, 'b', 3]
+"""
+
+
+def test_backends_same_scalars():
+    ruamel_data = YAMLParserFactory("ruamel").create_parser().load(SCALARS)
+    pyyaml_data = YAMLParserFactory("pyyaml").create_parser().load(SCALARS)
+    assert ruamel_data == pyyaml_data
+    assert {key: type(value) for key, value in ruamel_data.items()} == \
+           {key: type(value) for key, value in pyyaml_data.items()}
+    assert pyyaml_data["WALLCLOCK"] == "48:00"
+    assert pyyaml_data["BOOL_1_1"] == "yes"
+    assert pyyaml_data["DECIMAL"] == 17
+
+
+def test_pyyaml_duplicated_keys():
+    with pytest.raises(Exception):
+        YAMLParserFactory("pyyaml").create_parser().load("A: 1\nA: 2\n")
+
+
+@pytest.mark.parametrize("env_value, expected_backend", [
+    (None, "ruamel"),
+    ("ruamel", "ruamel"),
+    ("PYYAML", "pyyaml"),
+])
+def test_backend_from_environment(monkeypatch, env_value, expected_backend):
+    if env_value is None:
+        monkeypatch.delenv(YAML_BACKEND_ENV, raising=False)
+    else:
+        monkeypatch.setenv(YAML_BACKEND_ENV, env_value)
+    factory = YAMLParserFactory()
+    assert factory.backend == expected_backend
+    parser = factory.create_parser()
+    assert isinstance(parser, YAMLParser) == (expected_backend == "ruamel")
+    assert parser.load("A: 1") == {"A": 1}
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        YAMLParserFactory("unknown").create_parser()